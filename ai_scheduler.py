@@ -0,0 +1,137 @@
+"""
+Spreads the decisions (i.e. AI) of mobs across simulation steps.
+
+Each mob thinks (see Mob.think) once every Mob._think_interval steps, but mobs are given a
+random phase when they are scheduled, so that mobs spawned together don't all think on the
+same step. Thinking is also limited by a time budget per step; mobs that are due to think
+once the budget is spent are deferred to the next step, ahead of the mobs that become due then.
+
+Mobs of the same class that are due on the same step think together, in batches (see
+Mob.think_batch), so that their decisions can be computed in bulk.
+"""
+
+__author__ = "Joel Foster"
+__date__ = "17/10/2026"
+__version__ = "1.1.0"
+__copyright__ = "The University of Queensland, 2019"
+
+import heapq
+import itertools
+import random
+import time
+
+# The default maximum time (in seconds) to spend thinking per step
+AI_STEP_BUDGET = 0.002
+
+# The most mobs that think in a single batch; the budget is checked between batches
+AI_BATCH_SIZE = 256
+
+
+class AIScheduler:
+    """Decides which mobs think on each step"""
+
+    def __init__(self, budget=AI_STEP_BUDGET, clock=time.perf_counter):
+        """Constructor
+
+        Parameters:
+            budget (float): The maximum time (in seconds) to spend thinking per step, or None for no limit
+                            (at least one mob always thinks per step, so that no mob is starved)
+            clock (callable): Returns a monotonic time in seconds, used to measure the budget
+        """
+        self._budget = budget
+        self._clock = clock
+
+        self._tick = 0
+
+        # Min-heap of (due tick, sequence number, mob); the sequence number makes mobs that are
+        # due on the same tick think in the order they were scheduled (i.e. round-robin)
+        self._queue = []
+        self._sequence = itertools.count()
+
+        # Maps each scheduled mob -> the sequence number of its live entry in the queue
+        # Entries for mobs that have been unscheduled (or rescheduled) are skipped lazily
+        self._entries = {}
+
+        # Maps mobs that think less often than usual -> the factor their think interval is multiplied by
+        self._interval_scales = {}
+
+        self._thought = 0
+        self._over_budget = False
+
+    def add(self, mob):
+        """Schedules 'mob' to think, starting at a random step within its think interval"""
+        self._push(mob, self._tick + random.randrange(mob.get_think_interval()))
+
+    def remove(self, mob):
+        """Stops 'mob' from thinking"""
+        self._entries.pop(mob, None)
+        self._interval_scales.pop(mob, None)
+
+    def set_interval_scale(self, mob, scale):
+        """Makes 'mob' think 'scale' times less often than its think interval (e.g. when it is far
+        from the player), from the next time it thinks"""
+        if scale == 1:
+            self._interval_scales.pop(mob, None)
+        else:
+            self._interval_scales[mob] = scale
+
+    def __len__(self):
+        """(int) Returns the number of scheduled mobs"""
+        return len(self._entries)
+
+    def get_thought(self):
+        """(int) Returns the number of mobs that thought on the last step"""
+        return self._thought
+
+    def is_over_budget(self):
+        """(bool) Returns True iff some mobs that were due to think on the last step were deferred
+        because the budget was spent"""
+        return self._over_budget
+
+    def _push(self, mob, due):
+        """Adds an entry to the queue for 'mob' to think on the 'due' tick"""
+        sequence = next(self._sequence)
+        self._entries[mob] = sequence
+        heapq.heappush(self._queue, (due, sequence, mob))
+
+    def run(self, game_data):
+        """Lets the mobs that are due think, within the budget, then advances to the next step
+
+        Parameters:
+            game_data (app.GameData): Arbitrary data to be passed on to each mob's think method
+        """
+        queue = self._queue
+        start = self._clock()
+        thought = 0
+        over_budget = False
+
+        # Group the mobs that are due by class, in the order they are due
+        batches = {}
+        while queue and queue[0][0] <= self._tick:
+            due, sequence, mob = heapq.heappop(queue)
+
+            if self._entries.get(mob) == sequence:  # i.e. not a stale entry
+                batches.setdefault(type(mob), []).append((due, mob))
+
+        for cls, entries in batches.items():
+            for i in range(0, len(entries), AI_BATCH_SIZE):
+                batch = entries[i:i + AI_BATCH_SIZE]
+
+                if thought and self._budget is not None and self._clock() - start >= self._budget:
+                    # Defer; still due, so these will be first to think on the next step
+                    over_budget = True
+                    for due, mob in batch:
+                        self._push(mob, due)
+                    continue
+
+                cls.think_batch([mob for due, mob in batch], game_data)
+                thought += len(batch)
+
+                # Schedule relative to when it should have thought, so deferrals don't accumulate
+                for due, mob in batch:
+                    interval = mob.get_think_interval() * self._interval_scales.get(mob, 1)
+                    self._push(mob, max(due + interval, self._tick + 1))
+
+        self._thought = thought
+        self._over_budget = over_budget
+        self._tick += 1
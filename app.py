@@ -8,9 +8,11 @@ __version__ = "1.1.0"
 __copyright__ = "The University of Queensland, 2019"
 
 import tkinter as tk
+import events
 from ninedraft import Ninedraft
 
 def main():
+    events.configure()
     root = tk.Tk()
     root.title('Ninedraft')
     app = Ninedraft(root)
@@ -0,0 +1,10 @@
+"""
+Benchmarks for Ninedraft's hot paths.
+
+Each bench_*.py module registers benchmarks with the benchmark decorator from
+benchmarks.harness. Run them all with:
+    python -m benchmarks --output results.json
+
+and compare against an earlier run with:
+    python -m benchmarks --output new.json --compare results.json
+"""
@@ -0,0 +1,51 @@
+"""
+Runs the benchmarks from the command line
+
+Usage:
+    python -m benchmarks [--output FILE] [--compare BASELINE] [--filter NAME] [--quick]
+
+Exits with status 1 if --compare finds any regressions.
+"""
+
+import argparse
+import sys
+
+from benchmarks import harness
+
+# Importing each module registers its benchmarks
+from benchmarks import bench_world, bench_render, bench_crafting, bench_inventory, bench_mobs, bench_save
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Ninedraft benchmarks")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare results against this earlier JSON file")
+    parser.add_argument("--threshold", type=float, default=.1,
+                        help="relative slowdown that counts as a regression (default .1)")
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this")
+    parser.add_argument("--quick", action="store_true", help="take fewer samples, for a fast sanity check")
+    args = parser.parse_args()
+
+    document = harness.run_all(name_filter=args.filter, scale=.1 if args.quick else 1.)
+
+    if args.output:
+        harness.save(document, args.output)
+
+    if not args.compare:
+        return 0
+
+    regressions = 0
+    print()
+    print(f"{'benchmark':<48} {'baseline':>12} {'current':>12} {'ratio':>8}")
+
+    for key, before, after, ratio, is_regression in harness.compare(harness.load(args.compare), document,
+                                                                    threshold=args.threshold):
+        flag = "  REGRESSION" if is_regression else ""
+        print(f"{key:<48} {before * 1e6:>10.2f}us {after * 1e6:>10.2f}us {ratio:>8.2f}{flag}")
+        regressions += is_regression
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
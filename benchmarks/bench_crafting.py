@@ -0,0 +1,79 @@
+"""
+Benchmarks for matching crafting recipes
+"""
+
+__author__ = "Joel Foster"
+__date__ = "17/10/2026"
+__version__ = "1.1.0"
+__copyright__ = "The University of Queensland, 2019"
+
+import itertools
+import random
+
+from constants import CRAFTING_RECIPES_3x3
+from crafting import GridCrafter
+from grid import Stack
+from item_creation import create_item
+
+from benchmarks.harness import benchmark
+
+# Item ids used to generate synthetic recipes
+INGREDIENTS = (None, 'wood', 'stick', 'stone', 'iron', 'gold', 'diamond', 'wool')
+
+# Number of patterns looked up per call
+LOOKUPS_PER_CALL = 100
+
+
+def make_recipes(count, seed=0):
+    """Returns the 3x3 recipes from constants.py, plus 'count' distinct random 3x3 recipes
+
+    Return:
+        list<tuple<tuple<tuple<str>>, Stack>>: (pattern, result) pairs
+    """
+    rng = random.Random(seed)
+    recipes = list(CRAFTING_RECIPES_3x3)
+    patterns = {pattern for pattern, _ in recipes}
+
+    while len(recipes) < count + len(CRAFTING_RECIPES_3x3):
+        cells = [rng.choice(INGREDIENTS) for _ in range(9)]
+        pattern = tuple(tuple(cells[row * 3:row * 3 + 3]) for row in range(3))
+
+        if pattern not in patterns:
+            patterns.add(pattern)
+            recipes.append((pattern, Stack(create_item('stick'), 1)))
+
+    return recipes
+
+
+@benchmark("crafting.find_match", params=[10, 1000, 10000], number=10)
+def bench_find_match(count):
+    """GridCrafter.find_match against 'count' recipes, half hits & half misses"""
+    recipes = make_recipes(count)
+    crafter = GridCrafter(recipes, 3, 3)
+
+    rng = random.Random(1)
+    hits = [pattern for pattern, _ in rng.sample(recipes, min(len(recipes), LOOKUPS_PER_CALL // 2))]
+    misses = [tuple(itertools.repeat(('wool', 'gold', 'wool'), 3))] * (LOOKUPS_PER_CALL - len(hits))
+    patterns = hits + misses
+
+    def find():
+        for pattern in patterns:
+            crafter.find_match(pattern)
+
+    return find
+
+
+@benchmark("crafting.find_match.normalised", params=[10, 1000, 10000], number=10)
+def bench_find_match_normalised(count):
+    """GridCrafter.find_match against 'count' recipes, with pattern normalisation enabled"""
+    recipes = make_recipes(count)
+    crafter = GridCrafter(recipes, 3, 3, normalise=True)
+
+    rng = random.Random(1)
+    patterns = [pattern for pattern, _ in rng.sample(recipes, min(len(recipes), LOOKUPS_PER_CALL))]
+
+    def find():
+        for pattern in patterns:
+            crafter.find_match(pattern)
+
+    return find
@@ -0,0 +1,62 @@
+"""
+Benchmarks for adding items to the hotbar & inventory
+"""
+
+__author__ = "Joel Foster"
+__date__ = "17/10/2026"
+__version__ = "1.1.0"
+__copyright__ = "The University of Queensland, 2019"
+
+from grid import Grid, Stack
+from item_creation import create_item
+
+from benchmarks.harness import benchmark
+
+# Number of items added per call
+ITEMS_PER_CALL = 100
+
+
+def make_full_grid(rows, columns):
+    """(Grid) Returns a grid with every cell holding a full stack of wood, except the last cell"""
+    grid = Grid(rows=rows, columns=columns)
+    wood = create_item('wood')
+
+    for position in grid:
+        grid[position] = Stack(wood, wood.get_max_stack_size())
+
+    grid[rows - 1, columns - 1] = None
+    return grid
+
+
+@benchmark("inventory.add_items.full", params=["3x10", "30x100"], number=10)
+def bench_add_items_full(size):
+    """Grid.add_items of a single dirt item into a grid of full wood stacks, with only the last cell
+    free. The item id index has no dirt stacks to top up, & the heap of free cells gives the last
+    cell directly, so the cost shouldn't grow with the grid's size (a scan of every cell would).
+    The dirt is removed again after each insertion."""
+    rows, columns = (int(n) for n in size.split("x"))
+    grid = make_full_grid(rows, columns)
+    dirt = create_item('dirt')
+    last = rows - 1, columns - 1
+
+    def add():
+        for _ in range(ITEMS_PER_CALL):
+            grid.add_items(Stack(dirt, 1))
+            grid[last] = None
+
+    return add
+
+
+@benchmark("inventory.add_items.rejected", params=["3x10", "30x100"], number=10)
+def bench_add_items_rejected(size):
+    """Grid.add_items of a single dirt item into a completely full grid, which must be rejected"""
+    rows, columns = (int(n) for n in size.split("x"))
+    grid = make_full_grid(rows, columns)
+    grid[rows - 1, columns - 1] = Stack(create_item('wood'), 64)
+    dirt = create_item('dirt')
+
+    def add():
+        for _ in range(ITEMS_PER_CALL):
+            grid.add_items(Stack(dirt, 1))
+
+    return add
@@ -0,0 +1,58 @@
+"""
+Benchmarks for mob decisions (AI)
+"""
+
+__author__ = "Joel Foster"
+__date__ = "17/10/2026"
+__version__ = "1.1.0"
+__copyright__ = "The University of Queensland, 2019"
+
+import random
+
+from simulation import GameData, BLOCK_SIZE
+from world import World
+from mob import Bird
+from new_mobs import Sheep
+
+from benchmarks.harness import benchmark
+
+
+def make_herd(mob_class, count):
+    """(list<Mob>, GameData) Returns 'count' mobs of 'mob_class', added to an empty world"""
+    random.seed(0)
+    world = World((256, 64), BLOCK_SIZE)
+    width, height = world.get_pixel_size()
+
+    mobs = []
+    for _ in range(count):
+        mob = mob_class(mob_class.__name__, (20, 20))
+        world.add_mob(mob, random.uniform(0, width), random.uniform(0, height))
+        mobs.append(mob)
+
+    return mobs, GameData(world, None)
+
+
+@benchmark("mobs.wander.single", params=["Sheep:100", "Sheep:1000", "Sheep:10000", "Bird:1000"], number=10)
+def bench_wander_single(spec):
+    """Mob.think called on each of a herd of wandering mobs, one at a time"""
+    name, count = spec.split(":")
+    mobs, data = make_herd({"Sheep": Sheep, "Bird": Bird}[name], int(count))
+
+    def think():
+        for mob in mobs:
+            mob.think(data)
+
+    return think
+
+
+@benchmark("mobs.wander.batch", params=["Sheep:100", "Sheep:1000", "Sheep:10000", "Bird:1000"], number=10)
+def bench_wander_batch(spec):
+    """Mob.think_batch called on a herd of wandering mobs, all at once"""
+    name, count = spec.split(":")
+    mob_class = {"Sheep": Sheep, "Bird": Bird}[name]
+    mobs, data = make_herd(mob_class, int(count))
+
+    def think():
+        mob_class.think_batch(mobs, data)
+
+    return think
@@ -0,0 +1,126 @@
+"""
+Benchmarks for drawing the game world
+"""
+
+__author__ = "Joel Foster"
+__date__ = "17/10/2026"
+__version__ = "1.1.0"
+__copyright__ = "The University of Queensland, 2019"
+
+import tkinter as tk
+
+from constants import BLOCK_COLOURS, ITEM_COLOURS
+from game import GameView, WorldViewRouter, Camera
+
+from benchmarks.harness import benchmark, Skip
+from benchmarks.bench_world import make_session, make_stepper
+
+_root = None
+
+
+def get_root():
+    """(tk.Tk) Returns a hidden tkinter root window, shared by all render benchmarks
+
+    Raises:
+        Skip: if there is no display to create a window on
+    """
+    global _root
+
+    if _root is None:
+        try:
+            _root = tk.Tk()
+        except tk.TclError as error:
+            raise Skip(f"no display: {error}")
+        _root.withdraw()
+
+    return _root
+
+
+def make_view(world, viewport_size=None):
+    """(GameView) Returns a game view for 'world' on a hidden window
+
+    Parameters:
+        world (World): The world to view
+        viewport_size (tuple<int, int>): The (width, height) size of the view's camera, in pixels,
+                                         or None to show the whole world
+    """
+    camera = None if viewport_size is None else Camera(viewport_size, world.get_pixel_size())
+    view = GameView(get_root(), world.get_pixel_size(), WorldViewRouter(BLOCK_COLOURS, ITEM_COLOURS), camera=camera)
+    view.pack()
+    return view
+
+
+@benchmark("render.draw_physical.static", number=100)
+def bench_draw_static(_):
+    """GameView.draw_physical for every thing in the world, with nothing moving between frames"""
+    session, _ = make_session()
+    world = session.get_world()
+    view = make_view(world)
+
+    def draw():
+        view.draw_physical(world.get_all_things())
+        view.update_idletasks()
+
+    return draw
+
+
+@benchmark("render.draw_physical.moving", number=100)
+def bench_draw_moving(_):
+    """GameView.draw_physical for every thing in the world, stepping the world between frames"""
+    session, clock = make_session()
+    world = session.get_world()
+    view = make_view(world)
+    step = make_stepper(session, clock)
+
+    def draw():
+        step()
+        view.draw_physical(world.get_all_things())
+        view.update_idletasks()
+
+    return draw
+
+
+@benchmark("render.frame", number=100)
+def bench_frame(_):
+    """A whole frame, as drawn by Ninedraft.redraw (scroll to the player, then draw the visible
+    terrain & things)"""
+    from ninedraft import VIEWPORT_COLUMNS
+    from simulation import BLOCK_SIZE, GRID_HEIGHT
+
+    session, clock = make_session()
+    world = session.get_world()
+    player = session.get_player()
+    view = make_view(world, (VIEWPORT_COLUMNS * BLOCK_SIZE, GRID_HEIGHT * BLOCK_SIZE))
+    step = make_stepper(session, clock)
+
+    def draw():
+        step()
+        view.follow(*player.get_position())
+        view.draw_terrain(world)
+        view.draw_physical(world.get_things_in_rect(*view.get_viewport(), ("player", "mob", "item")))
+        view.update_idletasks()
+
+    return draw
+
+
+@benchmark("render.hotbar", params=["unchanged", "changed"], number=100)
+def bench_hotbar(change):
+    """The hotbar, as drawn by Ninedraft.redraw each frame, either unchanged or with a stack
+    changing every frame"""
+    from grid import ItemGridView
+
+    session, _ = make_session()
+    hot_bar = session.get_hot_bar()
+    view = ItemGridView(get_root(), hot_bar.get_size())
+    view.pack()
+
+    def draw():
+        if change == "changed":
+            stack = hot_bar[0, 0]
+            if not stack.add(1):
+                stack.subtract(stack.get_quantity() - 1)
+
+        view.render(hot_bar.items(), hot_bar.get_selected(), hot_bar.get_version())
+        view.update_idletasks()
+
+    return draw
@@ -0,0 +1,82 @@
+"""
+Benchmarks for saving & loading games
+"""
+
+__author__ = "Joel Foster"
+__date__ = "17/10/2026"
+__version__ = "1.1.0"
+__copyright__ = "The University of Queensland, 2019"
+
+import os
+import random
+import tempfile
+
+from chunks import ChunkGenerator, CHUNK_SIZE
+from item_creation import SIMPLE_WORLD_BLOCK_WEIGHTS
+from save import write_save, SaveFile
+
+from benchmarks.harness import benchmark
+
+# Numbers of grid cells in the saved worlds (2 ** 20 is just over a million)
+SAVE_SIZES = [2 ** 16, 2 ** 20]
+
+
+def make_chunks(cells):
+    """(list<tuple<tuple<int, int>, dict>>) Returns the (chunk, cells) pairs of a square world with
+    (about) 'cells' grid cells, completely filled with generated ground"""
+    side = int(cells ** .5) // CHUNK_SIZE
+    generator = ChunkGenerator(0, SIMPLE_WORLD_BLOCK_WEIGHTS, lambda column: 0)
+
+    return [((chunk_column, chunk_row), generator.generate((chunk_column, chunk_row)))
+            for chunk_column in range(side) for chunk_row in range(side)]
+
+
+def make_save(cells):
+    """(str, list) Returns the path of a save file of a world with 'cells' grid cells, and its chunks"""
+    chunks = make_chunks(cells)
+    path = os.path.join(tempfile.gettempdir(), f"ninedraft-bench-{cells}.ndsave")
+    write_save(path, chunks, {})
+    return path, chunks
+
+
+@benchmark("save.write", params=SAVE_SIZES, number=1)
+def bench_write(cells):
+    """write_save for a world of 'cells' grid cells"""
+    path, chunks = make_save(cells)
+
+    return lambda: write_save(path, chunks, {})
+
+
+@benchmark("save.open", params=SAVE_SIZES, number=10)
+def bench_open(cells):
+    """Opening a save file of 'cells' grid cells, without reading any chunks"""
+    path, _ = make_save(cells)
+
+    def load():
+        SaveFile(path).close()
+
+    return load
+
+
+@benchmark("save.read_all", params=SAVE_SIZES, number=1)
+def bench_read_all(cells):
+    """Opening a save file of 'cells' grid cells, & reading every chunk"""
+    path, _ = make_save(cells)
+
+    def load():
+        with SaveFile(path) as save_file:
+            for chunk in save_file.get_chunks():
+                save_file.read_chunk(chunk)
+
+    return load
+
+
+@benchmark("save.read_chunk", params=SAVE_SIZES, number=1000)
+def bench_read_chunk(cells):
+    """Reading a random chunk from an open save file of 'cells' grid cells"""
+    path, _ = make_save(cells)
+    save_file = SaveFile(path)
+    chunks = save_file.get_chunks()
+    random.seed(0)
+
+    return lambda: save_file.read_chunk(random.choice(chunks))
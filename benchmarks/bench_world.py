@@ -0,0 +1,198 @@
+"""
+Benchmarks for stepping & querying the game world
+"""
+
+__author__ = "Joel Foster"
+__date__ = "17/10/2026"
+__version__ = "1.1.0"
+__copyright__ = "The University of Queensland, 2019"
+
+import random
+
+from simulation import (GameSession, GameData, SimulatedClock, PHYSICS_TIMESTEP, BLOCK_SIZE, GRID_HEIGHT,
+                        CHUNK_VIEW_DISTANCE, SPAWN_POSITION)
+from headless import HeadlessRunner, DEFAULT_SCRIPT
+from dropped_item import DroppedItem
+from item_creation import create_item, create_block, create_simple_world_generator, load_simple_world
+from chunks import ChunkManager
+from world import World
+from new_mobs import Bee, Sheep
+from player import Player
+
+from benchmarks.harness import benchmark
+
+# Number of random points looked up per call in the query benchmarks
+QUERIES_PER_CALL = 1000
+
+
+def make_session(seed=0):
+    """(GameSession, SimulatedClock) Returns a freshly loaded game session, driven by a simulated clock"""
+    random.seed(seed)
+    clock = SimulatedClock()
+    return GameSession(clock=clock), clock
+
+
+def make_stepper(session, clock):
+    """Returns a function that advances the session's world by exactly one physics timestep"""
+    world = session.get_world()
+    data = GameData(world, session.get_player())
+
+    def step():
+        clock.advance(PHYSICS_TIMESTEP)
+        world.step(data)
+
+    return step
+
+
+def random_points(world, count):
+    """(list<tuple<float, float>>) Returns 'count' random points within the world"""
+    width, height = world.get_pixel_size()
+    return [(random.uniform(0, width), random.uniform(0, height)) for _ in range(count)]
+
+
+@benchmark("world.step", params=[0, 100, 500], number=100)
+def bench_step(things):
+    """World.step with 'things' extra sheep & dropped items above the ground"""
+    session, clock = make_session()
+    world = session.get_world()
+
+    for i, (x, y) in enumerate(random_points(world, things)):
+        y = y * 0.5  # keep to the sky, above the ground
+        if i % 2:
+            world.add_mob(Sheep("Sheep", (20, 20)), x, y)
+        else:
+            world.add_item(DroppedItem(create_item("dirt")), x, y)
+
+    return make_stepper(session, clock)
+
+
+@benchmark("world.step.bee_swarm", params=[5, 25, 100], number=100)
+def bench_bee_swarm(bees):
+    """World.step with 'bees' bees released from the hive"""
+    session, clock = make_session()
+    world = session.get_world()
+
+    for _ in range(bees):
+        world.add_mob(Bee("Bee", (9, 9)), 150, 170)
+
+    return make_stepper(session, clock)
+
+
+def make_spread_world(sheep, lod):
+    """Returns a function that steps a wide, flat world with 'sheep' sheep spread across it, & the player
+    at one end
+
+    Parameters:
+        sheep (int): The number of sheep
+        lod (bool): If True, sleeping & levels of detail are used (see World.update_lod)
+    """
+    random.seed(0)
+    clock = SimulatedClock()
+    columns = 2048
+    world = World((columns, GRID_HEIGHT), BLOCK_SIZE, timestep=PHYSICS_TIMESTEP, clock=clock,
+                  merge_collisions=True, sleeping=lod)
+
+    for column in range(columns):
+        world.add_block_to_grid(create_block("stone"), column, GRID_HEIGHT - 1)
+
+    floor = (GRID_HEIGHT - 1) * BLOCK_SIZE
+    player = Player()
+    world.add_player(player, BLOCK_SIZE * 4, floor - BLOCK_SIZE)
+
+    for _ in range(sheep):
+        world.add_mob(Sheep("Sheep", (20, 20)), random.uniform(0, columns * BLOCK_SIZE), floor - BLOCK_SIZE)
+
+    data = GameData(world, player)
+
+    def step():
+        clock.advance(PHYSICS_TIMESTEP)
+        if lod:
+            world.update_lod(*player.get_position())
+        world.step(data)
+
+    # Let everything settle; far sheep are only frozen once they have fallen asleep
+    for _ in range(300):
+        step()
+
+    return step
+
+
+@benchmark("world.step.spread.full", params=[100, 1000], number=50)
+def bench_step_spread_full(sheep):
+    """World.step with 'sheep' sheep spread across a wide world, all simulated at full detail"""
+    return make_spread_world(sheep, lod=False)
+
+
+@benchmark("world.step.spread.lod", params=[100, 1000], number=50)
+def bench_step_spread_lod(sheep):
+    """World.step with 'sheep' sheep spread across a wide world, with sleeping & levels of detail"""
+    return make_spread_world(sheep, lod=True)
+
+
+@benchmark("world.create_block", params=["stone", "leaf", "mayhem"], number=10)
+def bench_create_block(block_id):
+    """item_creation.create_block, called 10000 times for the same kind of block"""
+    spec = (block_id, 0) if block_id == "mayhem" else (block_id,)
+
+    def create():
+        for _ in range(10000):
+            create_block(*spec)
+
+    return create
+
+
+@benchmark("world.get_block", number=10)
+def bench_get_block(_):
+    """World.get_block at random points"""
+    session, _ = make_session()
+    world = session.get_world()
+    points = random_points(world, QUERIES_PER_CALL)
+
+    def query():
+        for x, y in points:
+            world.get_block(x, y)
+
+    return query
+
+
+@benchmark("world.get_things", number=10)
+def bench_get_things(_):
+    """World.get_things at random points"""
+    session, _ = make_session()
+    world = session.get_world()
+    points = random_points(world, QUERIES_PER_CALL)
+
+    def query():
+        for x, y in points:
+            world.get_things(x, y)
+
+    return query
+
+
+@benchmark("world.load.eager", params=[32, 256, 1024], repeat=3)
+def bench_load_eager(columns):
+    """Creating a world 'columns' cells wide, with all of its blocks loaded up front"""
+    def load():
+        random.seed(0)
+        load_simple_world(World((columns, GRID_HEIGHT), BLOCK_SIZE))
+
+    return load
+
+
+@benchmark("world.load.chunked", params=[32, 256, 1024], repeat=3)
+def bench_load_chunked(columns):
+    """Creating a world 'columns' cells wide, with only the chunks around the spawn point loaded"""
+    def load():
+        world = World((columns, GRID_HEIGHT), BLOCK_SIZE)
+        ChunkManager(world, create_simple_world_generator(0), create_block, CHUNK_VIEW_DISTANCE).update(*SPAWN_POSITION)
+
+    return load
+
+
+@benchmark("headless.run", params=[600], repeat=3)
+def bench_headless(ticks):
+    """A whole headless game, running the default input script for 'ticks' ticks"""
+    def run():
+        HeadlessRunner(DEFAULT_SCRIPT, seed=0).run(ticks)
+
+    return run
@@ -0,0 +1,179 @@
+"""
+Registration, timing, storage & comparison of benchmarks
+"""
+
+__author__ = "Joel Foster"
+__date__ = "17/10/2026"
+__version__ = "1.1.0"
+__copyright__ = "The University of Queensland, 2019"
+
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+# All registered benchmarks, in registration order
+BENCHMARKS = []
+
+
+class Skip(Exception):
+    """Raised by a benchmark's setup when it cannot run in this environment (e.g. no display)"""
+
+
+class Benchmark:
+    """A named, parameterised piece of code to time"""
+
+    def __init__(self, name, setup, params=(None,), number=1, repeat=5):
+        """Constructor
+
+        Parameters:
+            name (str): The unique name of this benchmark (e.g. 'world.step')
+            setup (callable): Called with a parameter; returns a zero-argument callable to time.
+                              Time spent in setup is not measured.
+            params (iterable<*>): The parameters to run the benchmark with
+            number (int): The number of times to call the timed callable per measurement
+            repeat (int): The number of measurements to take
+        """
+        self.name = name
+        self.setup = setup
+        self.params = list(params)
+        self.number = number
+        self.repeat = repeat
+
+    def get_key(self, param):
+        """(str) Returns the unique key for the result of running with 'param'"""
+        return self.name if param is None else f"{self.name}[{param}]"
+
+    def run(self, param, scale=1.):
+        """Runs this benchmark with 'param'
+
+        Parameters:
+            param (*): The parameter to pass to setup
+            scale (float): Multiplier for the number of calls per measurement (e.g. .1 for a quick run)
+
+        Return:
+            dict<str, float>: Statistics of the time taken per call, in seconds
+        """
+        func = self.setup(param)
+        number = max(1, int(self.number * scale))
+
+        times = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            times.append((time.perf_counter() - start) / number)
+
+        return {
+            "min": min(times),
+            "median": statistics.median(times),
+            "mean": statistics.mean(times),
+            "number": number,
+            "repeat": self.repeat,
+        }
+
+
+def benchmark(name, params=(None,), number=1, repeat=5):
+    """Decorator that registers a setup function as a benchmark
+
+    See Benchmark for parameters
+    """
+    def register(setup):
+        BENCHMARKS.append(Benchmark(name, setup, params=params, number=number, repeat=repeat))
+        return setup
+
+    return register
+
+
+def get_commit():
+    """(str) Returns the current git commit hash, or None if it cannot be determined"""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL,
+                                       universal_newlines=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_all(name_filter=None, scale=1., report=print):
+    """Runs all registered benchmarks
+
+    Parameters:
+        name_filter (str): Only run benchmarks whose name contains this, or None to run all
+        scale (float): Multiplier for the number of calls per measurement
+        report (callable): Called with a line of progress text after each result
+
+    Return:
+        dict<str, *>: The results document, with 'meta' & 'results' keys
+    """
+    results = {}
+    skipped = {}
+
+    for bench in BENCHMARKS:
+        if name_filter and name_filter not in bench.name:
+            continue
+
+        for param in bench.params:
+            key = bench.get_key(param)
+
+            try:
+                result = bench.run(param, scale=scale)
+            except Skip as reason:
+                skipped[key] = str(reason)
+                report(f"{key:<48} skipped ({reason})")
+                continue
+
+            results[key] = result
+            report(f"{key:<48} {result['median'] * 1e6:>14.2f} us")
+
+    return {
+        "meta": {
+            "commit": get_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+            "scale": scale,
+        },
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def save(document, path):
+    """Writes a results document to 'path' as JSON"""
+    with open(path, "w") as file:
+        json.dump(document, file, indent=4, sort_keys=True)
+
+
+def load(path):
+    """(dict) Reads a results document from 'path'"""
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare(baseline, current, threshold=.1):
+    """Compares the median times of two results documents
+
+    Parameters:
+        baseline (dict): The earlier results document
+        current (dict): The later results document
+        threshold (float): The relative slowdown above which a result counts as a regression
+
+    Return:
+        list<tuple<str, float, float, float, bool>>:
+            (key, baseline median, current median, ratio, is regression) for each result in both
+    """
+    rows = []
+
+    for key, result in current["results"].items():
+        if key not in baseline["results"]:
+            continue
+
+        before = baseline["results"][key]["median"]
+        after = result["median"]
+        ratio = after / before if before else float("inf")
+
+        rows.append((key, before, after, ratio, ratio > 1 + threshold))
+
+    return rows
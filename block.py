@@ -7,7 +7,12 @@ __version__ = "1.1.0"
 __date__ = "26/04/2019"
 __copyright__ = "The University of Queensland, 2019"
 
+import weakref
+
 from physical_thing import PhysicalThing
+from events import get_log, BlockDamaged, LeafBlockUsed
+
+log = get_log(__name__)
 
 # Mappings of block_id to its break table
 # A break table is a mapping of item_ids to (time, correct) pairs, where
@@ -119,37 +124,146 @@ BREAK_TABLES = {
 }
 
 
+class BlockPrototype:
+    """The immutable properties shared by all blocks of the same kind (i.e. a flyweight)
+
+    Prototypes should be obtained through get_prototype, so that each kind of block has a single
+    prototype, no matter how many blocks of that kind there are.
+    """
+    __slots__ = ('_id', '_break_table', '_max_hitpoints')
+
+    def __init__(self, block_id, break_table, max_hitpoints):
+        """Constructor
+
+        Parameters:
+            block_id (str): The unique id of blocks of this kind
+            break_table (dict<str, tuple<float, bool>>): The break table of blocks of this kind;
+                                                         see comment on BREAK_TABLES above
+            max_hitpoints (float): The maximum & starting hitpoints of blocks of this kind
+        """
+        self._id = block_id
+        self._break_table = break_table
+        self._max_hitpoints = max_hitpoints
+
+    def get_id(self) -> str:
+        """(str) Returns the unique id of blocks of this kind"""
+        return self._id
+
+    def get_break_table(self):
+        """(dict<str, tuple<float, bool>>) Returns the break table of blocks of this kind"""
+        return self._break_table
+
+    def get_max_hitpoints(self) -> float:
+        """(float) Returns the maximum & starting hitpoints of blocks of this kind"""
+        return self._max_hitpoints
+
+    def __repr__(self):
+        return f"BlockPrototype({self._id!r})"
+
+
+# Maps (block id, max hitpoints) -> the prototype shared by all such blocks
+_prototypes = {}
+
+
+def get_prototype(block_id, break_table, max_hitpoints=20):
+    """(BlockPrototype) Returns the prototype shared by all blocks of a kind, creating it for the
+    first block of that kind
+
+    Parameters:
+        - See BlockPrototype
+    """
+    key = block_id, max_hitpoints
+
+    prototype = _prototypes.get(key)
+    if prototype is None:
+        prototype = _prototypes[key] = BlockPrototype(block_id, break_table, max_hitpoints)
+
+    return prototype
+
+
+# Maps each damaged block -> its remaining hitpoints
+# Most blocks are never damaged, so blocks at full hitpoints aren't stored at all
+# (weakly keyed, so mined & unloaded blocks drop out of the map)
+_damaged_hitpoints = weakref.WeakKeyDictionary()
+
+
 class Block(PhysicalThing):
-    """One of the building blocks in the sandbox game"""
+    """One of the building blocks in the sandbox game
+
+    A block stores only its shape & its prototype; all other properties are shared by all
+    blocks of the same kind (see BlockPrototype).
+    """
+    __slots__ = ('_prototype', '__weakref__')
+
+    # True iff a block of this class is completely described by its prototype (see from_prototype)
+    _prototype_only = True
+
     # The unique identifier for this block
     _id = None
 
     _break_table = {
     }
 
-    def __init__(self, hitpoints=20):
+    def __init__(self, hitpoints=20, prototype: BlockPrototype = None):
         """Constructor
 
         Parameters:
             hitpoints (float): The maximum & starting hitpoints for this block
+            prototype (BlockPrototype): The prototype of this block, or None to use the prototype for the
+                                        _id & _break_table attributes of the block's class
         """
         super().__init__()
 
-        self._hitpoints = self._max_hitpoints = hitpoints
+        if prototype is None:
+            if self._id is None:
+                raise NotImplementedError("A Block subclass must define an _id attribute")
 
-        if self._id is None:
-            raise NotImplementedError("A Block subclass must define an _id attribute")
+            if not self._break_table:
+                raise NotImplementedError("A Block subclass must define an _break_table attribute")
 
-        if not self._break_table:
-            raise NotImplementedError("A Block subclass must define an _break_table attribute")
+            prototype = get_prototype(self._id, self._break_table, hitpoints)
+
+        self._prototype = prototype
+
+    @classmethod
+    def from_prototype(cls, prototype: BlockPrototype):
+        """(Block) Creates a block of this class from 'prototype', without calling the constructor
+
+        This is much faster than the constructor, but only valid for classes whose blocks are
+        completely described by their prototype (i.e. _prototype_only is True).
+        """
+        block = cls.__new__(cls)
+        block._shape = None
+        block._prototype = prototype
+        return block
+
+    def get_prototype(self) -> BlockPrototype:
+        """(BlockPrototype) Returns the prototype shared by all blocks of this kind"""
+        return self._prototype
 
     def get_id(self) -> str:
         """(str) Returns the unique id of this block"""
-        return self._id
+        return self._prototype.get_id()
+
+    def get_spec(self) -> tuple:
+        """(tuple) Returns the block id tuple that creates a block like this one
+        (see item_creation.create_block)"""
+        return self.get_id(),
 
     def get_hitpoints(self) -> float:
         """(float) Returns the block's remaining hitpoints"""
-        return self._hitpoints
+        return _damaged_hitpoints.get(self, self._prototype.get_max_hitpoints())
+
+    def get_max_hitpoints(self) -> float:
+        """(float) Returns the block's hitpoints when undamaged"""
+        return self._prototype.get_max_hitpoints()
+
+    def set_hitpoints(self, hitpoints: float):
+        """Sets the block's remaining hitpoints (e.g. when loading a saved game)"""
+        if hitpoints == self._prototype.get_max_hitpoints():
+            _damaged_hitpoints.pop(self, None)
+        else:
+            _damaged_hitpoints[self] = hitpoints
 
     def get_position(self):
         """(float, float) Returns the (x, y) position of the block's centre"""
@@ -180,7 +294,7 @@ class Block(PhysicalThing):
         Pre-conditions:
             0 <= luck < 1
         """
-        return [('item', (self._id,))]
+        return [('item', (self.get_id(),))]
 
     def get_damage_by_tool(self, item):
         """(float) Returns the amount of damage caused by a given item (usually a tool)
@@ -189,8 +303,9 @@ class Block(PhysicalThing):
             item (Item): The item that would cause the damage
                          (this is usually a tool, but can be any item)
         """
-        id_ = item.get_id() if item.get_id() in self._break_table else "hand"
-        return self._break_table[id_]
+        break_table = self._prototype.get_break_table()
+        id_ = item.get_id() if item.get_id() in break_table else "hand"
+        return break_table[id_]
 
     def mine(self, effective_item, actual_item, luck):
         """Attempts to mine the block
@@ -214,15 +329,15 @@ class Block(PhysicalThing):
         time, correct_item = self.get_damage_by_tool(effective_item)
 
         damage = 10 / time
-        self._hitpoints -= damage
+        self.set_hitpoints(self.get_hitpoints() - damage)
 
-        print(f"Did {damage} damage with {effective_item} (correct? {correct_item})")
+        log.emit(BlockDamaged, damage, effective_item, correct_item)
 
         return correct_item, self.is_mined()
 
     def is_mined(self):
         """(bool) Returns True iff this block is completely mined"""
-        return self._hitpoints <= 0
+        return self.get_hitpoints() <= 0
 
     def __repr__(self):
         return f"{self.__class__.__name__}()"
@@ -230,6 +345,8 @@ class Block(PhysicalThing):
 
 class LeafBlock(Block):
     """Swaying in the breeze, perhaps it hides a tasty surprise"""
+    __slots__ = ()
+
     _id = 'leaves'
 
     _break_table = {
@@ -244,7 +361,7 @@ class LeafBlock(Block):
 
     def use(self):
         """Does nothing, since LeafBlocks cannot be used"""
-        print("Kayn't nobudy use a leaf blahk foo")
+        log.emit(LeafBlockUsed)
 
     def get_drops(self, luck, correct_item_used):
         """Drops an apple 30% of the time if the wrong tool was used
@@ -254,6 +371,9 @@ class LeafBlock(Block):
             if luck < 0.3:
                 return [('item', ('apple',))]
 
+    def get_spec(self):
+        return 'leaf',
+
     def __repr__(self):
         return f"LeafBlock()"
 
@@ -261,19 +381,18 @@ class LeafBlock(Block):
 class ResourceBlock(Block):
     """A simple block content with a simple life that drops an
     item form itself when mined"""
+    __slots__ = ()
 
-    def __init__(self, block_id, break_table):
+    def __init__(self, block_id, break_table, hitpoints=20):
         """Constructor
 
         Parameters:
             block_id (str): The unique id of this block
             break_table (dict<str, tuple<float, bool>>):
                     The block's break table; see comment on BREAK_TABLES above
+            hitpoints (float): The maximum & starting hitpoints for this block
         """
-        self._id = block_id
-        self._break_table = break_table
-
-        super().__init__()
+        super().__init__(prototype=get_prototype(block_id, break_table, hitpoints))
 
     def get_drops(self, luck, correct_item_used):
         """Drops a itself in item form 5 times
@@ -282,7 +401,7 @@ class ResourceBlock(Block):
 
         if correct_item_used:
             # Drop 5 of itself in item form
-            return [('item', (self._id,))] * 5
+            return [('item', (self.get_id(),))] * 5
 
     # The following methods have not been commented, and their comments
     # are inherited from Block
@@ -293,11 +412,15 @@ class ResourceBlock(Block):
         pass
 
     def __repr__(self):
-        return f"ResourceBlock({self._id!r})"
+        return f"ResourceBlock({self.get_id()!r})"
 
 
 class TrickCandleFlameBlock(Block):
     """Just when you thought you've blown it out, it comes back again"""
+    __slots__ = ('_i',)
+
+    # Each block also has a stage
+    _prototype_only = False
 
     _id = "mayhem"
 
@@ -324,6 +447,9 @@ class TrickCandleFlameBlock(Block):
 
     # The following methods have not been commented, and their comments
     # are inherited from Block
+    def get_spec(self):
+        return self.get_id(), self._i
+
     def use(self):
         pass
 
@@ -0,0 +1,250 @@
+"""
+Lazily generated terrain, divided into square chunks of grid cells.
+
+Each chunk's blocks are generated deterministically from a seed, so a chunk that hasn't been
+changed can be discarded when it is far from the player & regenerated identically when it is
+needed again. Only chunks that have been edited (e.g. by mining or placing blocks) have their
+contents kept while they are out of range.
+"""
+
+__author__ = "Joel Foster"
+__date__ = "17/10/2026"
+__version__ = "1.1.0"
+__copyright__ = "The University of Queensland, 2019"
+
+import random
+
+# The width/height (in grid cells) of each chunk
+CHUNK_SIZE = 8
+
+
+def chunk_of(column, row):
+    """(tuple<int, int>) Returns the (chunk column, chunk row) of the chunk containing the grid cell
+    at ('column', 'row')"""
+    return column // CHUNK_SIZE, row // CHUNK_SIZE
+
+
+def cells_in_chunk(chunk):
+    """Yields the (column, row) position of each grid cell in 'chunk', in column-major order
+
+    Parameters:
+        chunk (tuple<int, int>): The (chunk column, chunk row) of the chunk
+    """
+    chunk_column, chunk_row = chunk
+
+    for column in range(chunk_column * CHUNK_SIZE, (chunk_column + 1) * CHUNK_SIZE):
+        for row in range(chunk_row * CHUNK_SIZE, (chunk_row + 1) * CHUNK_SIZE):
+            yield column, row
+
+
+class ChunkGenerator:
+    """Generates the blocks for chunks of a world, deterministically from a seed
+
+    The ground is made of blocks chosen at random according to their weights, and lies
+    below a surface that is given by a function of the column. Features (i.e. specific
+    blocks at specific cells, such as trees) are placed on top of the ground.
+    """
+
+    def __init__(self, seed, block_weights, surface, features=None):
+        """Constructor
+
+        Parameters:
+            seed (int | str): The seed from which all chunks are generated
+            block_weights (list<tuple<float, str>>): (weight, block id) pairs for the ground
+            surface (callable): Called with a column; returns the row of its highest ground cell
+            features (dict<tuple<int, int>: tuple>): Mapping of (column, row) cells to the block id
+                                                     tuple (see create_block) of the block there
+        """
+        self._seed = seed
+        self._weights, self._block_ids = zip(*block_weights)
+        self._surface = surface
+        self._features = features or {}
+
+    def get_seed(self):
+        """(int | str) Returns the seed from which all chunks are generated"""
+        return self._seed
+
+    def generate(self, chunk):
+        """Generates the blocks in 'chunk'
+
+        The same chunk is always generated identically for the same seed, regardless of the
+        order in which chunks are generated.
+
+        Parameters:
+            chunk (tuple<int, int>): The (chunk column, chunk row) of the chunk
+
+        Return:
+            dict<tuple<int, int>: tuple>: Mapping of (column, row) cells to the block id tuple
+                                          (see create_block) of the block in that cell
+        """
+        chunk_column, chunk_row = chunk
+        rng = random.Random(f"{self._seed}/{chunk_column}/{chunk_row}")
+
+        ground = [(column, row) for column, row in cells_in_chunk(chunk) if row >= self._surface(column)]
+        kinds = rng.choices(self._block_ids, weights=self._weights, k=len(ground))
+
+        cells = {cell: (block_id,) for cell, block_id in zip(ground, kinds)}
+
+        for cell in cells_in_chunk(chunk):
+            if cell in self._features:
+                cells[cell] = self._features[cell]
+
+        return cells
+
+
+class ChunkManager:
+    """Keeps the chunks of a world near a point (usually the player) loaded into the world
+
+    Chunks within 'view_distance' chunks of the point are loaded. Chunks are only unloaded once
+    they are more than one chunk further away than that, so that moving back & forth across a
+    chunk boundary doesn't repeatedly load & unload the same chunks.
+
+    Dynamic things (i.e. mobs & items) in a chunk are removed from the world along with it, and
+    are put back when it is loaded again, rather than being left to fall through missing terrain.
+    """
+
+    def __init__(self, world, generator: ChunkGenerator, create_block, view_distance=2, edits=None):
+        """Constructor
+
+        Parameters:
+            world (World): The world to load chunks into
+            generator (ChunkGenerator): Generates chunks that have never been edited
+            create_block (callable): Creates a block from its block id tuple
+                                     (e.g. item_creation.create_block)
+            view_distance (int): The number of chunks in each direction to keep loaded
+            edits (MutableMapping<tuple<int, int>: dict>): The contents of chunks that differ from
+                    what would be generated (e.g. from a saved game, see save.SavedChunks),
+                    as a mapping of chunk to (column, row) -> block id tuple
+        """
+        self._world = world
+        self._generator = generator
+        self._create_block = create_block
+        self._view_distance = view_distance
+
+        self._loaded = set()
+
+        # Contents of unloaded chunks that differ from what would be generated
+        # Maps chunk -> dict<(column, row): block id tuple>
+        self._edits = {} if edits is None else edits
+
+        # Dynamic things removed from the world with their chunk
+        # Maps chunk -> list<PhysicalThing>
+        self._parked = {}
+
+    def get_loaded_chunks(self):
+        """(set<tuple<int, int>>) Returns the (chunk column, chunk row) of all loaded chunks"""
+        return set(self._loaded)
+
+    def get_generator(self) -> ChunkGenerator:
+        """(ChunkGenerator) Returns the generator for chunks that have never been edited"""
+        return self._generator
+
+    def get_edits(self):
+        """(dict<tuple<int, int>: dict>) Returns the contents of all unloaded chunks that have been
+        edited, as a mapping of chunk to (column, row) -> block id tuple"""
+        return self._edits
+
+    def get_parked(self):
+        """(list<PhysicalThing>) Returns the dynamic things that were removed from the world along
+        with their (unloaded) chunk"""
+        return [thing for things in self._parked.values() for thing in things]
+
+    def park(self, things):
+        """Removes those of 'things' that are in unloaded chunks from the world, to be put back
+        when their chunk is loaded (e.g. when restoring mobs & items from a saved game)"""
+        parked = {}
+        for thing in things:
+            chunk = chunk_of(*self._world.xy_to_grid(*thing.get_position()))
+            if chunk not in self._loaded:
+                parked.setdefault(chunk, []).append(thing)
+
+        for chunk, chunk_things in parked.items():
+            self._world.remove_things(chunk_things)
+            self._parked.setdefault(chunk, []).extend(chunk_things)
+
+    def set_cell(self, column, row, block_id):
+        """Sets the block in the grid cell at ('column', 'row'), whether or not its chunk is loaded
+        (e.g. when replaying changes recorded in a journal)
+
+        Parameters:
+            column, row (int): The grid cell
+            block_id (tuple): The block id tuple of the new block, or None to leave the cell empty
+        """
+        chunk = chunk_of(column, row)
+
+        if chunk in self._loaded:
+            block = self._world.get_block_at(column, row)
+            if block is not None:
+                self._world.remove_block(block)
+
+            if block_id is not None:
+                self._world.add_block_to_grid(self._create_block(*block_id), column, row)
+            return
+
+        cells = self._edits.get(chunk)
+        cells = dict(self._generator.generate(chunk) if cells is None else cells)
+
+        if block_id is None:
+            cells.pop((column, row), None)
+        else:
+            cells[column, row] = block_id
+
+        self._edits[chunk] = cells
+
+    def update(self, x, y):
+        """Loads the chunks near the point ('x', 'y') & unloads those that are too far away"""
+        centre_column, centre_row = chunk_of(*self._world.xy_to_grid(x, y))
+
+        columns, rows = self._world.get_grid_size()
+        last_column, last_row = chunk_of(columns - 1, rows - 1)
+
+        distance = self._view_distance
+
+        for chunk_column in range(max(0, centre_column - distance), min(last_column, centre_column + distance) + 1):
+            for chunk_row in range(max(0, centre_row - distance), min(last_row, centre_row + distance) + 1):
+                if (chunk_column, chunk_row) not in self._loaded:
+                    self.load((chunk_column, chunk_row))
+
+        for chunk in list(self._loaded):
+            chunk_column, chunk_row = chunk
+
+            if max(abs(chunk_column - centre_column), abs(chunk_row - centre_row)) > distance + 1:
+                self.unload(chunk)
+
+    def load(self, chunk):
+        """Loads the blocks (& any things removed with it) of 'chunk' into the world"""
+        cells = self._edits.pop(chunk, None)
+        if cells is None:
+            cells = self._generator.generate(chunk)
+
+        for (column, row), block_id in cells.items():
+            if self._world.is_in_grid(column, row):
+                self._world.add_block_to_grid(self._create_block(*block_id), column, row)
+
+        self._world.restore_things(self._parked.pop(chunk, ()))
+
+        self._loaded.add(chunk)
+
+    def unload(self, chunk):
+        """Removes the blocks (& any mobs or items) in 'chunk' from the world, keeping its contents
+        only if they differ from what would be generated"""
+        cell_expanse = self._world.get_cell_expanse()
+        chunk_column, chunk_row = chunk
+        left, top = self._world.grid_to_xy(chunk_column * CHUNK_SIZE, chunk_row * CHUNK_SIZE)
+        right, bottom = left + CHUNK_SIZE * cell_expanse, top + CHUNK_SIZE * cell_expanse
+
+        things = [thing for thing in self._world.get_things_in_rect(left, top, right, bottom, ("mob", "item"))
+                  if chunk_of(*self._world.xy_to_grid(*thing.get_position())) == chunk]
+        if things:
+            self._world.remove_things(things)
+            self._parked[chunk] = things
+
+        blocks = self._world.unload_chunk(chunk)
+        cells = {cell: block.get_spec() for cell, block in blocks.items()}
+
+        generated = {cell: block_id for cell, block_id in self._generator.generate(chunk).items()
+                     if self._world.is_in_grid(*cell)}
+        if cells != generated:
+            self._edits[chunk] = cells
+
+        self._loaded.discard(chunk)
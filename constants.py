@@ -60,6 +60,7 @@ SHEEP_GRAVITY_FACTOR = 50
 SHEEP_X_SCALE = 2.763
 BEE_GRAVITY_FACTOR = 300
 BEE_X_SCALE = 1.01
+BEE_HONEY_RANGE = 250
 
 from grid import Stack
 from item_creation import create_item
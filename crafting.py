@@ -9,14 +9,38 @@ __copyright__ = "The University of Queensland, 2019"
 
 import tkinter as tk
 
-from constants import FURNACE_RECIPES
 from core import TK_MOUSE_EVENTS
 from grid import Grid, SelectableGrid, ItemGridView
 from core import get_modifiers
+from events import get_log, NoMatchingRecipe, Crafted, CraftingOutputFull, CraftingCellClicked
+
+log = get_log(__name__)
+
+
+def normalise_pattern(pattern):
+    """Trims a crafting pattern to the bounding box of its non-empty cells
+
+    I.e. removes all leading & trailing rows & columns that contain only None, so that
+    the same arrangement of ingredients produces the same pattern wherever it is placed
+    in the crafting grid.
+
+    Parameters:
+        pattern (tuple<tuple<str>>): The crafting pattern (see Grid.get_crafting_pattern)
+
+    Return:
+        tuple<tuple<str>>: The trimmed pattern (empty if the pattern has no ingredients)
+    """
+    rows = [i for i, row in enumerate(pattern) if any(cell is not None for cell in row)]
+    if not rows:
+        return ()
+
+    columns = [j for j in range(len(pattern[0])) if any(row[j] is not None for row in pattern)]
+
+    return tuple(tuple(row[columns[0]:columns[-1] + 1]) for row in pattern[rows[0]:rows[-1] + 1])
 
 
 class GridCrafter:
-    def __init__(self, recipes, rows=2, columns=2):
+    def __init__(self, recipes, rows=2, columns=2, normalise=False):
         """Initialises a row x column grid crafter with certain recipes
 
         Parameters:
@@ -34,18 +58,41 @@ class GridCrafter:
                     See CRAFTING_RECIPES_2x2, etc. in app.py
             rows (int): The number of rows in the crafting input
             columns (int): The number of rows in the crafting output
+            normalise (bool): If True, recipes & ingredients are compared by their non-empty
+                              bounding box (see normalise_pattern), so a recipe matches wherever
+                              its ingredients are placed in the grid, and recipes may be smaller
+                              than the grid
         """
         self._input = SelectableGrid(rows=rows, columns=columns)
         self._output = None
         self._selected = None
-        if recipes != FURNACE_RECIPES:
-            for recipe in recipes:
-                if len(recipe) != rows and len(recipe[0]) != columns:
-                    raise ValueError(f"Wrong recipe dimensions; expecting {rows}x{columns} but "
-                                    f"got {len(recipe)}x{len(recipe[0])} with {recipe}")
+        self._normalise = normalise
+
+        for pattern, result in recipes:
+            pattern_rows, pattern_columns = len(pattern), len(pattern[0]) if pattern else 0
+
+            if normalise:
+                is_valid = pattern_rows <= rows and pattern_columns <= columns
+            else:
+                is_valid = pattern_rows == rows and pattern_columns == columns
+
+            if not is_valid:
+                raise ValueError(f"Wrong recipe dimensions; expecting {rows}x{columns} but "
+                                 f"got {pattern_rows}x{pattern_columns} with {pattern}")
 
         self._recipes = recipes
 
+        # Maps each recipe's (normalised) pattern to the recipe
+        # Where multiple recipes have the same pattern, the first takes precedence
+        self._recipe_index = {}
+        for recipe in recipes:
+            self._recipe_index.setdefault(self._get_key(recipe[0]), recipe)
+
+    def _get_key(self, pattern):
+        """(tuple<tuple<str>>) Returns the key for 'pattern' in the recipe index"""
+        pattern = tuple(tuple(row) for row in pattern)
+        return normalise_pattern(pattern) if self._normalise else pattern
+
     def find_match(self, ingredients):
         """Finds the first recipe that matches ingredients
 
@@ -68,11 +115,7 @@ class GridCrafter:
             >: The result of crafting with these ingredients, or None
             (Recipes parameter of __init__ is a list of these)
         """
-        for recipe in self._recipes:
-            if ingredients == recipe[0]:
-                return recipe
-
-        return None
+        return self._recipe_index.get(self._get_key(ingredients))
 
     def craft(self):
         """Crafts the input to the output"""
@@ -81,17 +124,17 @@ class GridCrafter:
         recipe = self.find_match(ingredients)
 
         if not recipe:
-            print("No matching recipe")
+            log.emit(NoMatchingRecipe)
         else:
             result = recipe[1].copy()
-            print("Crafts to: ", result)
+            log.emit(Crafted, result)
 
             if self._output is None:
                 self._output = result
             elif self._output.matches(result) and self._output.get_space() > 0:
                 self._output.absorb(result)
             else:
-                print("Can't craft when output is full")
+                log.emit(CraftingOutputFull)
                 return
 
             # consume ingredients
@@ -304,7 +347,7 @@ class CraftingWindow(tk.Toplevel):
     """Tkinter widget to manage a the three relevant widgets for a crafting window:
         crafter, inventory, and hotbar"""
 
-    def __init__(self, master, title, hot_bar: Grid, inventory: Grid, crafter: GridCrafter):
+    def __init__(self, master, title, hot_bar: Grid, inventory: Grid, crafter: GridCrafter, on_change=None):
         """Constructor
 
         Parameters:
@@ -313,10 +356,13 @@ class CraftingWindow(tk.Toplevel):
             hotbar (Grid): The hotbar to show at the bottom of the window
             inventory (Grid): The inventory to show above the hotbar, below the crafting widget
             crafter (GridCraft): The crafter that powers the crafting widget
+            on_change (callable): Called without arguments after items are moved (see move1 & move2)
+                                  or crafted, or None
         """
         super().__init__(master)
 
         self.title(title)
+        self._on_change = on_change
 
         self._sources = {
             'hot_bar': hot_bar,
@@ -459,7 +505,7 @@ class CraftingWindow(tk.Toplevel):
                      'output', (0, 0), etc.)
             mouse_event (tk.MouseEvent): The original tkinter mouse event
         """
-        print(f"Left clicked on {widget_key} @ {key}")
+        log.emit(CraftingCellClicked, "Left", widget_key, key)
         selection = widget_key, key
 
         if selection == ('crafter', 'craft'):
@@ -467,6 +513,9 @@ class CraftingWindow(tk.Toplevel):
         else:
             self.move1(selection, get_modifiers(mouse_event.state))
 
+        if self._on_change is not None:
+            self._on_change()
+
         self.redraw()
 
     def _handle_right_click(self, widget_key, key, mouse_event):
@@ -478,7 +527,7 @@ class CraftingWindow(tk.Toplevel):
                      'output', (0, 0), etc.)
             mouse_event (tk.MouseEvent): The original tkinter mouse event
         """
-        print(f"Right clicked on {widget_key} @ {key}")
+        log.emit(CraftingCellClicked, "Right", widget_key, key)
         selection = widget_key, key
 
         if selection == ('crafter', 'craft'):
@@ -486,4 +535,7 @@ class CraftingWindow(tk.Toplevel):
         else:
             self.move2(selection, get_modifiers(mouse_event.state))
 
+        if self._on_change is not None:
+            self._on_change()
+
         self.redraw()
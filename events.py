@@ -0,0 +1,245 @@
+"""
+A structured log of game events, built on the standard logging module.
+
+Code reports what happened as typed events (namedtuples, see define_event), through an
+EventLog for its module:
+
+    >>> log = get_log(__name__)
+    >>> log.emit(ItemDropped, "item", ("wood",))
+
+An event is only created if its level is enabled for the module's logger, so emitting an
+event that nobody is listening to costs little more than a cached level check. Enabled events
+are put on an in-memory queue & formatted & written by a background thread (see configure),
+so the game never waits on a slow terminal or file. Since events are formatted later, the
+objects they refer to may have changed by the time they are written.
+
+Levels are set per module, e.g. NINEDRAFT_LOG="INFO,block=DEBUG,crafting=WARNING" shows
+INFO events from every module, all events from block.py, and only warnings from crafting.py
+(see parse_levels). Without configuration, only warnings are shown.
+"""
+
+__author__ = "Joel Foster"
+__date__ = "17/10/2026"
+__version__ = "1.1.0"
+__copyright__ = "The University of Queensland, 2019"
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from collections import namedtuple
+
+# The logger that the loggers of all modules are children of
+ROOT_LOGGER = "ninedraft"
+
+# The environment variable read by configure, if no levels are given
+LEVELS_VARIABLE = "NINEDRAFT_LOG"
+
+# The level of modules that aren't given their own level
+DEFAULT_LEVEL = logging.WARNING
+
+LOG_FORMAT = "%(relativeCreated)8d %(levelname)-7s %(name)s: %(message)s"
+
+# The listener writing queued events on a background thread, while configured
+_listener = None
+
+
+def define_event(name, fields, message, level=logging.INFO):
+    """Defines a type of event
+
+    Parameters:
+        name (str): The name of the event type
+        fields (str): The space separated names of the event's fields
+        message (str): Format string for the event's log message, formatted with its fields
+        level (int): The logging level the event is emitted at
+
+    Return:
+        type: A namedtuple class for the events, whose str is its log message
+    """
+    base = namedtuple(name, fields)
+
+    def __str__(self):
+        return message.format(**self._asdict())
+
+    return type(name, (base,), {"__slots__": (), "__str__": __str__, "level": level, "message": message})
+
+
+# Blocks
+BlockDamaged = define_event("BlockDamaged", "damage item correct",
+                            "Did {damage} damage with {item} (correct? {correct})", logging.DEBUG)
+LeafBlockUsed = define_event("LeafBlockUsed", "", "Kayn't nobudy use a leaf blahk foo", logging.DEBUG)
+
+# Mining, attacking & using
+ItemDropped = define_event("ItemDropped", "category types", "Dropped {category}, {types}")
+MobDamaged = define_event("MobDamaged", "damage mob", "Did {damage} to {mob}", logging.DEBUG)
+ThingUsed = define_event("ThingUsed", "target effect", "used {target} and got {effect}")
+StatGained = define_event("StatGained", "stat strength", "Gaining {strength} {stat}!")
+CraftingStarted = define_event("CraftingStarted", "craft_type remark", "{remark}")
+
+# Picking up items
+ItemsAdded = define_event("ItemsAdded", "quantity item grid", "Added {quantity} {item!r} to the {grid}")
+ItemsNotPickedUp = define_event("ItemsNotPickedUp", "quantity item",
+                                "Found {quantity} {item!r}, but both hotbar & inventory are full")
+
+# Crafting
+NoMatchingRecipe = define_event("NoMatchingRecipe", "", "No matching recipe", logging.DEBUG)
+Crafted = define_event("Crafted", "result", "Crafts to: {result}")
+CraftingOutputFull = define_event("CraftingOutputFull", "", "Can't craft when output is full")
+CraftingCellClicked = define_event("CraftingCellClicked", "button widget key",
+                                   "{button} clicked on {widget} @ {key}", logging.DEBUG)
+
+# User interface
+Clicked = define_event("Clicked", "button x y", "{button} click at ({x}, {y})", logging.DEBUG)
+CraftingWindowOpened = define_event("CraftingWindowOpened", "craft_type", "Crafting with {craft_type}")
+HotbarItemActivated = define_event("HotbarItemActivated", "index", "Activating {index}", logging.DEBUG)
+AutosaveUnavailable = define_event("AutosaveUnavailable", "error", "Cannot autosave: {error}", logging.WARNING)
+InputFailed = define_event("InputFailed", "action arguments tick error",
+                           "Input {action}{arguments} at tick {tick} failed: {error}", logging.WARNING)
+
+
+class EventLog:
+    """Emits the events of a single module to its logger"""
+
+    __slots__ = ('_logger',)
+
+    def __init__(self, logger: logging.Logger):
+        """Constructor
+
+        Parameters:
+            logger (logging.Logger): The logger to emit events to
+        """
+        self._logger = logger
+
+    def get_logger(self):
+        """(logging.Logger) Returns the logger that events are emitted to"""
+        return self._logger
+
+    def is_enabled(self, event_type):
+        """(bool) Returns True iff events of 'event_type' are currently logged"""
+        return self._logger.isEnabledFor(event_type.level)
+
+    def emit(self, event_type, *fields):
+        """Logs an event, if its level is enabled
+
+        The event is only created if it will be logged, so callers should pass its fields,
+        rather than an event.
+
+        Parameters:
+            event_type (type): The type of event (see define_event)
+            fields (*): The event's fields, in order
+        """
+        logger = self._logger
+
+        if logger.isEnabledFor(event_type.level):
+            event = event_type(*fields)
+            logger.log(event_type.level, event, extra={"event": event})
+
+
+def get_log(module_name):
+    """(EventLog) Returns the event log for a module
+
+    Parameters:
+        module_name (str): The name of the module (i.e. __name__)
+    """
+    return EventLog(logging.getLogger(f"{ROOT_LOGGER}.{module_name}"))
+
+
+def parse_levels(text):
+    """Parses per-module levels from a comma separated list of [module=]LEVEL settings
+
+    A setting without a module sets the default level.
+
+    Example:
+        >>> parse_levels("INFO,block=DEBUG")
+        {'': 20, 'block': 10}
+
+    Return:
+        dict<str: int>: Mapping of module name ('' for the default) -> logging level
+
+    Raises:
+        ValueError: if a level is not the name of a logging level
+    """
+    levels = {}
+
+    for setting in text.split(","):
+        setting = setting.strip()
+        if not setting:
+            continue
+
+        module, _, name = setting.rpartition("=")
+        level = logging.getLevelName(name.strip().upper())
+        if not isinstance(level, int):
+            raise ValueError(f"Unknown logging level {name!r}")
+
+        levels[module.strip()] = level
+
+    return levels
+
+
+class _EventQueueHandler(logging.handlers.QueueHandler):
+    """Queues records without formatting them, so that events are formatted on the listener's thread"""
+
+    def prepare(self, record):
+        if record.exc_info:
+            # Tracebacks can't be formatted once the exception has been handled
+            return super().prepare(record)
+        return record
+
+
+def configure(levels=None, handlers=None):
+    """Starts writing events on a background thread
+
+    Replaces any previous configuration. Events still queued when the program exits are written
+    before it exits.
+
+    Parameters:
+        levels (dict<str: int>): Mapping of module name -> level, with '' for the default level
+                                 (see parse_levels); if None, read from the NINEDRAFT_LOG
+                                 environment variable
+        handlers (list<logging.Handler>): The handlers that write events, or None to write them
+                                          to stderr
+    """
+    global _listener
+
+    shutdown()
+
+    if levels is None:
+        levels = parse_levels(os.environ.get(LEVELS_VARIABLE, ""))
+
+    if handlers is None:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        handlers = [handler]
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(levels.get("", DEFAULT_LEVEL))
+    root.propagate = False
+
+    for module, level in levels.items():
+        if module:
+            logging.getLogger(f"{ROOT_LOGGER}.{module}").setLevel(level)
+
+    events = queue.SimpleQueue()
+    root.addHandler(_EventQueueHandler(events))
+
+    _listener = logging.handlers.QueueListener(events, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown():
+    """Writes all queued events & stops the background thread, if configured"""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+        root = logging.getLogger(ROOT_LOGGER)
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.propagate = True
+
+
+atexit.register(shutdown)
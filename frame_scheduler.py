@@ -0,0 +1,175 @@
+"""
+Paces the main loop of the tkinter app, so that the game ticks at a steady rate.
+
+Each tick steps the simulation, & renders if a frame is due. Ticks are scheduled against
+fixed deadlines, rather than a fixed delay after the previous tick finishes, so slow ticks
+don't compound into a lower tick rate, & fast machines don't wait longer than needed.
+
+Rendering runs at its own (usually equal or lower) rate. When ticks fall behind their
+deadlines, rendering is skipped (up to a limit) to let the simulation catch up; the
+simulation itself is never skipped, since the world already simulates the real time elapsed
+in fixed substeps (see World.step).
+"""
+
+__author__ = "Joel Foster"
+__date__ = "17/10/2026"
+__version__ = "1.1.0"
+__copyright__ = "The University of Queensland, 2019"
+
+import time
+from collections import deque
+
+from profiler import percentile
+
+# The default number of simulation ticks per second
+TICK_RATE = 60
+
+# The default number of frames rendered per second
+RENDER_RATE = 60
+
+# The most consecutive frames that can be skipped while ticks are behind
+MAX_RENDER_SKIP = 4
+
+# Once ticks are this many ticks behind their deadlines, the missed ticks are abandoned & the
+# deadlines restart from now (e.g. after the loop was blocked by a dialog)
+MAX_TICKS_BEHIND = 10
+
+# The number of recent ticks that statistics are calculated from
+STATISTICS_WINDOW = 120
+
+
+class FrameScheduler:
+    """Decides when the next tick should run, & whether each tick should render
+
+    Usage, from a method that is scheduled with tkinter's after:
+        scheduler.begin_tick()
+        ... step the simulation ...
+        if scheduler.should_render():
+            ... render ...
+        master.after(scheduler.end_tick(), step)
+    """
+
+    def __init__(self, tick_rate=TICK_RATE, render_rate=RENDER_RATE, max_render_skip=MAX_RENDER_SKIP,
+                 clock=time.perf_counter):
+        """Constructor
+
+        Parameters:
+            tick_rate (float): The number of simulation ticks per second
+            render_rate (float): The number of frames rendered per second (at most one per tick)
+            max_render_skip (int): The most consecutive due frames that are skipped while behind
+            clock (callable): Returns a monotonic time in seconds
+        """
+        self._clock = clock
+        self._max_render_skip = max_render_skip
+        self.set_rates(tick_rate, render_rate)
+
+        # Deadlines of the next tick & frame, or None until the first tick
+        self._next_tick = None
+        self._next_render = None
+
+        self._tick_start = None
+        self._lag = 0.
+        self._skipped = 0
+
+        # Statistics of recent ticks: (start, duration) of each tick, & start of each render
+        self._ticks = deque(maxlen=STATISTICS_WINDOW)
+        self._renders = deque(maxlen=STATISTICS_WINDOW)
+        self._total_skipped = 0
+
+    def set_rates(self, tick_rate, render_rate):
+        """Sets the number of simulation ticks & rendered frames per second"""
+        self._tick_interval = 1 / tick_rate
+        self._render_interval = 1 / render_rate
+
+    def get_rates(self):
+        """(tuple<float, float>) Returns the number of simulation ticks & rendered frames per second"""
+        return 1 / self._tick_interval, 1 / self._render_interval
+
+    def begin_tick(self):
+        """Starts a tick; must be called before should_render & end_tick"""
+        now = self._tick_start = self._clock()
+
+        if self._next_tick is None or now - self._next_tick > MAX_TICKS_BEHIND * self._tick_interval:
+            self._next_tick = now
+            self._next_render = now
+
+        # How late this tick started
+        self._lag = now - self._next_tick
+        self._next_tick += self._tick_interval
+
+    def is_behind(self):
+        """(bool) Returns True iff the current tick started a whole tick or more after its deadline"""
+        return self._lag >= self._tick_interval
+
+    def should_render(self):
+        """(bool) Returns True iff a frame should be rendered this tick
+
+        Rendering is skipped if no frame is due, or if the tick is behind (unless too many
+        frames have been skipped in a row already).
+        """
+        now = self._clock()
+
+        if now < self._next_render:
+            return False
+
+        if self.is_behind() and self._skipped < self._max_render_skip:
+            # Leave the frame due, so it's rendered as soon as the ticks catch up
+            self._skipped += 1
+            self._total_skipped += 1
+            return False
+
+        self._skipped = 0
+        self._renders.append(now)
+
+        self._next_render += self._render_interval
+        if self._next_render < now:
+            self._next_render = now + self._render_interval
+
+        return True
+
+    def end_tick(self):
+        """Finishes the current tick
+
+        Return:
+            int: The delay (in milliseconds) until the next tick is due, for tkinter's after
+        """
+        now = self._clock()
+        self._ticks.append((self._tick_start, now - self._tick_start))
+
+        return max(0, int((self._next_tick - now) * 1000))
+
+    def get_statistics(self):
+        """Returns statistics of the recent ticks (see STATISTICS_WINDOW)
+
+        Return:
+            dict<str: float>: Mapping with keys:
+                - 'ticks_per_second' & 'frames_per_second': the measured rates
+                - 'tick_mean', 'tick_p95' & 'tick_max': the time (in milliseconds) spent in each tick
+                - 'lag': how late (in milliseconds) the last tick started
+                - 'skipped_frames': the total number of frames skipped so far
+        """
+        statistics = {
+            "ticks_per_second": self._rate(tick_start for tick_start, _ in self._ticks),
+            "frames_per_second": self._rate(self._renders),
+            "tick_mean": 0.,
+            "tick_p95": 0.,
+            "tick_max": 0.,
+            "lag": self._lag * 1000,
+            "skipped_frames": self._total_skipped,
+        }
+
+        durations = sorted(duration * 1000 for _, duration in self._ticks)
+        if durations:
+            statistics["tick_mean"] = sum(durations) / len(durations)
+            statistics["tick_p95"] = percentile(durations, 95)
+            statistics["tick_max"] = durations[-1]
+
+        return statistics
+
+    @staticmethod
+    def _rate(times):
+        """(float) Returns the number of events per second, given the times they occurred at"""
+        times = list(times)
+        if len(times) < 2 or times[-1] == times[0]:
+            return 0.
+        return (len(times) - 1) / (times[-1] - times[0])
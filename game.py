@@ -20,25 +20,116 @@ from mob import Mob, Bird
 from new_mobs import Sheep, Bee
 
 
+class Camera:
+    """The rectangle of the world that is visible on screen (i.e. the viewport)
+
+    The camera follows a point (usually the player), keeping it centred on screen where
+    possible, without showing anything beyond the edges of the world.
+    """
+
+    def __init__(self, viewport_size, world_size):
+        """Constructor
+
+        Parameters:
+            viewport_size (tuple<int, int>): The (width, height) size of the viewport, in pixels
+            world_size (tuple<int, int>): The (width, height) size of the world, in pixels
+        """
+        self._width, self._height = viewport_size
+        self._world_width, self._world_height = world_size
+
+        self._left = self._top = 0
+
+    def get_viewport_size(self):
+        """(tuple<int, int>) Returns the (width, height) size of the viewport, in pixels"""
+        return self._width, self._height
+
+    def get_world_size(self):
+        """(tuple<int, int>) Returns the (width, height) size of the world, in pixels"""
+        return self._world_width, self._world_height
+
+    def set_world_size(self, world_size):
+        """Sets the (width, height) size of the world, in pixels, that the camera is confined to"""
+        self._world_width, self._world_height = world_size
+        self.move_to(self._left, self._top)
+
+    def get_position(self):
+        """(tuple<int, int>) Returns the world position of the top-left corner of the viewport"""
+        return self._left, self._top
+
+    def get_viewport(self):
+        """(tuple<int, int, int, int>) Returns the (left, top, right, bottom) world rectangle that
+        is visible"""
+        return self._left, self._top, self._left + self._width, self._top + self._height
+
+    def move_to(self, left, top):
+        """Moves the top-left corner of the viewport to the world position ('left', 'top'), as far
+        as the edges of the world allow"""
+        self._left = int(max(0, min(left, self._world_width - self._width)))
+        self._top = int(max(0, min(top, self._world_height - self._height)))
+
+    def follow(self, x, y):
+        """Centres the viewport on the world position ('x', 'y'), as far as the edges of the world allow"""
+        self.move_to(x - self._width // 2, y - self._height // 2)
+
+    def world_to_screen(self, x, y):
+        """(tuple<float, float>) Converts a world position to a position on screen"""
+        return x - self._left, y - self._top
+
+    def screen_to_world(self, x, y):
+        """(tuple<float, float>) Converts a position on screen (e.g. of the mouse) to a world position"""
+        return x + self._left, y + self._top
+
+
 class GameView(tk.Canvas):
-    """A view class for the sandbox game, with convenience methods to draw various parts of the UI"""
+    """A view class for the sandbox game, with convenience methods to draw various parts of the UI
+
+    Things are drawn on the canvas at their world positions, and the canvas is scrolled to
+    show only the camera's viewport. Only things within the viewport should be drawn (see
+    get_viewport), so that the cost of drawing is bounded by the size of the screen, rather
+    than the size of the world.
+    """
 
-    def __init__(self, master, size, physical_view_router: InstanceRouter):
+    def __init__(self, master, size, physical_view_router: InstanceRouter, camera: Camera = None):
         """Constructor
 
         Parameters:
             master (tk.Tk | tk.Toplevel | tk.Frame): The tkinter master widget
-            size (tuple<int, int>): The (width, height) size of the view, in pixels
+            size (tuple<int, int>): The (width, height) size of the world, in pixels
             physical_view_router (InstanceRouter):
                     View router that facilitates drawing of physical items through
                     calling route_and_call method with:
                         (physical thing, physical thing's shape, self (canvas))
+            camera (Camera): The camera that decides which part of the world is visible,
+                             or None to show the whole world
         """
-        width, height = size
+        if camera is None:
+            camera = Camera(size, size)
+
+        self._camera = camera
+
+        width, height = camera.get_viewport_size()
         super().__init__(master, width=width, height=height)
 
+        self._scroll_position = None
+        self.set_world_size(size)
+
         self._world_view_router = physical_view_router
 
+        # Retained canvas state for each drawn physical thing
+        # Maps thing -> (canvas item ids, (left, top, right, bottom) box the items were drawn at)
+        self._drawn_things = {}
+
+        # Retained canvas state for the terrain (i.e. blocks)
+        # Maps (column, row) grid cell -> canvas item ids for the block in that cell
+        self._terrain_items = {}
+        self._terrain_world = None
+
+        # The (first column, first row, last column, last row) of the visible grid cells, as last drawn
+        self._terrain_cells = None
+
+        # The (background, text) canvas item ids of the profile overlay, or None if it is hidden
+        self._profile_items = None
+
     def show_target(self, player_position, target_position, cursor_position=None,
                     target_radius=14, target_thickness=2, crosshair_radius=4,
                     target_colour='purple', cursor_bg_colour='grey', cursor_fg_colour='white'):
@@ -94,6 +185,50 @@ class GameView(tk.Canvas):
             self.create_line(horizontal, fill=cursor_fg_colour, tag='cursor')
             self.create_line(vertical, fill=cursor_fg_colour, tag='cursor')
 
+    def get_camera(self):
+        """(Camera) Returns the camera that decides which part of the world is visible"""
+        return self._camera
+
+    def get_viewport(self):
+        """(tuple<int, int, int, int>) Returns the (left, top, right, bottom) world rectangle that
+        is visible"""
+        return self._camera.get_viewport()
+
+    def set_world_size(self, size):
+        """Sets the (width, height) size of the world, in pixels, that can be scrolled over"""
+        width, height = size
+        self._camera.set_world_size(size)
+        self.configure(scrollregion=(0, 0, width, height))
+
+        self._scroll_position = None
+        self.scroll_to_camera()
+
+    def follow(self, x, y):
+        """Moves the camera to centre the world position ('x', 'y') on screen"""
+        self._camera.follow(x, y)
+        self.scroll_to_camera()
+
+    def scroll_to_camera(self):
+        """Scrolls the canvas so that the camera's viewport is visible
+
+        Canvas items stay at their world positions; scrolling only changes which part of the
+        canvas is on screen, so no items need to be moved when the camera moves.
+        """
+        position = self._camera.get_position()
+        if position == self._scroll_position:
+            return
+
+        left, top = position
+        width, height = self._camera.get_world_size()
+        self.xview_moveto(left / width)
+        self.yview_moveto(top / height)
+
+        self._scroll_position = position
+
+    def screen_to_world(self, x, y):
+        """(tuple<float, float>) Converts a position on screen (e.g. of a mouse event) to a world position"""
+        return self._camera.screen_to_world(x, y)
+
     def hide_target(self):
         """Removes the target & cursor from the screen"""
         self.delete('cursor', 'target')
@@ -101,14 +236,161 @@ class GameView(tk.Canvas):
     def draw_physical(self, things: Iterable[PhysicalThing]):
         """Draws all physical things, according to their draw method (on the view router)
 
+        Canvas items are retained between calls, so only the differences from the previous
+        call are applied to the canvas:
+            - things that were not drawn previously are created
+            - things whose bounding box has moved are moved
+            - things that were drawn previously, but are absent from 'things', are deleted
+
         Parameters:
             things (iterable<PhysicalThing>): The physical things to draw.
         """
+        previous = self._drawn_things
+        drawn = {}
+
         for thing in things:
             shape = thing.get_shape()
+            bb = shape.bb
+            box = bb.left, bb.top, bb.right, bb.bottom
+
+            state = previous.pop(thing, None)
+
+            if state is None:
+                items = self._world_view_router.route_and_call(thing, shape, self)
+            else:
+                items, (left, top, right, bottom) = state
+
+                if (right - left, bottom - top) != (bb.right - bb.left, bb.bottom - bb.top):
+                    # Size has changed, so moving isn't sufficient
+                    self.delete(*items)
+                    items = self._world_view_router.route_and_call(thing, shape, self)
+                elif (left, top) != (bb.left, bb.top):
+                    dx, dy = bb.left - left, bb.top - top
+                    for item in items:
+                        self.move(item, dx, dy)
+
+            drawn[thing] = items, box
+
+        # Anything left over is no longer in the world
+        for items, _ in previous.values():
+            self.delete(*items)
+
+        self._drawn_things = drawn
+
+    def draw_terrain(self, world):
+        """Draws the blocks in 'world' that are within the viewport, repainting only the grid cells
+        that have changed since the last call (see World.pop_dirty_cells), or that have scrolled
+        into view
+
+        Terrain is drawn beneath all other physical things. If 'world' is not the world that was
+        last drawn, the previous terrain is cleared and every visible block in 'world' is drawn.
+        Blocks that scroll out of view are deleted from the canvas.
+
+        Parameters:
+            world (World): The world whose terrain to draw
+        """
+        if world is not self._terrain_world:
+            self.clear_terrain()
+            self._terrain_world = world
+
+        left, top, right, bottom = self._camera.get_viewport()
+        first_column, first_row = world.xy_to_grid(left, top)
+        last_column, last_row = world.xy_to_grid(right - 1, bottom - 1)
+        cells = first_column, first_row, last_column, last_row
+
+        def is_visible(column, row, cells=cells):
+            return cells[0] <= column <= cells[2] and cells[1] <= row <= cells[3]
+
+        dirty = world.pop_dirty_cells()
+
+        previous = self._terrain_cells
+        if cells != previous:
+            for cell in [cell for cell in self._terrain_items if not is_visible(*cell)]:
+                self.delete(*self._terrain_items.pop(cell))
+
+            for column in range(first_column, last_column + 1):
+                for row in range(first_row, last_row + 1):
+                    if previous is None or not is_visible(column, row, previous):
+                        dirty.add((column, row))
+
+            self._terrain_cells = cells
+
+        for column, row in dirty:
+            if not is_visible(column, row):
+                continue
+
+            self.delete(*self._terrain_items.pop((column, row), ()))
+
+            block = world.get_block_at(column, row)
+            if block is None:
+                continue
+
+            items = self._world_view_router.route_and_call(block, block.get_shape(), self)
+            for item in items:
+                self.tag_lower(item)
+
+            self._terrain_items[column, row] = items
+
+    def clear_terrain(self):
+        """Deletes the canvas items for all blocks"""
+        for items in self._terrain_items.values():
+            self.delete(*items)
+
+        self._terrain_items = {}
+        self._terrain_world = None
+        self._terrain_cells = None
+
+    def show_profile(self, text, margin=8, padding=4, font=('Courier', 9),
+                     text_colour='white', background_colour='black'):
+        """Shows 'text' (e.g. a summary from profiler.format_summary) in the top left corner of the screen,
+        above everything else
+
+        The overlay's canvas items are retained, so it is cheap to call this every frame.
+
+        Parameters:
+            text (str): The text to show
+            margin (int): The distance from the edges of the screen to the overlay
+            padding (int): The distance from the text to the edges of its background
+            font (tuple): The font of the text
+            text_colour (str): The colour of the text
+            background_colour (str): The colour of the background behind the text
+        """
+        left, top, _, _ = self.get_viewport()
+        x, y = left + margin + padding, top + margin + padding
+
+        if self._profile_items is None:
+            background = self.create_rectangle(0, 0, 0, 0, fill=background_colour, outline='', tag='profile')
+            label = self.create_text(x, y, text=text, anchor=tk.NW, font=font, fill=text_colour, tag='profile')
+            self._profile_items = background, label
+        else:
+            background, label = self._profile_items
+            self.coords(label, x, y)
+            self.itemconfigure(label, text=text)
+
+        text_left, text_top, text_right, text_bottom = self.bbox(label)
+        self.coords(background, text_left - padding, text_top - padding, text_right + padding, text_bottom + padding)
+
+        self.tag_raise('profile')
+
+    def hide_profile(self):
+        """Removes the overlay shown by show_profile from the screen"""
+        self.delete('profile')
+        self._profile_items = None
+
+    def forget_physical(self, thing: PhysicalThing):
+        """Deletes the canvas items for 'thing', forcing it to be recreated when next drawn
+
+        Should be used when a thing's appearance changes without its bounding box changing.
+        """
+        items, _ = self._drawn_things.pop(thing, ((), None))
+        self.delete(*items)
+
+    def clear_physical(self):
+        """Deletes the canvas items for all physical things"""
+        for items, _ in self._drawn_things.values():
+            self.delete(*items)
 
-            # QUERY: cache these?
-            items = self._world_view_router.route_and_call(thing, shape, self)
+        self._drawn_things = {}
 
 
 class WorldViewRouter(InstanceRouter):
@@ -9,11 +9,17 @@ __copyright__ = "The University of Queensland, 2019"
 
 import tkinter as tk
 from typing import Tuple, Generator
+import heapq
+import itertools
 import json
 
 from core import TK_MOUSE_EVENTS
 from item import Item
 
+# Source of Grid versions; versions are unique across all grids, so a view can't mistake one grid
+# for another with the same number of changes (see Grid.get_version)
+_grid_versions = itertools.count()
+
 
 class Stack(object):
     """Stacks are used to store Items with a stack quantity. Stacks appear in the inventory (and
@@ -36,6 +42,13 @@ class Stack(object):
         self._item = item
         self._quantity = quantity
 
+        # Incremented whenever the quantity changes (see get_version)
+        self._version = 0
+
+    def get_version(self) -> int:
+        """(int) Returns a number that increases whenever this stack (or its item) changes"""
+        return self._version + self._item.get_version()
+
     def copy(self):
         """(Stack) Returns a copy of this stack"""
         return self.__class__(self.get_item(), self.get_quantity())
@@ -91,7 +104,9 @@ class Stack(object):
         return (int): amount added to this stack"""
 
         to_add = min(self._quantity + quantity, self._item.get_max_stack_size()) - self._quantity
-        self._quantity += to_add
+        if to_add:
+            self._quantity += to_add
+            self._version += 1
         return to_add
 
     def subtract(self, quantity: int) -> int:
@@ -105,7 +120,9 @@ class Stack(object):
         size"""
 
         remainder = self._quantity - quantity
-        self._quantity = max(0, remainder)
+        if quantity:
+            self._quantity = max(0, remainder)
+            self._version += 1
         return abs(remainder) if remainder > 0 else 0
 
     def decrement(self):
@@ -186,6 +203,15 @@ class ItemGridView(tk.Canvas):
         for key in self._slots:
             self._slots[key] = self.create_oval(self.grid_to_xy_centre(key), self.grid_to_xy_centre(key))
 
+        # Canvas items are retained for each cell, & only reconfigured when what they show changes
+        # Maps (row, column) -> (rectangle, text, sub text) canvas item ids
+        self._cell_items = {}
+        # Maps (row, column) -> (text, sub text, sub text anchor, active), as last drawn
+        self._cell_states = {}
+
+        # The (version, active position) last rendered (see render), or None
+        self._rendered = None
+
     def grid_to_xy_box(self, grid_position):
         """Returns the coordinates of the bounding box of the cell at 'grid_position'
 
@@ -245,32 +271,43 @@ class ItemGridView(tk.Canvas):
             stack (Stack): The stack to draw, or None for empty
             active (bool): Whether the cell is active or not
         """
-        box = self.grid_to_xy_box(grid_position)
-
         text = stack.get_item().get_id().replace('_', '\n') if stack else ""
 
-        colour = self._selected_colour if active else self._deselected_colour
-
-        centre = self.grid_to_xy_centre(grid_position)
-        left, top, right, bottom = self.grid_to_xy_box(grid_position)
-
-        self.create_rectangle(box, fill=colour, tag='cell')
+        sub_text = ""
+        anchor = tk.SE
 
         if stack:
             item = stack.get_item()
 
-            self.create_text(centre, text=text, font=self._major_font, tag='cell')
-
             if item.is_stackable():
                 sub_text = f"{len(stack)}"
-                x = right
-                anchor = tk.SE
             else:
                 sub_text = f"{item.get_durability()}/{item.get_max_durability()}"
-                x = left
                 anchor = tk.SW
 
-            self.create_text(x, bottom, text=sub_text, anchor=anchor, font=self._minor_font, tag='cell')
+        state = text, sub_text, anchor, active
+        if self._cell_states.get(grid_position) == state:
+            return
+
+        self._cell_states[grid_position] = state
+        self._rendered = None
+
+        left, top, right, bottom = box = self.grid_to_xy_box(grid_position)
+
+        items = self._cell_items.get(grid_position)
+        if items is None:
+            items = self._cell_items[grid_position] = (
+                self.create_rectangle(box, tag='cell'),
+                self.create_text(self.grid_to_xy_centre(grid_position), font=self._major_font, tag='cell'),
+                self.create_text(right, bottom, font=self._minor_font, tag='cell'),
+            )
+
+        rectangle, text_item, sub_text_item = items
+
+        self.itemconfigure(rectangle, fill=self._selected_colour if active else self._deselected_colour)
+        self.itemconfigure(text_item, text=text)
+        self.itemconfigure(sub_text_item, text=sub_text, anchor=anchor)
+        self.coords(sub_text_item, right if anchor == tk.SE else left, bottom)
 
     def bind_for_id(self, event, callback):
         """Binds to tkinter mouse event and also provides position of
@@ -293,20 +330,33 @@ class ItemGridView(tk.Canvas):
 
         self.bind(event, lambda e: callback(self.xy_to_grid((e.x, e.y)), e))
 
-    def render(self, items, active_position):
+    def render(self, items, active_position, version=None):
         """Re-render the Hot Bar
 
+        Only the cells that have changed since they were last drawn are redrawn.
+
         Parameters:
             items list<Stack>: items to be displayed in Hot Bar
             active_position (int): id of currently active cell
+            version (*): The version of the grid holding 'items' (see Grid.get_version); if given
+                         & unchanged since the last render, nothing is redrawn
         """
-        self.delete(tk.ALL)
+        if version is not None and self._rendered == (version, active_position):
+            return
+
         for position, stack in items:
             self.draw_cell(position, stack, position == active_position)
 
+        self._rendered = None if version is None else (version, active_position)
+
 
 class Grid:
-    """A 2d grid to hold items"""
+    """A 2d grid to hold items
+
+    To keep insertion (see add_items) cheap on large grids, the grid maintains an index from each
+    item id to the positions of the stacks holding that item, and a heap of empty positions.
+    Both are kept up to date by __setitem__, so all changes to the cells must go through it.
+    """
 
     def __init__(self, rows=4, columns=5):
         self._items = [
@@ -315,6 +365,18 @@ class Grid:
             ] for i in range(rows)
         ]
 
+        # Maps item id -> set of (row, column) positions of the stacks holding that item
+        self._positions_by_id = {}
+
+        # Min-heap of (row, column) positions that may be empty, so that the first (row-major)
+        # empty position is filled first. Positions that have since been filled are skipped
+        # lazily when popped. self._free_set holds the positions currently in the heap.
+        self._free = [(i, j) for i in range(rows) for j in range(columns)]
+        self._free_set = set(self._free)
+
+        # Changed whenever a cell is set (see get_version)
+        self._version = next(_grid_versions)
+
     def __repr__(self):
         return json.dumps([[repr(stack) for stack in row] for row in self._items], indent=4)
 
@@ -353,8 +415,33 @@ class Grid:
             stack (Stack): The stack to set, or None
         """
         row, column = position
+
+        self._version = next(_grid_versions)
+
+        previous = self._items[row][column]
+        if isinstance(previous, Stack):
+            positions = self._positions_by_id[previous.get_item().get_id()]
+            positions.discard(position)
+
         self._items[row][column] = stack
 
+        if isinstance(stack, Stack):
+            self._positions_by_id.setdefault(stack.get_item().get_id(), set()).add(position)
+        elif stack is None and position not in self._free_set:
+            heapq.heappush(self._free, position)
+            self._free_set.add(position)
+
+    def get_version(self):
+        """Returns the version of this grid's contents, which changes whenever a cell is set, or a
+        stack in the grid (or its item) changes; views can compare versions to skip redrawing
+        an unchanged grid (see ItemGridView.render)
+
+        Return:
+            tuple<int, int>: The version, which is equal to a previous version of this grid only if
+                             nothing has changed since
+        """
+        return self._version, sum(stack.get_version() for row in self._items for stack in row if stack is not None)
+
     def __len__(self):
         """(int) Returns the total number of elements in this grid"""
         rows, columns = self.get_size()
@@ -425,25 +512,61 @@ class Grid:
         Return:
              Stack: Remaining (sub-)stack that could not be added, or None if all was added"""
 
-        # fill existing stacks
-        for position, this_stack in self.items():
-            if this_stack and this_stack.matches(stack):  # stacks match
+        # fill existing stacks, in row-major order
+        # (stacks can be changed in place, so whether each is full is only known now)
+        for position in sorted(self._positions_by_id.get(stack.get_item().get_id(), ())):
+            this_stack = self[position]
+            if this_stack and this_stack.get_space() > 0:
                 this_stack.absorb(stack)
                 if stack.get_quantity() == 0:
                     break
 
         # fill empty stacks, if necessary
-        if stack:
-            for position, this_stack in self.items():
-                if this_stack is None:
-                    self[position] = this_stack = Stack(stack.get_item(), 0)
-                    this_stack.absorb(stack)
-                if stack.get_quantity() == 0:
-                    break
+        while stack:
+            position = self._pop_free_position()
+            if position is None:
+                break
+
+            self[position] = this_stack = Stack(stack.get_item(), 0)
+            this_stack.absorb(stack)
 
         if stack and stack.get_quantity() > 0:
             return stack
 
+    def has_room_for(self, item: Item):
+        """(bool) Returns True iff at least one of 'item' could be added to this grid"""
+        for position in self._positions_by_id.get(item.get_id(), ()):
+            if self[position].get_space() > 0:
+                return True
+
+        return self._peek_free_position() is not None
+
+    def _peek_free_position(self):
+        """(tuple<int, int>) Returns the first (row-major) empty position, or None if the grid is
+        full"""
+        while self._free:
+            position = self._free[0]
+
+            if self[position] is None:
+                return position
+
+            # Filled since it was freed
+            heapq.heappop(self._free)
+            self._free_set.discard(position)
+
+        return None
+
+    def _pop_free_position(self):
+        """(tuple<int, int>) Removes & returns the first (row-major) empty position, or None if the
+        grid is full"""
+        position = self._peek_free_position()
+
+        if position is not None:
+            heapq.heappop(self._free)
+            self._free_set.discard(position)
+
+        return position
+
 
 class SelectableGrid(Grid):
     """A grid that can have a single cell selected"""
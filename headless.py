@@ -0,0 +1,228 @@
+"""
+Runs Ninedraft without a user interface, for soak tests & batch simulations.
+
+The game is stepped with a simulated clock, so each tick simulates exactly one physics
+timestep (of --timestep seconds) regardless of how long it takes to compute, and the player is driven by a
+script of inputs instead of the keyboard & mouse.
+
+A script is a JSON list of [tick, action, *arguments] inputs, where action is one of:
+    - ["move", dx, dy]: changes the player's velocity (as with the a/d/s keys)
+    - ["jump"]: makes the player jump (as with the space key)
+    - ["target", x, y]: targets the position (x, y) (as with moving the mouse)
+    - ["attack"]: attacks the target (as with a left click)
+    - ["use"]: uses/places at the target (as with a right click)
+    - ["mine", x, y]: targets (x, y), then attacks
+    - ["place", x, y]: targets (x, y), then uses/places
+    - ["select", column]: toggles selection of a hotbar cell (as with the number keys)
+
+Usage:
+    python headless.py --ticks 10000 --seed 1 --script script.json
+    python headless.py --ticks 10000 --profile trace.json  # for chrome://tracing or Perfetto
+"""
+
+__author__ = "Joel Foster"
+__date__ = "17/10/2026"
+__version__ = "1.1.0"
+__copyright__ = "The University of Queensland, 2019"
+
+import argparse
+import json
+import random
+import time
+
+from simulation import GameSession, SimulatedClock, PHYSICS_TIMESTEP
+from profiler import NULL_PROFILER, Profiler
+from events import get_log, configure, parse_levels, InputFailed
+
+log = get_log(__name__)
+
+# A short demonstration: mine the ground beneath the spawn point, wander right, jump, then
+# place some dirt & eat an apple
+DEFAULT_SCRIPT = [
+    [60, "mine", 250, 300],
+    [61, "mine", 250, 300],
+    [62, "mine", 250, 300],
+    [120, "move", 1, 0],
+    [180, "jump"],
+    [240, "place", 330, 230],
+    [300, "select", 1],
+    [301, "place", 400, 200],
+    [302, "select", 0],
+]
+
+
+class HeadlessRunner:
+    """Steps a GameSession with a simulated clock, applying scripted inputs"""
+
+    def __init__(self, script=(), seed=None, timestep=PHYSICS_TIMESTEP, loop=False, profiler=NULL_PROFILER):
+        """Constructor
+
+        Parameters:
+            script (list<list>): The [tick, action, *arguments] inputs to apply
+                                 (see the module documentation)
+            seed (int): Seed for the random number generator, or None for a random seed
+            timestep (float): The time (in seconds) to simulate each tick
+            loop (bool): If True, the script is repeated once its last input has been applied
+            profiler (profiler.Profiler): Records the time spent in each part of every tick
+        """
+        random.seed(seed)
+
+        self._timestep = timestep
+        self._loop = loop
+
+        self._inputs = {}
+        for tick, action, *arguments in script:
+            self._inputs.setdefault(tick, []).append((action, arguments))
+
+        self._period = max(self._inputs) + 1 if self._inputs else 1
+
+        self._clock = SimulatedClock()
+        self._profiler = profiler
+        self._session = GameSession(clock=self._clock, profiler=profiler, timestep=timestep)
+
+        self._ticks = 0
+        # Time simulated by the worlds of previous games (see tick)
+        self._previous_simulated_time = 0.
+        self._deaths = 0
+        self._failed_inputs = 0
+
+    def get_session(self) -> GameSession:
+        """(GameSession) Returns the game session being simulated"""
+        return self._session
+
+    def apply(self, action, *arguments):
+        """Applies a single input to the game session
+
+        Parameters:
+            action (str): The name of the input (see the module documentation)
+            arguments (*): The input's arguments
+
+        Raises:
+            KeyError: if 'action' is not a known input
+        """
+        session = self._session
+
+        if action == "move":
+            session.move(*arguments)
+        elif action == "jump":
+            session.jump()
+        elif action == "target":
+            session.set_target(*arguments)
+        elif action == "attack":
+            session.attack_target()
+        elif action == "use":
+            session.use_target()
+        elif action == "mine":
+            session.set_target(*arguments)
+            session.attack_target()
+        elif action == "place":
+            session.set_target(*arguments)
+            session.use_target()
+        elif action == "select":
+            column, = arguments
+            session.get_hot_bar().toggle_selection((0, column))
+        else:
+            raise KeyError(f"Unknown input {action!r}")
+
+    def tick(self):
+        """Applies this tick's inputs, then advances the game by one timestep"""
+        self._profiler.begin_frame()
+
+        tick = self._ticks % self._period if self._loop else self._ticks
+
+        for action, arguments in self._inputs.get(tick, ()):
+            try:
+                self.apply(action, *arguments)
+            except NotImplementedError as error:
+                # Mirrors the GUI, where a failed input doesn't stop the game
+                log.emit(InputFailed, action, tuple(arguments), self._ticks, error)
+                self._failed_inputs += 1
+
+        # Set from the whole number of ticks, rather than accumulated, to avoid floating point drift
+        self._clock.set((self._ticks + 1) * self._timestep)
+        self._session.step()
+
+        if self._session.is_player_dead():
+            self._deaths += 1
+            self._previous_simulated_time += self._session.get_world().get_simulated_time()
+            self._session.new_game()
+
+        self._ticks += 1
+
+        self._profiler.end_frame()
+
+    def get_simulated_time(self):
+        """(float) Returns the total time (in seconds) simulated by the game's worlds so far"""
+        return self._previous_simulated_time + self._session.get_world().get_simulated_time()
+
+    def run(self, ticks):
+        """Runs the game for 'ticks' ticks
+
+        Return:
+            dict<str, *>: A report of the run, including its speed in ticks per second
+        """
+        start = time.perf_counter()
+
+        for _ in range(ticks):
+            self.tick()
+
+        elapsed = time.perf_counter() - start
+
+        world = self._session.get_world()
+        player = self._session.get_player()
+
+        return {
+            "ticks": ticks,
+            "elapsed_seconds": elapsed,
+            "ticks_per_second": ticks / elapsed if elapsed else float("inf"),
+            "simulated_seconds": self.get_simulated_time(),
+            "deaths": self._deaths,
+            "failed_inputs": self._failed_inputs,
+            "things": sum(1 for _ in world.get_dynamic_things()),
+            "player": {
+                "position": player.get_position(),
+                "health": player.get_health(),
+                "food": player.get_food(),
+            },
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Ninedraft without a user interface")
+    parser.add_argument("--ticks", type=int, default=3600, help="number of ticks to simulate")
+    parser.add_argument("--seed", type=int, default=None, help="random seed, for reproducible runs")
+    parser.add_argument("--script", default=None, help="path to a JSON input script (see headless.py)")
+    parser.add_argument("--loop", action="store_true", help="repeat the script until the run ends")
+    parser.add_argument("--timestep", type=float, default=PHYSICS_TIMESTEP, help="seconds simulated per tick")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--profile", default=None,
+                        help="write a Chrome trace of the last ticks to this path (see profiler.py)")
+    parser.add_argument("--log", default=None,
+                        help="per-module event levels, e.g. INFO,block=DEBUG (see events.py)")
+    args = parser.parse_args()
+
+    configure(None if args.log is None else parse_levels(args.log))
+
+    if args.script:
+        with open(args.script) as file:
+            script = json.load(file)
+    else:
+        script = DEFAULT_SCRIPT
+
+    profiler = Profiler() if args.profile else NULL_PROFILER
+
+    runner = HeadlessRunner(script, seed=args.seed, timestep=args.timestep, loop=args.loop, profiler=profiler)
+    report = runner.run(args.ticks)
+
+    if args.profile:
+        profiler.export_chrome_trace(args.profile)
+
+    if args.json:
+        print(json.dumps(report, indent=4))
+    else:
+        for key, value in report.items():
+            print(f"{key}: {value}")
+
+
+if __name__ == '__main__':
+    main()
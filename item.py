@@ -16,6 +16,9 @@ from core import EffectID
 class Item:
     """A conceptual, non-physical item in the game"""
 
+    # Incremented whenever the item's state (e.g. a tool's durability) changes (see get_version)
+    _version = 0
+
     def __init__(self, id_: str, max_stack: int = 64, attack_range: float = 10):
         """Constructor
 
@@ -32,6 +35,15 @@ class Item:
         """(str) Returns the unique id of this item"""
         return self._id
 
+    def get_version(self) -> int:
+        """(int) Returns a number that increases whenever this item's state changes"""
+        return self._version
+
+    def get_spec(self) -> tuple:
+        """(tuple) Returns the item id tuple that creates an item like this one
+        (see item_creation.create_item)"""
+        return self.get_id(),
+
     def __repr__(self):
         return f"{self.__class__.__name__}({self._id!r})"
 
@@ -7,9 +7,36 @@ from block import Block, ResourceBlock, BREAK_TABLES, LeafBlock, TrickCandleFlam
 from new_blocks import CraftingTableBlock, Furnace
 from mob import Bird, Mob
 from new_mobs import Bee, Sheep
+from chunks import ChunkGenerator, chunk_of
 
 import random
 
+# (weight, block id) pairs for the blocks that make up the ground of the simple world
+SIMPLE_WORLD_BLOCK_WEIGHTS = [
+    (84, 'dirt'),
+    (20, 'stone'),
+    (5, 'diamond'),
+    (15, 'iron'),
+    (6, 'gold')
+]
+
+# Mapping of (column, row) cells to the block id tuple of the block placed there in the simple world
+SIMPLE_WORLD_FEATURES = {
+    # tree trunk
+    (3, 8): ('wood',), (3, 7): ('wood',), (3, 6): ('wood',), (3, 5): ('wood',),
+    # leaves, with a honey block in the middle of the top row
+    (2, 2): ('leaf',), (3, 2): ('honey',), (4, 2): ('leaf',),
+    (2, 3): ('leaf',), (3, 3): ('leaf',), (4, 3): ('leaf',),
+    (2, 4): ('leaf',), (3, 4): ('leaf',), (4, 4): ('leaf',),
+    (4, 5): ('hive',),
+    (14, 8): ('mayhem', 0),
+}
+
+# Maps block id tuples -> (block class, prototype), for blocks that are completely described by
+# their prototype, so that further blocks like them can be created quickly (see Block.from_prototype)
+_block_prototypes = {}
+
+
 def create_block(*block_id):
     """(Block) Creates a block (this function can be thought of as a block factory)
 
@@ -26,6 +53,21 @@ def create_block(*block_id):
         >>> create_block("mayhem", 1)
         TrickCandleFlameBlock(1)
     """
+    cached = _block_prototypes.get(block_id)
+    if cached is not None:
+        block_class, prototype = cached
+        return block_class.from_prototype(prototype)
+
+    block = _construct_block(block_id)
+
+    if block._prototype_only:
+        _block_prototypes[block_id] = type(block), block.get_prototype()
+
+    return block
+
+
+def _construct_block(block_id):
+    """(Block) Creates a block by calling the constructor of its class (see create_block)"""
     if len(block_id) == 1:
         block_id = block_id[0]
         if block_id == "leaf":
@@ -90,64 +132,56 @@ def create_item(*item_id):
     raise KeyError(f"No item defined for {item_id}")
 
 
-def load_simple_world(world):
-    """Loads blocks and mobs into a world
+def simple_world_surface(column):
+    """(int) Returns the row of the highest ground cell in 'column' of the simple world
 
-    Parameters:
-        world (World): The game world to load with blocks
+    The ground is flat, apart from a steep hill (peaking at the top of the world) every 64 columns,
+    the first of which is centred on column 30.
     """
-    block_weights = [
-        (84, 'dirt'),
-        (20, 'stone'),
-        (5, 'diamond'),
-        (15, 'iron'),
-        (6, 'gold')
-    ]
-
-    cells = {}
+    return min(abs((column + 2) % 64 - 32), 9)
 
-    ground = []
 
-    width, height = world.get_grid_size()
-
-    for x in range(width):
-        for y in range(height):
-            if x < 22:
-                if y <= 8:
-                    continue
-            else:
-                if x + y < 30:
-                    continue
+def create_simple_world_generator(seed=None):
+    """(ChunkGenerator) Creates a generator for the blocks of the simple world
 
-            ground.append((x, y))
+    Parameters:
+        seed (int): The seed for the generator, or None to draw one from the random module
+    """
+    if seed is None:
+        seed = random.getrandbits(64)
 
-    weights, blocks = zip(*block_weights)
-    kinds = random.choices(blocks, weights=weights, k=len(ground))
+    return ChunkGenerator(seed, SIMPLE_WORLD_BLOCK_WEIGHTS, simple_world_surface, SIMPLE_WORLD_FEATURES)
 
-    for cell, block_id in zip(ground, kinds):
-        cells[cell] = create_block(block_id)
 
-    trunks = [(3, 8), (3, 7), (3, 6), (3, 5)]
+def load_simple_world(world):
+    """Loads blocks and mobs into a world
 
-    for trunk in trunks:
-        cells[trunk] = create_block('wood')
+    All blocks are generated up front; to generate them as the player explores, use a
+    chunks.ChunkManager with create_simple_world_generator, then load_simple_mobs
 
-    leaves = [(4, 3), (3, 3), (2, 3), (4, 2), (3, 2), (2, 2), (4, 4), (3, 4), (2, 4)]
+    Parameters:
+        world (World): The game world to load with blocks
+    """
+    generator = create_simple_world_generator()
 
-    for leaf in leaves:
-        cells[leaf] = create_block('leaf')
+    width, height = world.get_grid_size()
+    last_column, last_row = chunk_of(width - 1, height - 1)
 
-    cells[(3, 2)] = create_block('honey')
-    cells[(4, 5)] = create_block('hive')
+    for chunk_column in range(last_column + 1):
+        for chunk_row in range(last_row + 1):
+            for (i, j), block_id in generator.generate((chunk_column, chunk_row)).items():
+                if world.is_in_grid(i, j):
+                    world.add_block_to_grid(create_block(*block_id), i, j)
 
-    for cell, block in cells.items():
-        # cell -> box
-        i, j = cell
+    load_simple_mobs(world)
 
-        world.add_block_to_grid(block, i, j)
 
-    world.add_block_to_grid(create_block("mayhem", 0), 14, 8)
+def load_simple_mobs(world):
+    """Loads mobs into a world
 
+    Parameters:
+        world (World): The game world to load with mobs
+    """
     world.add_mob(Bird("friendly_bird", (12, 12)), 400, 100)
 
     world.add_mob(Sheep("Sheep", (20, 20)), 200, 100)
\ No newline at end of file
@@ -0,0 +1,364 @@
+"""
+An append-only journal of the changes made to a game, for autosaving & crash recovery.
+
+Every change to the world or the player's items (e.g. a block being mined or placed, an item
+being picked up, or items being moved around the inventory) is recorded as a small journal
+entry. Entries are queued in memory & written to disk in batches by a background thread, so
+recording an entry never blocks on I/O.
+
+The journal is periodically compacted: a full snapshot of the game (see save.py) is written,
+& the journal is emptied. When a saved game is loaded, its save file is copied as the snapshot
+instead (see rebase), since writing a snapshot would read every chunk of the file. After a crash, the game is recovered by loading the last snapshot &
+replaying the entries in the journal that were recorded after it (see read_journal).
+
+Journal file layout: one JSON array per line, of [sequence number, kind, data]. Sequence
+numbers increase by 1 per entry; each snapshot records the sequence number of the last entry
+it includes (as "journal_sequence"), so entries that were written before the snapshot but not
+yet removed from the journal (e.g. due to a crash) are skipped when replaying.
+"""
+
+__author__ = "Joel Foster"
+__date__ = "17/10/2026"
+__version__ = "1.1.0"
+__copyright__ = "The University of Queensland, 2019"
+
+import json
+import os
+import shutil
+import threading
+import time
+from collections import deque
+
+from save import SaveFile, write_save
+
+# The longest time (in seconds) that a recorded entry waits before it is written to disk
+JOURNAL_FLUSH_INTERVAL = 1.
+
+# A snapshot is due once this many seconds have passed since the last one...
+SNAPSHOT_INTERVAL = 60.
+
+# ... or once this many entries have been recorded since the last one
+SNAPSHOT_ENTRIES = 1000
+
+
+def read_journal(path, after=0):
+    """Reads the entries from a journal file, skipping those included in a snapshot
+
+    A partially written final line (e.g. due to a crash) is ignored.
+
+    Parameters:
+        path (str): The path of the journal file
+        after (int): The sequence number of the last entry included in the snapshot being
+                     replayed over (see Journal.snapshot)
+
+    Return:
+        list<tuple<str, dict>>: The (kind, data) pairs of the entries, in the order they were recorded
+    """
+    entries = []
+
+    try:
+        with open(path, encoding="utf-8") as file:
+            lines = file.readlines()
+    except FileNotFoundError:
+        return entries
+
+    for i, line in enumerate(lines):
+        try:
+            sequence, kind, data = json.loads(line)
+        except ValueError:
+            if i == len(lines) - 1:
+                break
+            raise
+
+        if sequence > after:
+            entries.append((kind, data))
+
+    return entries
+
+
+class Journal:
+    """Records changes to a game, & writes them (& periodic snapshots) on a background thread"""
+
+    def __init__(self, path, snapshot_path, flush_interval=JOURNAL_FLUSH_INTERVAL,
+                 snapshot_interval=SNAPSHOT_INTERVAL, snapshot_entries=SNAPSHOT_ENTRIES, clock=time.monotonic):
+        """Constructor
+
+        The journal file isn't changed until the first snapshot is written, so a snapshot should
+        be taken (see snapshot) before any entries are recorded.
+
+        Parameters:
+            path (str): The path of the journal file
+            snapshot_path (str): The path of the snapshot (save) file
+            flush_interval (float): The longest time (in seconds) an entry waits to be written
+            snapshot_interval (float): The time (in seconds) after which a snapshot is due
+            snapshot_entries (int): The number of entries after which a snapshot is due
+            clock (callable): Returns a monotonic time in seconds
+        """
+        self._path = path
+        self._snapshot_path = snapshot_path
+        self._flush_interval = flush_interval
+        self._snapshot_interval = snapshot_interval
+        self._snapshot_entries = snapshot_entries
+        self._clock = clock
+
+        self._sequence = 0
+
+        self._last_snapshot_time = clock()
+        self._last_snapshot_sequence = 0
+
+        # Work for the background thread, in order; each is one of:
+        #   ("entry", (sequence, kind, data))
+        #   ("snapshot", (sequence, chunks, document))
+        #   ("rebase", (sequence, save path))
+        #   ("flush", threading.Event)
+        # (deque's append & popleft are thread-safe)
+        self._pending = deque()
+
+        self._wake = threading.Event()
+        self._closing = False
+        self._error = None
+
+        # Set once writing has failed in a way that retrying won't fix (see _run)
+        self._stopped = False
+
+        self._thread = threading.Thread(target=self._run, name="journal", daemon=True)
+        self._thread.start()
+
+    def get_paths(self):
+        """(tuple<str, str>) Returns the paths of the journal & snapshot files"""
+        return self._path, self._snapshot_path
+
+    def get_error(self):
+        """(Exception) Returns the error raised by the last attempt to write the journal or a
+        snapshot, or None if it succeeded"""
+        return self._error
+
+    def _check_writer(self):
+        """Raises the error that stopped the background thread, if it has stopped due to an error"""
+        if self._stopped:
+            raise self._error
+
+    def record(self, kind, data):
+        """Records a change to the game
+
+        Parameters:
+            kind (str): The kind of change (e.g. 'block')
+            data (dict): The details of the change, which must be serialisable as JSON & must not
+                         be modified afterwards
+
+        Raises:
+            Exception: the error that stopped the background thread, if it has stopped
+        """
+        self._check_writer()
+
+        self._sequence += 1
+        self._pending.append(("entry", (self._sequence, kind, data)))
+
+    def is_snapshot_due(self):
+        """(bool) Returns True iff enough time has passed, or enough entries have been recorded,
+        since the last snapshot that another should be taken"""
+        return (self._sequence - self._last_snapshot_sequence >= self._snapshot_entries
+                or self._clock() - self._last_snapshot_time >= self._snapshot_interval)
+
+    def snapshot(self, chunks, document):
+        """Queues a full snapshot of the game to be written, after which the journal is emptied
+
+        Parameters:
+            chunks, document: The state of the game, as for save.write_save; these must not be
+                              modified afterwards (see GameSession.dump_game)
+
+        Raises:
+            Exception: the error that stopped the background thread, if it has stopped
+        """
+        self._check_writer()
+
+        document = dict(document, journal_sequence=self._sequence)
+        self._pending.append(("snapshot", (self._sequence, chunks, document)))
+        self._wake.set()
+
+        self._last_snapshot_time = self._clock()
+        self._last_snapshot_sequence = self._sequence
+
+    def rebase(self, save_path):
+        """Queues a copy of the save file at 'save_path' to be written as the snapshot, after which
+        the journal is emptied
+
+        Equivalent to snapshot, for a game that has just been loaded from 'save_path' & not changed
+        since, but without reading the whole game into memory.
+
+        Raises:
+            OSError: if the save file can't be opened
+            SaveError: if it is not a save file
+            Exception: the error that stopped the background thread, if it has stopped
+        """
+        self._check_writer()
+
+        # The copy keeps the journal_sequence it was saved with (if any), so later entries must
+        # be numbered after it to be replayed
+        with SaveFile(save_path) as save_file:
+            self._sequence = max(self._sequence, save_file.get_document().get("journal_sequence", 0))
+
+        self._pending.append(("rebase", (self._sequence, save_path)))
+        self._wake.set()
+
+        self._last_snapshot_time = self._clock()
+        self._last_snapshot_sequence = self._sequence
+
+    def flush(self, timeout=None):
+        """Waits until everything queued so far has been written
+
+        If writing fails with an OSError (e.g. the disk is full), nothing is lost: whatever wasn't
+        written is written by a later attempt, so flush can be retried.
+
+        Return:
+            bool: True iff everything was written before 'timeout' seconds passed
+
+        Raises:
+            Exception: the error that stopped the background thread, if it has stopped
+        """
+        self._check_writer()
+
+        done = threading.Event()
+        self._pending.append(("flush", done))
+        self._wake.set()
+
+        # The background thread may have stopped since the check above, without seeing the flush
+        # (_stopped is set before queued flushes are released)
+        self._check_writer()
+
+        if not done.wait(timeout):
+            return False
+        self._check_writer()
+
+        return self._error is None
+
+    def close(self, discard=False):
+        """Writes everything queued so far & stops the background thread
+
+        Parameters:
+            discard (bool): If True, the journal & snapshot files are deleted afterwards
+                            (e.g. when the game is closed normally, so there is nothing to recover)
+        """
+        self._closing = True
+        self._wake.set()
+        self._thread.join()
+
+        if discard:
+            for path in (self._path, self._snapshot_path):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def _run(self):
+        """Writes queued entries & snapshots until closed (runs on the background thread)"""
+        while True:
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+
+            # Check before writing, so nothing queued before close is missed
+            closing = self._closing
+
+            flushed = []
+            try:
+                self._write_pending(flushed)
+                self._error = None
+            except OSError as error:
+                # e.g. the disk is full; what wasn't written is retried next time
+                self._error = error
+            except Exception as error:
+                # A bug, which retrying won't fix; record & flush raise it from now on
+                self._error = error
+                self._stopped = True
+            finally:
+                if self._error is not None:
+                    # The flushes that weren't reached can't finish this time, so are released too
+                    flushed.extend(value for task, value in list(self._pending) if task == "flush")
+
+                for done in flushed:
+                    done.set()
+
+            if closing or self._stopped:
+                return
+
+    def _write_pending(self, flushed):
+        """Writes everything that is queued, in order
+
+        If writing fails, whatever wasn't written is put back at the front of the queue, to be
+        retried by the next call.
+
+        Parameters:
+            flushed (list<threading.Event>): The events of the flushes that are taken from the
+                                             queue are appended to this, to be set by the caller
+                                             (even if writing fails)
+        """
+        # Tasks taken from the queue that haven't been written yet
+        unwritten = []
+
+        try:
+            while self._pending:
+                task, value = self._pending.popleft()
+
+                if task == "entry":
+                    unwritten.append((task, value))
+                    continue
+
+                if task == "flush":
+                    flushed.append(value)
+
+                # Entries queued before a snapshot are included in it, but are written anyway,
+                # in case writing the snapshot fails
+                self._append_entries(unwritten)
+                unwritten = []
+
+                if task == "flush":
+                    continue
+
+                unwritten.append((task, value))
+
+                if task == "snapshot":
+                    _, chunks, document = value
+                    write_save(self._snapshot_path, chunks, document)
+
+                elif task == "rebase":
+                    # Copied & moved into place, like write_save, so the snapshot is always complete
+                    _, save_path = value
+                    temporary_path = self._snapshot_path + ".tmp"
+                    shutil.copyfile(save_path, temporary_path)
+                    os.replace(temporary_path, self._snapshot_path)
+
+                # Empty the journal; the snapshot has been moved into place, so is complete
+                with open(self._path, "w", encoding="utf-8"):
+                    pass
+                unwritten = []
+
+            self._append_entries(unwritten)
+        except BaseException:
+            # (extendleft reverses the order of what it adds)
+            self._pending.extendleft(reversed(unwritten))
+            raise
+
+    def _append_entries(self, tasks):
+        """Appends the entries among 'tasks' (queued ("entry", value) pairs) to the journal file"""
+        self._append([json.dumps(value, separators=(",", ":")) + "\n" for task, value in tasks if task == "entry"])
+
+    def _append(self, lines):
+        """Appends 'lines' to the journal file, & forces them to disk"""
+        if not lines:
+            return
+
+        data = memoryview("".join(lines).encode("utf-8"))
+
+        with open(self._path, "ab", buffering=0) as file:
+            size = file.tell()
+            try:
+                while data:
+                    data = data[file.write(data):]
+                os.fsync(file.fileno())
+            except OSError:
+                # Remove any partially written line, so the lines can be appended again
+                try:
+                    file.truncate(size)
+                except OSError:
+                    pass
+                raise
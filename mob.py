@@ -10,6 +10,7 @@ __copyright__ = "The University of Queensland, 2019"
 
 import random
 import cmath
+import math
 
 from physical_thing import DynamicThing
 
@@ -26,6 +27,9 @@ class Mob(DynamicThing):
 
     Should not be instantiated directly"""
 
+    # The number of steps between each time this mob thinks (see think)
+    _think_interval = 20
+
     def __init__(self, mob_id, size, tempo=MOB_DEFAULT_TEMPO, max_health=20):
         """Constructor
 
@@ -56,6 +60,20 @@ class Mob(DynamicThing):
         """(str) Returns the physical (x, y) size of this mob"""
         return self._size
 
+    def get_think_interval(self):
+        """(int) Returns the number of steps between each time this mob thinks"""
+        return self._think_interval
+
+    def think(self, game_data):
+        """Decides what this mob does next (e.g. where to move)
+
+        Called roughly every get_think_interval() steps, by the world's AI scheduler (see ai_scheduler.py),
+        rather than on every step, so that the decisions of many mobs can be spread across steps
+
+        Parameters:
+            game_data (app.GameData): Arbitrary data supplied by the app class
+        """
+
     def step(self, time_delta, game_data):
         """Advance this mob by one time step
 
@@ -64,33 +82,91 @@ class Mob(DynamicThing):
         # and works reasonably well, assuming time steps occur at roughly constant time deltas
         self._steps += 1
 
+    @classmethod
+    def think_batch(cls, mobs, game_data):
+        """Lets many mobs of this class think at once
+
+        Equivalent to calling think on each mob, but subclasses can override this to decide
+        for many mobs more efficiently
+
+        Parameters:
+            mobs (list<Mob>): The mobs, all instances of this class
+            game_data (app.GameData): Arbitrary data supplied by the app class
+        """
+        for mob in mobs:
+            mob.think(game_data)
+
     def __repr__(self):
         return f"{self.__class__.__name__}({self._id!r})"
 
 
-class Bird(Mob):
-    """A friendly bird, nonchalant with a dash of cheerfulness"""
+class WanderingMob(Mob):
+    """A mob that wanders about in random directions
 
-    def step(self, time_delta, game_data):
-        """Advance this bird by one time step
+    Should not be instantiated directly"""
 
-        See PhysicalThing.step for parameters & return"""
-        # Every 20 steps; could track time_delta instead to be more precise
-        if self._steps % 20 == 0:
-            # a random point on a movement circle (radius=tempo), scaled by the percentage
-            # of health remaining
-            health_percentage = self._health / self._max_health
-            z = cmath.rect(self._tempo * health_percentage, random.uniform(0, 2 * cmath.pi))
+    # Stretch applied to the x component of each random movement
+    _x_scale = 1
 
-            # stretch that random point onto an ellipse that is wider on the x-axis
-            dx, dy = z.real * BIRD_X_SCALE, z.imag
+    # Upwards push added to each random movement, to counteract gravity
+    _gravity_factor = 0
 
-            x, y = self.get_velocity()
-            velocity = x + dx, y + dy - BIRD_GRAVITY_FACTOR
+    def think(self, game_data):
+        """Wanders in a random direction
 
-            self.set_velocity(velocity)
+        See Mob.think for parameters"""
+        self.wander()
+
+    @classmethod
+    def think_batch(cls, mobs, game_data):
+        """Wanders all 'mobs' in random directions at once
+
+        See Mob.think_batch for parameters"""
+        cls.wander_batch(mobs)
+
+    def wander(self):
+        """Adds a random movement to this mob's velocity"""
+        # a random point on a movement circle (radius=tempo), scaled by the percentage
+        # of health remaining
+        health_percentage = self._health / self._max_health
+        z = cmath.rect(self._tempo * health_percentage, random.uniform(0, 2 * cmath.pi))
+
+        # stretch that random point onto an ellipse that is wider on the x-axis
+        dx, dy = z.real * self._x_scale, z.imag
+
+        x, y = self.get_velocity()
+        velocity = x + dx, y + dy - self._gravity_factor
+
+        self.set_velocity(velocity)
+
+    @classmethod
+    def wander_batch(cls, mobs):
+        """Adds a random movement to the velocity of each of 'mobs', exactly as wander would
+
+        The class's attributes & functions used are looked up once for the whole batch, rather
+        than once per mob.
+
+        Parameters:
+            mobs (list<WanderingMob>): The mobs, all instances of this class
+        """
+        x_scale, gravity_factor = cls._x_scale, cls._gravity_factor
+        uniform, cos, sin, tau = random.uniform, math.cos, math.sin, 2 * cmath.pi
+
+        for mob in mobs:
+            # (see wander)
+            radius = mob._tempo * (mob._health / mob._max_health)
+            angle = uniform(0, tau)
+
+            body = mob.get_shape().body
+            x, y = body.velocity
+            body.velocity = x + radius * cos(angle) * x_scale, y + radius * sin(angle) - gravity_factor
+
+
+class Bird(WanderingMob):
+    """A friendly bird, nonchalant with a dash of cheerfulness"""
 
-        super().step(time_delta, game_data)
+    _x_scale = BIRD_X_SCALE
+    _gravity_factor = BIRD_GRAVITY_FACTOR
 
     def use(self):
         pass
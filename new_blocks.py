@@ -9,9 +9,10 @@ from block import Block, ResourceBlock, BREAK_TABLES
 
 class HiveBlock(Block):
     """ Hive Block """
+    __slots__ = ()
+
     def __init__(self, hitpoints=20):
-        super().__init__()
-        self._hitpoints = self._max_hitpoints = hitpoints
+        super().__init__(hitpoints)
 
     def get_drops(self, luck, correct_item_used):
         """
@@ -37,11 +38,10 @@ class HiveBlock(Block):
 
 class CraftingTableBlock(ResourceBlock):
     """ Crafting Table Block"""
+    __slots__ = ()
+
     def __init__(self, block_id, break_table=BREAK_TABLES, hitpoints=20):
-        super().__init__(block_id, break_table)
-        self._hitpoints = self._max_hitpoints = hitpoints
-        self._break_table = break_table[block_id]
-        self._block_id = block_id
+        super().__init__(block_id, break_table[block_id], hitpoints)
 
     def get_drops(self, luck, correct_item_used):
         """
@@ -63,18 +63,17 @@ class CraftingTableBlock(ResourceBlock):
         Pre-conditions:
             0 <= luck < 1
         """
-        return [('item', (self._block_id,))]
+        return [('item', (self.get_id(),))]
 
     def use(self):
         return ['crafting', 'crafting_table']
 
 class Furnace(ResourceBlock):
     """ Furnace Block """
+    __slots__ = ()
+
     def __init__(self, block_id, break_table=BREAK_TABLES, hitpoints=20):
-        super().__init__(block_id, break_table)
-        self._hitpoints = self._max_hitpoints = hitpoints
-        self._break_table = break_table[block_id]
-        self._block_id = block_id
+        super().__init__(block_id, break_table[block_id], hitpoints)
 
     def get_drops(self, luck, correct_item_used):
         """
@@ -96,7 +95,7 @@ class Furnace(ResourceBlock):
         Pre-conditions:
             0 <= luck < 1
         """
-        return [('item', (self._block_id,))]
+        return [('item', (self.get_id(),))]
 
     def use(self):
         """ Return(tuple(str, str)): Use effect."""
@@ -41,6 +41,7 @@ class ToolItem(Item):
     def __init__(self, item_id):
         self._id = f'{item_id[1]}_{item_id[0]}'
         self._tool_type = item_id[0]
+        self._material = item_id[1]
         self._max_durability = TOOL_DURABILITIES[item_id[1]]
         self._durability = TOOL_DURABILITIES[item_id[1]]
         self._max_stack_size = 1
@@ -50,10 +51,19 @@ class ToolItem(Item):
         """(str) Returns tool type """
         return self._tool_type
 
+    def get_spec(self):
+        """(tuple) Returns the (tool type, material) item id tuple that creates a tool like this one"""
+        return self._tool_type, self._material
+
     def get_durability(self):
         """(float) Returns tool durability """
         return self._durability
 
+    def set_durability(self, durability):
+        """Sets the tool's remaining durability (e.g. when loading a saved game)"""
+        self._durability = durability
+        self._version += 1
+
     def get_max_durability(self):
         """(float) Returns max tool durability """
         return self._max_durability
@@ -69,3 +79,4 @@ class ToolItem(Item):
         """(float) Returns outcome of tool attack """
         if not successful:
             self._durability -= 1
+            self._version += 1
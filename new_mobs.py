@@ -5,12 +5,16 @@ __date__ = "22/05/2019"
 __version__ = "1.1.0"
 __copyright__ = "The University of Queensland, 2019"
 
-from mob import Mob, MOB_DEFAULT_TEMPO
-from constants import BEE_X_SCALE, BEE_GRAVITY_FACTOR, SHEEP_X_SCALE, SHEEP_GRAVITY_FACTOR
+from mob import Mob, WanderingMob, MOB_DEFAULT_TEMPO
+from constants import BEE_X_SCALE, BEE_GRAVITY_FACTOR, BEE_HONEY_RANGE, SHEEP_X_SCALE, SHEEP_GRAVITY_FACTOR
 import random, cmath, math
 
-class Bee(Mob):
+class Bee(WanderingMob):
     """ Bee Mob """
+    _think_interval = 2
+    _x_scale = BEE_X_SCALE
+    _gravity_factor = BEE_GRAVITY_FACTOR
+
     def __init__(self, mob_id, size, tempo=MOB_DEFAULT_TEMPO, max_health=1):
         super().__init__(mob_id, size)
         self._id = mob_id
@@ -19,60 +23,51 @@ class Bee(Mob):
         self._steps = 0
         self._health = self._max_health = max_health
 
-    def step(self, time_delta, game_data, world, player):
-        """Advance this bee by one time step."""
-
-        if self._steps % 2 == 0:
-
-            distances = []
-
-            velocity_x, velocity_y = self.get_velocity()
-            x, y = self.get_position()
-
-            all_things = world.get_all_things()
-            honey_blocks = []
-
-            # Find all honey blocks
-            for thing in all_things:
-                if thing.get_id() == 'honey':
-                    block_x, block_y = thing.get_position()
-                    distance_to_bee = math.sqrt( (x - block_x)**2 + (y - block_y)**2)
-                    honey_blocks.append((block_x, block_y))
-                    distances.append(distance_to_bee)
-
-            # Find the closest honey distance
-            if len(distances) > 0:
-                minimum_distance = min(distances)
-            else:
-                minimum_distance = 251
-
-            # If honey block is in range set bee target to the honey block
-            if minimum_distance < 250:
-                min_distance_index = distances.index(minimum_distance)
-                closest_x, closest_y = honey_blocks[min_distance_index]
-                dx, dy = closest_x - x, closest_y - y
-                velocity = velocity_x + dx, velocity_y + dy
-
-            # Elif if player exists, set bee target to player
-            elif player:
-                player_x, player_y = player.get_position()
-                random_factor = random.randrange(1, 2)
-                dx, dy = random_factor * (player_x - x), random_factor * (player_y - y)
-                velocity = velocity_x + dx, velocity_y + dy
-                distance_to_player = math.sqrt((-player_x + x) ** 2 + (y - player_y) ** 2)
-                if distance_to_player < 20:
-                    player.change_health(change=-1)
-
-            # Else, randomise bee movement.
-            else:
-                health_percentage = self._health / self._max_health
-                z = cmath.rect(self._tempo * health_percentage, random.uniform(0, 2 * cmath.pi))
-                dx, dy = z.real * BEE_X_SCALE, z.imag
-                velocity = x + dx, y + dy - BEE_GRAVITY_FACTOR
-
-            self.set_velocity(velocity)
-
-        super().step(time_delta, game_data)
+    def think(self, game_data):
+        """Heads for the nearest honey, or else the player, or else wanders."""
+        if not self._seek(game_data):
+            self.wander()
+
+    @classmethod
+    def think_batch(cls, bees, game_data):
+        """Heads each bee for the nearest honey or the player, then wanders the rest at once."""
+        idle = [bee for bee in bees if not bee._seek(game_data)]
+        cls.wander_batch(idle)
+
+    def _seek(self, game_data):
+        """Heads for the nearest honey, or else the player.
+
+        Return:
+            bool: True iff there was honey in range or a player to head for"""
+        world, player = game_data.world, game_data.player
+
+        velocity_x, velocity_y = self.get_velocity()
+        x, y = self.get_position()
+
+        # Find the closest honey block in range
+        honey = world.nearest_block('honey', x, y, BEE_HONEY_RANGE)
+
+        # If honey block is in range set bee target to the honey block
+        if honey is not None:
+            closest_x, closest_y = honey.get_position()
+            dx, dy = closest_x - x, closest_y - y
+            velocity = velocity_x + dx, velocity_y + dy
+
+        # Elif if player exists, set bee target to player
+        elif player:
+            player_x, player_y = player.get_position()
+            random_factor = random.randrange(1, 2)
+            dx, dy = random_factor * (player_x - x), random_factor * (player_y - y)
+            velocity = velocity_x + dx, velocity_y + dy
+            distance_to_player = math.sqrt((-player_x + x) ** 2 + (y - player_y) ** 2)
+            if distance_to_player < 20:
+                player.change_health(change=-1)
+
+        else:
+            return False
+
+        self.set_velocity(velocity)
+        return True
 
     def get_drops(self, luck):
         """
@@ -102,8 +97,11 @@ class Bee(Mob):
         """
         return None
 
-class Sheep(Mob):
+class Sheep(WanderingMob):
     """ Sheep Mob """
+    _x_scale = SHEEP_X_SCALE
+    _gravity_factor = SHEEP_GRAVITY_FACTOR
+
     def __init__(self, mob_id, size, tempo=MOB_DEFAULT_TEMPO, max_health=20):
         super().__init__(mob_id, size)
         self._id = mob_id
@@ -112,25 +110,6 @@ class Sheep(Mob):
         self._tempo = tempo
         self._health = self._max_health = max_health
 
-    def step(self, time_delta, game_data):
-        """Advance this sheep by one time step."""
-        # Every 20 steps; could track time_delta instead to be more precise
-        if self._steps % 20 == 0:
-            # a random point on a movement circle (radius=tempo), scaled by the percentage
-            # of health remaining
-            health_percentage = self._health / self._max_health
-            z = cmath.rect(self._tempo * health_percentage, random.uniform(0, 2 * cmath.pi))
-
-            # stretch that random point onto an ellipse that is wider on the x-axis
-            dx, dy = z.real * SHEEP_X_SCALE, z.imag
-
-            x, y = self.get_velocity()
-            velocity = x + dx, y + dy - SHEEP_GRAVITY_FACTOR
-
-            self.set_velocity(velocity)
-
-        super().step(time_delta, game_data)
-
     def get_drops(self, luck):
         """
         Returns the things this block drops
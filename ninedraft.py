@@ -7,6 +7,7 @@ __date__ = "31/05/2019"
 __version__ = "1.2.0"
 __copyright__ = "The University of Queensland, 2019"
 
+import os
 import tkinter as tk
 import random
 from collections import namedtuple
@@ -14,7 +15,7 @@ from collections import namedtuple
 import pymunk
 from constants import *
 
-from tkinter import messagebox
+from tkinter import messagebox, filedialog
 from block import Block, ResourceBlock, BREAK_TABLES, LeafBlock, TrickCandleFlameBlock
 from grid import Stack, Grid, SelectableGrid, ItemGridView
 from item import Item, SimpleItem, HandItem, BlockItem, MATERIAL_TOOL_TYPES, TOOL_DURABILITIES
@@ -23,42 +24,94 @@ from dropped_item import DroppedItem
 from crafting import GridCrafter, CraftingWindow
 from world import World
 from core import positions_in_range
-from game import GameView, WorldViewRouter
+from game import GameView, WorldViewRouter, Camera
 from mob import Bird, Mob
 from new_blocks import HiveBlock
 from new_items import FoodItem, ToolItem
 from status_view import StatusView
 from new_mobs import Bee, Sheep
 from item_creation import create_block, create_item, load_simple_world
+from simulation import GameSession, GameData, BLOCK_SIZE, GRID_WIDTH, GRID_HEIGHT
+from save import SaveError
+from journal import Journal
+from profiler import Profiler, format_summary
+from events import get_log, Clicked, CraftingWindowOpened, HotbarItemActivated, AutosaveUnavailable
+from frame_scheduler import FrameScheduler, TICK_RATE, RENDER_RATE
 
-BLOCK_SIZE = 2 ** 5
-GRID_WIDTH = 2 ** 5
-GRID_HEIGHT = 2 ** 4
+# The number of grid columns visible on screen at once
+VIEWPORT_COLUMNS = 2 ** 5
+
+# File types offered when saving & loading games
+SAVE_FILE_TYPES = [("Ninedraft saves", "*.ndsave"), ("All files", "*")]
+
+# The game is autosaved here (see journal.py), & the files are deleted when the game closes normally
+AUTOSAVE_DIRECTORY = os.path.join(os.path.expanduser("~"), ".ninedraft")
+AUTOSAVE_PATH = os.path.join(AUTOSAVE_DIRECTORY, "autosave.ndsave")
+JOURNAL_PATH = os.path.join(AUTOSAVE_DIRECTORY, "autosave.journal")
+
+# The profile overlay (see Ninedraft._toggle_profile) summarises this many of the latest frames,
+# & is refreshed once every PROFILE_REFRESH_FRAMES frames
+PROFILE_SUMMARY_FRAMES = 120
+PROFILE_REFRESH_FRAMES = 15
+
+# File types offered when exporting profiles
+PROFILE_FILE_TYPES = [("JSON", "*.json"), ("All files", "*")]
+
+log = get_log(__name__)
 
-GameData = namedtuple('GameData', ['world', 'player'])
 
 class Ninedraft:
     """High-level app class for Ninedraft, a 2d sandbox game"""
 
-    def __init__(self, master):
+    def __init__(self, master, tick_rate=TICK_RATE, render_rate=RENDER_RATE):
         """Constructor
 
         Parameters:
             master (tk.Tk): tkinter root widget
+            tick_rate (float): The number of times the game is stepped per second
+            render_rate (float): The number of times the game is drawn per second (at most once per step)
         """
 
         self._master = master
         self._mouse_focus = True
         self._status_view = None
 
+        # The latest (x, y) position of the cursor on screen, or None if it hasn't moved over the
+        # game yet; only the latest motion event matters, so the target is resolved once per step
+        self._cursor = None
+
+        # Times each part of every frame; the summary is shown on screen when toggled with F3
+        self._profiler = Profiler()
+        self._profile_text = None
+        self._show_profile = False
+
+        # Decides when to step, & when to redraw (see frame_scheduler.py)
+        self._scheduler = FrameScheduler(tick_rate, render_rate)
+
         # Launch game
-        self.new_game()
+        self._session = GameSession(on_crafting=self._trigger_crafting, profiler=self._profiler)
+
+        # Recover the game if it wasn't closed properly last time, then autosave as it is played
+        recovered = self._recover()
+        try:
+            os.makedirs(AUTOSAVE_DIRECTORY, exist_ok=True)
+        except OSError as error:
+            log.emit(AutosaveUnavailable, error)
+        self._journal = Journal(JOURNAL_PATH, AUTOSAVE_PATH)
+        self._session.set_journal(self._journal)
+
+        if recovered:
+            self._use_session_game()
+        else:
+            self.new_game()
 
         self._crafting_window = None
         self._master.bind("e",
                           lambda e: self.run_effect(('crafting', "basic")))
 
-        self._view = GameView(master, self._world.get_pixel_size(), WorldViewRouter(BLOCK_COLOURS, ITEM_COLOURS))
+        camera = Camera((VIEWPORT_COLUMNS * BLOCK_SIZE, GRID_HEIGHT * BLOCK_SIZE), self._world.get_pixel_size())
+        self._view = GameView(master, self._world.get_pixel_size(), WorldViewRouter(BLOCK_COLOURS, ITEM_COLOURS),
+                              camera=camera)
         self._view.pack()
 
         # Mouse Movement
@@ -95,239 +148,180 @@ class Ninedraft:
         self._master.bind("9", lambda e: self._hot_bar.toggle_selection((0, 8)))
         self._master.bind("0", lambda e: self._hot_bar.toggle_selection((0, 9)))
 
+        # Profiling
+        self._master.bind("<F3>", lambda e: self._toggle_profile())
+
         # MenuBar
         menubar = tk.Menu(master)
         self._master.config(menu=menubar)
         filemenu = tk.Menu(menubar)
         menubar.add_cascade(label="File", menu=filemenu)
         filemenu.add_command(label='New Game', command=self.new_game)
+        filemenu.add_command(label='Save Game', command=self.save_game)
+        filemenu.add_command(label='Load Game', command=self.load_game)
         filemenu.add_command(label='Exit', command=self.close)
 
+        debugmenu = tk.Menu(menubar)
+        menubar.add_cascade(label="Debug", menu=debugmenu)
+        debugmenu.add_command(label='Toggle Profile', accelerator='F3', command=self._toggle_profile)
+        debugmenu.add_command(label='Export Profile...', command=lambda: self.export_profile(False))
+        debugmenu.add_command(label='Export Profile as Chrome Trace...', command=lambda: self.export_profile(True))
+
         # Event handler for closing application by cross
         master.protocol("WM_DELETE_WINDOW", self.close)
 
-        self._target_in_range = False
-        self._target_position = 0, 0
-
         self.redraw()
 
         self.step()
 
     def redraw(self):
         """ Redraw all objects. """
-        self._view.delete(tk.ALL)
+        # The target & cursor are cheap to recreate, but physical things are retained by the view
+        self._view.hide_target()
 
-        # physical things
-        self._view.draw_physical(self._world.get_all_things())
+        # scroll to keep the player on screen
+        self._view.follow(*self._player.get_position())
 
-        # target
-        target_x, target_y = self._target_position
-        target = self._world.get_block(target_x, target_y)
-        cursor_position = self._world.grid_to_xy_centre(*self._world.xy_to_grid(target_x, target_y))
+        # terrain (only visible cells that have changed are repainted)
+        self._view.draw_terrain(self._world)
 
-        # Show or hide target
-        if not self._mouse_focus:
-            self._view.hide_target()
-        elif self._target_in_range and self._mouse_focus:
-            self._view.show_target(self._player.get_position(), self._target_position)
+        # physical things (only those on screen)
+        self._view.draw_physical(self._world.get_things_in_rect(*self._view.get_viewport(),
+                                                                ("player", "mob", "item")))
+
+        # target
+        if self._session.is_target_in_range() and self._mouse_focus:
+            self._view.show_target(self._player.get_position(), self._session.get_target_position())
 
         # Update Status View
-        self._status_view.update_health()
-        self._status_view.update_food()
+        with self._profiler.span("render.status"):
+            self._status_view.update_health()
+            self._status_view.update_food()
 
         # hot bar
-        self._hot_bar_view.render(self._hot_bar.items(), self._hot_bar.get_selected())
+        with self._profiler.span("render.hotbar"):
+            # (nothing is redrawn unless the hotbar or its selection has changed)
+            self._hot_bar_view.render(self._hot_bar.items(), self._hot_bar.get_selected(),
+                                      self._hot_bar.get_version())
+
+        # profile overlay
+        if self._show_profile:
+            if self._profile_text is None or self._profiler.get_frame() % PROFILE_REFRESH_FRAMES == 0:
+                statistics = self.get_frame_statistics()
+                self._profile_text = (f"{statistics['ticks_per_second']:.1f} steps/s, "
+                                      f"{statistics['frames_per_second']:.1f} frames/s, "
+                                      f"{statistics['skipped_frames']} skipped\n"
+                                      + format_summary(self._profiler.summarise(PROFILE_SUMMARY_FRAMES)))
+            self._view.show_profile(self._profile_text)
 
     def step(self):
-        data = GameData(self._world, self._player)
-        self._world.step(data)
-        self.check_target()
+        self._scheduler.begin_tick()
+        self._profiler.begin_frame()
+
+        # the session resolves the target once it has stepped
+        self._aim()
+        self._session.step()
 
         # Handle the player's death.
-        if self._player.get_health() <= 0:
+        if self._session.is_player_dead():
             self._world.remove_player(self._player)
             self.death()
 
-        self.redraw()
-
-        self._master.after(15, self.step)
-
-    def _move(self, dx, dy):
-        """ Change the player's velocity
-
-            Parameters:
-                dx(float): Change in x velocity
-                dy(float): Change in y velocity
-        """
-        velocity = self._player.get_velocity()
-        self._player.set_velocity((velocity.x + dx * 80, velocity.y + dy * 80))
-
-    def _jump(self):
-        """ Player Action: Jump """
-        velocity = self._player.get_velocity()
-        self._player.set_velocity((velocity.x * 0.5, velocity.y - 250))
-
-    def mine_block(self, block, x, y):
-        """ Event: Player mining block.
-
-            Parameters:
-                block(BLOCK()): Block
-                x(float): x coordinate of block
-                y(float): y coordinate of block
-        """
-        luck = random.random()
-
-        active_item, effective_item = self.get_holding()
-
-        if self._target_in_range:
-
-            was_item_suitable, was_attack_successful = block.mine(effective_item, active_item, luck)
-
-            effective_item.attack(was_attack_successful)
-
-            if block.is_mined():
-                if self._player.get_food() > 0:
-                    self._player.change_food(change=-0.5)
-                    # Handle if the food becomes negative
-                    if self._player.get_food() < 0:
-                        self._player.change_food(change=-(self._player.get_food()))
-                else:
-                    self._player.change_health(change=-1)
+        if self._journal.is_snapshot_due():
+            self._autosave()
 
-                drops = block.get_drops(luck, was_item_suitable)
-                self._world.remove_thing(thing=block)
+        # when behind, drawing is skipped so that stepping can catch up
+        if self._scheduler.should_render():
+            with self._profiler.span("render"):
+                self.redraw()
 
-                if block.get_id() == 'hive':
-                    for i in range(5):
-                        self._world.add_mob(Bee("Bee", (9, 9)), x, y)
+        self._profiler.end_frame()
 
-                if not drops:
-                    return None
+        self._master.after(self._scheduler.end_tick(), self.step)
 
-                x0, y0 = block.get_position()
+    def get_frame_statistics(self):
+        """ Return statistics of recent steps & redraws (see FrameScheduler.get_statistics). """
+        return self._scheduler.get_statistics()
 
-                for i, (drop_category, drop_types) in enumerate(drops):
-                    print(f'Dropped {drop_category}, {drop_types}')
+    def _toggle_profile(self):
+        """ Show or hide the profile overlay. """
+        self._show_profile = not self._show_profile
+        self._profile_text = None
 
-                    if drop_category == "item":
-                        physical = DroppedItem(create_item(*drop_types))
+        if not self._show_profile:
+            self._view.hide_profile()
 
-                        # this is so bleh
-                        x = x0 - BLOCK_SIZE // 2 + 5 + (i % 3) * 11 + random.randint(0, 2)
-                        y = y0 - BLOCK_SIZE // 2 + 5 + ((i // 3) % 3) * 11 + random.randint(0, 2)
+    def export_profile(self, chrome_trace):
+        """ Export the recent frame profiles to a file chosen by the user.
 
-                        self._world.add_item(physical, x, y)
-                    elif drop_category == "block":
-                        self._world.add_block(create_block(*drop_types), x, y)
-                    else:
-                        raise KeyError(f"Unknown drop category {drop_category}")
-        else:
-            return None
-
-    def damage_mob(self, mob):
-        """ Event: Attacking mob.
-
-            Parameter:
-                mob(Mob): Mob
+            Parameters:
+                chrome_trace(bool): If True, the file is in the Chrome trace event format
+                                    (for chrome://tracing or Perfetto), otherwise plain JSON
         """
-
-        luck = random.random()
-        active_item, effective_item = self.get_holding()
-
-        if self._target_in_range:
-
-            # Handle if Mob is Sheep
-            if mob.get_id() == 'Sheep':
-                x, y = mob.get_position()
-                physical = DroppedItem(create_item('wool'))
-                self._world.add_item(physical, x, y)
-                return None
-
-            if active_item in ATTACK_STRENGTH:
-                damage = -(ATTACK_STRENGTH[active_item])
+        path = filedialog.asksaveasfilename(title="Export Profile", defaultextension=".json",
+                                            filetypes=PROFILE_FILE_TYPES)
+        if not path:
+            return
+
+        try:
+            if chrome_trace:
+                self._profiler.export_chrome_trace(path)
             else:
-                damage = -1
-            mob.change_health(damage)
-            print(f'Did {-(damage)} to {mob}')
-
-            if mob.is_dead():
-                drops = mob.get_drops(luck)
-
-                x0, y0 = mob.get_position()
-                if drops:
-                    for i, (drop_category, drop_types) in enumerate(drops):
-                        print(f'Dropped {drop_category}, {drop_types}')
-
-                        if drop_category == "item":
-                            physical = DroppedItem(create_item(*drop_types))
-
-                            x = x0 - BLOCK_SIZE // 2 + 5 + (i % 3) * 11 + random.randint(0, 2)
-                            y = y0 - BLOCK_SIZE // 2 + 5 + ((i // 3) % 3) * 11 + random.randint(0, 2)
+                self._profiler.export_json(path)
+        except OSError as error:
+            messagebox.showerror("Export Profile", f"Could not export the profile: {error}")
 
-                            self._world.add_item(physical, x, y)
-                        else:
-                            raise KeyError(f"Unknown drop category {drop_category}")
-                self._world.remove_thing(mob)
-
-    def get_holding(self):
-        """(Tuple<str, str>) Return the current active item and effective item in hotbar. """
-        active_stack = self._hot_bar.get_selected_value()
-        active_item = active_stack.get_item() if active_stack else self._hands
-
-        effective_item = active_item if active_item.can_attack() else self._hands
-
-        return active_item, effective_item
-
-    def check_target(self):
-        """ Determine if cursor target in range. """
-        # select target block, if possible
-        active_item, effective_item = self.get_holding()
+    def _move(self, dx, dy):
+        """ Change the player's velocity
 
-        pixel_range = active_item.get_attack_range() * self._world.get_cell_expanse()
+            Parameters:
+                dx(float): Change in x velocity
+                dy(float): Change in y velocity
+        """
+        self._session.move(dx, dy)
 
-        self._target_in_range = positions_in_range(self._player.get_position(),
-                                                   self._target_position,
-                                                   pixel_range)
+    def _jump(self):
+        """ Player Action: Jump """
+        self._session.jump()
 
     def _mouse_move(self, event):
         """ Event: Mouse movement
             Parameter:
                 event(x, y): x and y coordinates of cursor position.
         """
-        self._target_position = event.x, event.y
-        self.check_target()
+        self._cursor = event.x, event.y
+
+    def _aim(self):
+        """ Target the world position under the cursor. """
+        if self._cursor is not None:
+            # the camera may have scrolled since the cursor last moved
+            self._session.set_target(*self._view.screen_to_world(*self._cursor))
 
     def _left_click(self, event):
         """ Event: Left Click
             Parameter:
                 event(x, y): x and y coordinates of left click.
         """
-        # Invariant: (event.x, event.y) == self._target_position
-        #  => Due to mouse move setting target position to cursor
-        x, y = self._target_position
-        print('left click')
-
-        if self._target_in_range:
-            block = self._world.get_block(x, y)
-            mobs = self._world.get_mobs(x, y, 1)
-            if block:
-                self.mine_block(block, x, y)
-            if mobs:
-                for mob in mobs:
-                    self.damage_mob(mob)
+        # The target is only resolved again if the cursor has moved (or the camera has scrolled)
+        # since the last step
+        log.emit(Clicked, "Left", event.x, event.y)
+        self._cursor = event.x, event.y
+        self._aim()
+        self._session.attack_target()
 
     def _trigger_crafting(self, craft_type):
         """ Trigger Crafting Window
             Parameter:
                 craft_type(str): Crafting Window to Initialise"""
-        print(f"Crafting with {craft_type}")
+        log.emit(CraftingWindowOpened, craft_type)
         if craft_type == 'basic':
-            crafter = GridCrafter(CRAFTING_RECIPES_2x2)
+            crafter = GridCrafter(CRAFTING_RECIPES_2x2, normalise=True)
         elif craft_type == 'crafting_table':
-            crafter = GridCrafter(CRAFTING_RECIPES_3x3, 3, 3)
+            crafter = GridCrafter(CRAFTING_RECIPES_3x3, 3, 3, normalise=True)
         elif craft_type == 'furnace':
-            crafter = GridCrafter(FURNACE_RECIPES, 3, 1)
-        self._crafting_window = CraftingWindow(self._master, 'Crafting Window', self._hot_bar, self._inventory, crafter)
+            crafter = GridCrafter(FURNACE_RECIPES, 3, 1, normalise=True)
+        self._crafting_window = CraftingWindow(self._master, 'Crafting Window', self._hot_bar, self._inventory, crafter,
+                                               on_change=self._session.record_grids)
 
 
     def run_effect(self, effect):
@@ -336,130 +330,102 @@ class Ninedraft:
             Parameters:
                 effect(str): effect to be applied
         """
-        if len(effect) == 2:
-            if effect[0] == "crafting":
-                craft_type = effect[1]
-
-                if craft_type == "basic":
-                    print("Can't craft much on a 2x2 grid :/")
-
-                elif craft_type == "crafting_table":
-                    print("Let's get our kraft® on! King of the brands")
-
-                elif craft_type == "furnace":
-                    print("Time for some cooking.")
-
-                self._trigger_crafting(craft_type)
-                return
-            elif effect[0] in ("food", "health"):
-                stat, strength = effect
-                print(f"Gaining {strength} {stat}!")
-                getattr(self._player, f"change_{stat}")(strength)
-                return
-
-        raise KeyError(f"No effect defined for {effect}")
+        self._session.run_effect(effect)
 
     def _right_click(self, event):
-        print("Right click")
-
-        x, y = self._target_position
-        target = self._world.get_thing(x, y)
-
-        if target:
-            # use this thing
-            print(f'using {target}')
-            effect = target.use()
-            print(f'used {target} and got {effect}')
-
-            if effect:
-                self.run_effect(effect)
-
-        else:
-            # place active item
-            selected = self._hot_bar.get_selected()
-
-            if not selected:
-                return
-
-            stack = self._hot_bar[selected]
-            drops = stack.get_item().place()
-
-            stack.subtract(1)
-
-            if stack.get_quantity() == 0:
-                # remove from hotbar
-                self._hot_bar[selected] = None
-
-            if not drops:
-                return
-
-            # handling multiple drops would be somewhat finicky, so prevent it
-            if len(drops) > 1:
-                raise NotImplementedError("Cannot handle dropping more than 1 thing")
-
-            drop_category, drop_types = drops[0]
-
-            x, y = event.x, event.y
-
-            if drop_category == "block":
-                existing_block = self._world.get_block(x, y)
-
-                if not existing_block:
-                    self._world.add_block(create_block(drop_types[0]), x, y)
-                else:
-                    raise NotImplementedError(
-                        "Automatically placing a block nearby if the target cell is full is not yet implemented")
-
-            elif drop_category == "food":
-                strength = stack.get_item().get_strength()
-                # Update Player's Health
-                if self._player.get_food() < self._player._max_food:
-                    self._player.change_food(strength)
-                elif self._player.get_health() < self._player._max_health:
-                    self._player.change_health(strength)
-
-            elif drop_category == "effect":
-                self.run_effect(drop_types)
-
-            else:
-                raise KeyError(f"Unknown drop category {drop_category}")
+        log.emit(Clicked, "Right", event.x, event.y)
+        self._cursor = event.x, event.y
+        self._aim()
+        self._session.use_target()
 
     def close(self):
         """ Close the game """
         if tk.messagebox.askokcancel("Exit", "Are you sure you want to quit the game?"):
-            self._master.destroy()
+            self._quit()
 
-    def new_game(self):
-        """ Launch a new game. """
-        self._world = World((GRID_WIDTH, GRID_HEIGHT), BLOCK_SIZE)
+    def _quit(self):
+        """ Close the game, without a prompt. """
+        # Closed properly, so there will be nothing to recover
+        self._journal.close(discard=True)
+        self._master.destroy()
 
-        load_simple_world(self._world)
+    def _recover(self):
+        """ Offer to recover the autosaved game, if the game wasn't closed properly last time.
 
-        self._player = Player()
-        self._world.add_player(self._player, 250, 150)
+            Return:
+                bool: True iff the session's game was recovered
+        """
+        if not os.path.exists(AUTOSAVE_PATH):
+            return False
 
-        self._world.add_collision_handler("player", "item", on_begin=self._handle_player_collide_item)
+        if not messagebox.askyesno("Recover Game",
+                                   "Ninedraft didn't close properly last time. Recover the game?"):
+            return False
 
-        self._hot_bar = SelectableGrid(rows=1, columns=10)
-        self._hot_bar.select((0, 0))
+        try:
+            self._session.recover(AUTOSAVE_PATH, JOURNAL_PATH)
+        except (OSError, SaveError, ValueError, KeyError) as error:
+            messagebox.showerror("Recover Game", f"Could not recover the game: {error}")
+            return False
 
-        starting_hotbar = [
-            Stack(create_item("dirt"), 20),
-            Stack(create_item("apple"), 4),
-        ]
+        return True
 
-        for i, item in enumerate(starting_hotbar):
-            self._hot_bar[0, i] = item
+    def _autosave(self):
+        """ Queue a snapshot of the game, which empties the journal (see journal.py). """
+        self._session.prepare_to_overwrite(AUTOSAVE_PATH)
+        self._journal.snapshot(*self._session.dump_game())
 
-        self._hands = create_item('hands')
+    def new_game(self):
+        """ Launch a new game. """
+        self._session.new_game()
+        self._use_session_game()
+
+    def save_game(self):
+        """ Save the game to a file chosen by the user. """
+        path = filedialog.asksaveasfilename(title="Save Game", defaultextension=".ndsave",
+                                            filetypes=SAVE_FILE_TYPES)
+        if not path:
+            return
+
+        try:
+            self._session.save_game(path)
+        except OSError as error:
+            messagebox.showerror("Save Game", f"Could not save the game: {error}")
+
+    def load_game(self):
+        """ Replace the game with one loaded from a file chosen by the user. """
+        path = filedialog.askopenfilename(title="Load Game", filetypes=SAVE_FILE_TYPES)
+        if not path:
+            return
+
+        try:
+            self._session.load_game(path)
+        except (OSError, SaveError) as error:
+            messagebox.showerror("Load Game", f"Could not load the game: {error}")
+            return
+
+        # The loaded file already holds the whole game, so is copied as the autosave, rather
+        # than snapshotting the game (which would read every chunk of the file)
+        self._use_session_game(autosave=False)
+        try:
+            self._journal.rebase(path)
+        except (OSError, SaveError):
+            self._autosave()
+
+    def _use_session_game(self, autosave=True):
+        """ Use the session's (new or loaded) world, player, hotbar & inventory.
+
+            Parameters:
+                autosave (bool): If True, the game is autosaved, to start the journal from
+        """
+        self._world = self._session.get_world()
+        self._player = self._session.get_player()
+        self._hot_bar = self._session.get_hot_bar()
+        self._inventory = self._session.get_inventory()
 
-        starting_inventory = [
-            ((1, 5), Stack(Item('dirt'), 10)),
-            ((0, 2), Stack(Item('wood'), 10)),
-        ]
-        self._inventory = Grid(rows=3, columns=10)
-        for position, stack in starting_inventory:
-            self._inventory[position] = stack
+        # The journal only records changes, so needs a snapshot of the whole game to start from
+        if autosave:
+            self._autosave()
 
         # Configure status view to 'new player'.
         if self._status_view:
@@ -472,7 +438,7 @@ class Ninedraft:
         if tk.messagebox.askokcancel("You have died!", "Would you like to start a new game?"):
             self.new_game()
         else:
-            self._master.destroy()
+            self._quit()
 
     def _enter(self, event):
         """ Set the focus of the mouse when entering
@@ -489,39 +455,6 @@ class Ninedraft:
         self.redraw()
 
     def _activate_item(self, index):
-        print(f"Activating {index}")
+        log.emit(HotbarItemActivated, index)
 
         self._hot_bar.toggle_selection((0, index))
-
-    def _handle_player_collide_item(self, player: Player, dropped_item: DroppedItem, data,
-                                    arbiter: pymunk.Arbiter):
-        """Callback to handle collision between the player and a (dropped) item. If the player has sufficient space in
-        their to pick up the item, the item will be removed from the game world.
-
-        Parameters:
-            player (Player): The player that was involved in the collision
-            dropped_item (DroppedItem): The (dropped) item that the player collided with
-            data (dict): data that was added with this collision handler (see data parameter in
-                         World.add_collision_handler)
-            arbiter (pymunk.Arbiter): Data about a collision
-                                      (see http://www.pymunk.org/en/latest/pymunk.html#pymunk.Arbiter)
-                                      NOTE: you probably won't need this
-        Return:
-             bool: False (always ignore this type of collision)
-                   (more generally, collision callbacks return True iff the collision should be considered valid; i.e.
-                   returning False makes the world ignore the collision)
-        """
-
-        item = dropped_item.get_item()
-
-        if self._hot_bar.add_item(item):
-            print(f"Added 1 {item!r} to the hotbar")
-        elif self._inventory.add_item(item):
-            print(f"Added 1 {item!r} to the inventory")
-        else:
-            print(f"Found 1 {item!r}, but both hotbar & inventory are full")
-            return True
-
-        self._world.remove_item(dropped_item)
-        return False
-
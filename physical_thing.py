@@ -17,6 +17,7 @@ class PhysicalThing:
     """The highest-level abstract representation of a physical thing in the game world
 
     Should not be instantiated directly"""
+    __slots__ = ('_shape',)
 
     def __init__(self):
         self._shape: pymunk.Shape = None
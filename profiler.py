@@ -0,0 +1,236 @@
+"""
+Lightweight per-frame profiling, for finding out where the time in each frame goes.
+
+Code is instrumented with named spans (see Profiler.span), which are timed with
+time.perf_counter & recorded in a fixed-size ring buffer, so profiling can be left on
+indefinitely with bounded memory. The buffer can be summarised (e.g. for an on-screen
+overlay, see game.GameView.show_profile), or exported for offline analysis, either as plain
+JSON or in the Chrome trace event format (which can be opened in chrome://tracing or Perfetto).
+
+Instrumented code always has a profiler to call; when profiling is off it is NULL_PROFILER,
+whose spans do nothing.
+"""
+
+__author__ = "Joel Foster"
+__date__ = "17/10/2026"
+__version__ = "1.1.0"
+__copyright__ = "The University of Queensland, 2019"
+
+import json
+import time
+from collections import deque
+
+# The default number of spans kept in the ring buffer
+PROFILE_CAPACITY = 2 ** 14
+
+# The name of the span recorded around each whole frame (see Profiler.begin_frame)
+FRAME_SPAN = "frame"
+
+# The percentiles reported by Profiler.summarise
+SUMMARY_PERCENTILES = (50, 95, 99)
+
+
+def percentile(ordered, percent):
+    """(float) Returns the 'percent'th percentile of 'ordered', a non-empty sorted list,
+    using the nearest-rank method"""
+    rank = max(0, min(len(ordered) - 1, int(round(percent / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def format_summary(summary):
+    """(str) Formats a summary returned by Profiler.summarise as a table, one span per line
+
+    Example:
+        >>> print(format_summary(profiler.summarise()))
+        span         mean    p50    p95    p99 (ms)
+        frame       16.21  16.02  18.47  21.90
+        world.step   3.12   3.01   4.80   6.33
+    """
+    width = max([len("span")] + [len(name) for name in summary])
+    header = f"{'span':<{width}}   mean" + "".join(f"{f'p{percent}':>7}" for percent in SUMMARY_PERCENTILES)
+
+    lines = [header + " (ms)"]
+    for name, statistics in summary.items():
+        lines.append(f"{name:<{width}} {statistics['mean']:6.2f}"
+                     + "".join(f" {statistics[f'p{percent}']:6.2f}" for percent in SUMMARY_PERCENTILES))
+
+    return "\n".join(lines)
+
+
+class _Span:
+    """Context manager that times a single named span of a Profiler"""
+
+    __slots__ = ('_profiler', '_name', '_start')
+
+    def __init__(self, profiler, name):
+        self._profiler = profiler
+        self._name = name
+        self._start = None
+
+    def __enter__(self):
+        self._start = self._profiler._clock()
+        return self
+
+    def __exit__(self, *args):
+        profiler = self._profiler
+        end = profiler._clock()
+        profiler._records.append((self._name, profiler._frame, self._start, end - self._start))
+
+
+class _NullSpan:
+    """Context manager that does nothing (see NullProfiler)"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+class Profiler:
+    """Records the duration of named spans of code, in a fixed-size ring buffer
+
+    Each record is a (name, frame, start, duration) tuple, where frame is the number of the frame
+    the span occurred in (see begin_frame) & start/duration are in seconds. Once the buffer is
+    full, the oldest records are discarded.
+    """
+
+    def __init__(self, capacity=PROFILE_CAPACITY, clock=time.perf_counter):
+        """Constructor
+
+        Parameters:
+            capacity (int): The maximum number of records kept
+            clock (callable): Returns a monotonic time in seconds
+        """
+        self._clock = clock
+        self._records = deque(maxlen=capacity)
+
+        self._frame = 0
+        self._frame_start = None
+
+    def is_enabled(self):
+        """(bool) Returns True iff spans are recorded"""
+        return True
+
+    def span(self, name):
+        """Returns a context manager that records the time spent within it as a span named 'name'
+
+        Example:
+            >>> with profiler.span("physics"):
+            ...     space.step(dt)
+        """
+        return _Span(self, name)
+
+    def begin_frame(self):
+        """Starts timing a frame; spans recorded until end_frame are attributed to it"""
+        self._frame += 1
+        self._frame_start = self._clock()
+
+    def end_frame(self):
+        """Finishes timing the frame started by begin_frame, recording it as a span named FRAME_SPAN"""
+        if self._frame_start is None:
+            return
+
+        end = self._clock()
+        self._records.append((FRAME_SPAN, self._frame, self._frame_start, end - self._frame_start))
+        self._frame_start = None
+
+    def get_frame(self):
+        """(int) Returns the number of the current (or last) frame"""
+        return self._frame
+
+    def get_records(self):
+        """(list<tuple<str, int, float, float>>) Returns the (name, frame, start, duration) records
+        in the buffer, oldest first"""
+        return list(self._records)
+
+    def clear(self):
+        """Discards all records"""
+        self._records.clear()
+
+    def summarise(self, last_frames=None):
+        """Summarises the duration of each span
+
+        Parameters:
+            last_frames (int): If given, only the spans of the last 'last_frames' frames are summarised
+
+        Return:
+            dict<str: dict<str: float>>: Mapping of span name -> statistics (in milliseconds), with
+                                         keys 'count', 'mean', 'max' & 'p50', 'p95', 'p99'
+                                         (see SUMMARY_PERCENTILES), in the order spans were first seen
+        """
+        first_frame = self._frame - last_frames + 1 if last_frames is not None else None
+
+        durations = {}
+        for name, frame, _, duration in self._records:
+            if first_frame is None or frame >= first_frame:
+                durations.setdefault(name, []).append(duration * 1000)
+
+        summary = {}
+        for name, values in durations.items():
+            values.sort()
+            statistics = {
+                "count": len(values),
+                "mean": sum(values) / len(values),
+                "max": values[-1],
+            }
+            for percent in SUMMARY_PERCENTILES:
+                statistics[f"p{percent}"] = percentile(values, percent)
+            summary[name] = statistics
+
+        return summary
+
+    def export_json(self, path):
+        """Writes the records & their summary to 'path' as JSON
+
+        The file contains an object with "records", a list of {name, frame, start, duration}
+        objects (times in seconds), and "summary", as returned by summarise.
+        """
+        document = {
+            "records": [{"name": name, "frame": frame, "start": start, "duration": duration}
+                        for name, frame, start, duration in self._records],
+            "summary": self.summarise(),
+        }
+
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(document, file, indent=1)
+
+    def export_chrome_trace(self, path):
+        """Writes the records to 'path' in the Chrome trace event format
+
+        Each record becomes a complete ("X") event, with timestamps in microseconds.
+        """
+        events = [{"name": name, "cat": "frame" if name == FRAME_SPAN else "span", "ph": "X",
+                   "ts": start * 1e6, "dur": duration * 1e6, "pid": 1, "tid": 1, "args": {"frame": frame}}
+                  for name, frame, start, duration in self._records]
+
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+
+class NullProfiler(Profiler):
+    """A profiler that records nothing, so that instrumented code costs (almost) nothing when
+    profiling is off"""
+
+    _NULL_SPAN = _NullSpan()
+
+    def __init__(self):
+        super().__init__(capacity=0)
+
+    def is_enabled(self):
+        return False
+
+    def span(self, name):
+        return self._NULL_SPAN
+
+    def begin_frame(self):
+        pass
+
+    def end_frame(self):
+        pass
+
+
+# Shared profiler for code that isn't being profiled
+NULL_PROFILER = NullProfiler()
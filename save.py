@@ -0,0 +1,366 @@
+"""
+Saving & loading games in a compact binary format.
+
+Blocks are stored per chunk (see chunks.py), as a packed array of small integer ids into a
+palette of block id tuples (see item_creation.create_block). The file is memory-mapped when it
+is opened, and a chunk directory gives the offset of each chunk's array, so a single chunk can
+be read without parsing the rest of the file. Everything else (e.g. the player, mobs, dropped
+items, the hotbar & inventory) is stored as a JSON document at the end of the file.
+
+Layout (all integers are little-endian):
+    header      magic (4 bytes), format version (uint16), chunk size (uint16),
+                number of chunks (uint32), offset of the directory (uint64),
+                offset & length of the JSON document (uint64, uint64)
+    chunks      for each chunk, CHUNK_SIZE ** 2 palette indices (uint16), in row-major order;
+                index 0 is an empty cell, and index i > 0 is palette[i - 1]
+    directory   for each chunk, its chunk column & chunk row (int32, int32) & the offset of its
+                array (uint64)
+    document    UTF-8 encoded JSON object, with the palette under "palette"
+"""
+
+__author__ = "Joel Foster"
+__date__ = "17/10/2026"
+__version__ = "1.1.0"
+__copyright__ = "The University of Queensland, 2019"
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import MutableMapping
+
+from chunks import CHUNK_SIZE
+from grid import Stack
+from item_creation import create_item
+from new_items import ToolItem
+
+MAGIC = b"NDSV"
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct("<4sHHIQQQ")
+DIRECTORY_ENTRY = struct.Struct("<iiQ")
+
+# Type code of the packed chunk arrays (unsigned 16 bit), allowing palettes of up to 65535 blocks
+CHUNK_ARRAY_TYPE = "H"
+
+
+class SaveError(Exception):
+    """Raised when a save file is not in a format that can be loaded"""
+
+
+def _pack_chunk(chunk, cells, palette):
+    """(bytes) Packs the blocks of a chunk into an array of palette indices
+
+    Parameters:
+        chunk (tuple<int, int>): The (chunk column, chunk row) of the chunk
+        cells (dict<tuple<int, int>: tuple>): Mapping of (column, row) cells in the chunk to
+                                              the block id tuple of the block in that cell
+        palette (dict<tuple: int>): Mapping of block id tuples to their palette index;
+                                    block id tuples that are missing are added
+    """
+    chunk_column, chunk_row = chunk
+    left, top = chunk_column * CHUNK_SIZE, chunk_row * CHUNK_SIZE
+
+    indices = array(CHUNK_ARRAY_TYPE, bytes(CHUNK_SIZE * CHUNK_SIZE * 2))
+
+    for (column, row), block_id in cells.items():
+        index = palette.get(block_id)
+        if index is None:
+            index = palette[block_id] = len(palette) + 1
+
+        indices[(row - top) * CHUNK_SIZE + column - left] = index
+
+    if sys.byteorder == "big":
+        indices.byteswap()
+
+    return indices.tobytes()
+
+
+def write_save(path, chunks, document):
+    """Writes a save file
+
+    The file is written beside 'path' first, then moved into place, so an existing save at
+    'path' is never left half-written.
+
+    Parameters:
+        path (str): The path of the file to write
+        chunks (iterable<tuple<tuple<int, int>, dict>>): (chunk, cells) pairs of the chunks to save,
+                where cells maps (column, row) cells to the block id tuple of the block there
+        document (dict): The rest of the game state, which must be serialisable as JSON
+    """
+    palette = {}
+    directory = []
+
+    temporary_path = path + ".tmp"
+
+    with open(temporary_path, "wb") as file:
+        file.write(bytes(HEADER.size))
+
+        for chunk, cells in chunks:
+            directory.append((chunk, file.tell()))
+            file.write(_pack_chunk(chunk, cells, palette))
+
+        directory_offset = file.tell()
+        file.write(b"".join(DIRECTORY_ENTRY.pack(chunk_column, chunk_row, offset)
+                            for (chunk_column, chunk_row), offset in directory))
+
+        document = dict(document, palette=[list(block_id) for block_id in palette])
+        encoded = json.dumps(document, separators=(",", ":")).encode("utf-8")
+
+        document_offset = file.tell()
+        file.write(encoded)
+
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, CHUNK_SIZE, len(directory),
+                               directory_offset, document_offset, len(encoded)))
+
+    os.replace(temporary_path, path)
+
+
+class SaveFile:
+    """A memory-mapped save file, from which individual chunks can be read on demand"""
+
+    def __init__(self, path):
+        """Opens the save file at 'path', reading only its header, chunk directory & document
+
+        Raises:
+            OSError: if the file can't be opened
+            SaveError: if the file is not a save file (e.g. it is empty, truncated or corrupt),
+                       or was saved in an unsupported format
+        """
+        self._path = path
+
+        with open(path, "rb") as file:
+            try:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as error:
+                # e.g. the file is empty
+                raise SaveError(f"{path} is not a save file: {error}") from error
+
+        try:
+            self._read_index()
+        except SaveError:
+            self.close()
+            raise
+        except (struct.error, ValueError, KeyError, TypeError) as error:
+            # Includes json.JSONDecodeError & UnicodeDecodeError, which are ValueErrors
+            self.close()
+            raise SaveError(f"{path} is truncated or corrupt: {error}") from error
+
+    def _read_index(self):
+        """Reads the header, chunk directory & document of the file"""
+        data = self._map
+
+        if len(data) < HEADER.size:
+            raise SaveError(f"{self._path} is too short to be a save file")
+
+        magic, version, chunk_size, count, directory_offset, document_offset, document_length = \
+            HEADER.unpack_from(data)
+
+        if magic != MAGIC:
+            raise SaveError(f"{self._path} is not a save file")
+        if version != FORMAT_VERSION:
+            raise SaveError(f"{self._path} was saved in format version {version}, not {FORMAT_VERSION}")
+        if chunk_size != CHUNK_SIZE:
+            raise SaveError(f"{self._path} was saved with chunks of size {chunk_size}, not {CHUNK_SIZE}")
+
+        chunk_length = CHUNK_SIZE * CHUNK_SIZE * array(CHUNK_ARRAY_TYPE).itemsize
+        if (directory_offset + count * DIRECTORY_ENTRY.size > len(data)
+                or document_offset + document_length > len(data)):
+            raise SaveError(f"{self._path} is truncated")
+
+        # Maps chunk -> offset of its array
+        self._directory = {}
+        for chunk_column, chunk_row, offset in DIRECTORY_ENTRY.iter_unpack(
+                data[directory_offset:directory_offset + count * DIRECTORY_ENTRY.size]):
+            if offset + chunk_length > len(data):
+                raise SaveError(f"{self._path} is truncated")
+            self._directory[chunk_column, chunk_row] = offset
+
+        self._document = json.loads(data[document_offset:document_offset + document_length].decode("utf-8"))
+        if not isinstance(self._document, dict):
+            raise SaveError(f"{self._path} has no game document")
+
+        # Index 0 is an empty cell
+        self._palette = [None] + [tuple(block_id) for block_id in self._document.pop("palette")]
+
+    def get_path(self):
+        """(str) Returns the path of the save file"""
+        return self._path
+
+    def get_document(self):
+        """(dict) Returns the game state that was saved alongside the chunks"""
+        return self._document
+
+    def get_chunks(self):
+        """(list<tuple<int, int>>) Returns the (chunk column, chunk row) of each saved chunk"""
+        return list(self._directory)
+
+    def __contains__(self, chunk):
+        return chunk in self._directory
+
+    def read_chunk(self, chunk):
+        """Reads a single chunk from the file
+
+        Parameters:
+            chunk (tuple<int, int>): The (chunk column, chunk row) of the chunk
+
+        Return:
+            dict<tuple<int, int>: tuple>: Mapping of (column, row) cells to the block id tuple of
+                                          the block in that cell
+
+        Raises:
+            SaveError: if the chunk refers to blocks missing from the palette (i.e. is corrupt)
+        """
+        offset = self._directory[chunk]
+
+        indices = array(CHUNK_ARRAY_TYPE)
+        indices.frombytes(self._map[offset:offset + CHUNK_SIZE * CHUNK_SIZE * indices.itemsize])
+        if sys.byteorder == "big":
+            indices.byteswap()
+
+        chunk_column, chunk_row = chunk
+        left, top = chunk_column * CHUNK_SIZE, chunk_row * CHUNK_SIZE
+        palette = self._palette
+
+        if max(indices) >= len(palette):
+            raise SaveError(f"{self._path} has a corrupt chunk at {chunk}")
+
+        return {(left + i % CHUNK_SIZE, top + i // CHUNK_SIZE): palette[index]
+                for i, index in enumerate(indices) if index}
+
+    def close(self):
+        """Unmaps the file; no more chunks can be read"""
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class SavedChunks(MutableMapping):
+    """Mapping of chunk -> contents, that reads chunks lazily from a save file
+
+    Can be used as a ChunkManager's edits, so that chunks are only read from the save file
+    when they are loaded into the world. Chunks that are set or deleted are kept in memory,
+    overriding the save file.
+    """
+
+    def __init__(self, save_file: SaveFile):
+        """Constructor
+
+        Parameters:
+            save_file (SaveFile): The file to read chunks from
+        """
+        self._save_file = save_file
+        self._unread = set(save_file.get_chunks())
+        self._chunks = {}
+
+    def __getitem__(self, chunk):
+        if chunk in self._unread:
+            return self._save_file.read_chunk(chunk)
+
+        return self._chunks[chunk]
+
+    def __setitem__(self, chunk, cells):
+        self._unread.discard(chunk)
+        self._chunks[chunk] = cells
+
+    def __delitem__(self, chunk):
+        if chunk in self._unread:
+            self._unread.discard(chunk)
+        else:
+            del self._chunks[chunk]
+
+    def __iter__(self):
+        yield from self._chunks
+        yield from self._unread
+
+    def __len__(self):
+        return len(self._chunks) + len(self._unread)
+
+    def get_path(self):
+        """(str) Returns the path of the save file that chunks are read from"""
+        return self._save_file.get_path()
+
+    def is_reading_from(self, path):
+        """(bool) Returns True iff chunks are still to be read from the file at 'path'"""
+        if not self._unread or not os.path.exists(path):
+            return False
+
+        return os.path.samefile(path, self.get_path())
+
+    def close(self):
+        """Closes the save file, discarding the chunks that haven't been read
+
+        Should be called once the chunks are no longer needed (e.g. when another game is loaded).
+        """
+        self._unread.clear()
+        self._save_file.close()
+
+    def read_all(self):
+        """Reads every remaining chunk into memory & closes the save file
+
+        Should be called before the save file is overwritten (see is_reading_from).
+        """
+        for chunk in self._unread:
+            self._chunks[chunk] = self._save_file.read_chunk(chunk)
+
+        self._unread.clear()
+        self._save_file.close()
+
+
+def dump_item(item):
+    """(dict) Returns the JSON-serialisable state of 'item' (see load_item)"""
+    data = {"spec": list(item.get_spec())}
+
+    if isinstance(item, ToolItem):
+        data["durability"] = item.get_durability()
+
+    return data
+
+
+def load_item(data):
+    """(Item) Creates an item from the state returned by dump_item"""
+    item = create_item(*data["spec"])
+
+    if "durability" in data:
+        item.set_durability(data["durability"])
+
+    return item
+
+
+def dump_grid(grid):
+    """(list) Returns the JSON-serialisable contents of 'grid' (see load_grid)"""
+    return [[row, column, dump_item(stack.get_item()), stack.get_quantity()]
+            for (row, column), stack in grid.items() if stack is not None]
+
+
+def load_grid(grid, data):
+    """Replaces the contents of 'grid' with the contents returned by dump_grid"""
+    for position in list(grid.keys()):
+        grid[position] = None
+
+    for row, column, item, quantity in data:
+        grid[row, column] = Stack(load_item(item), quantity)
+
+
+def dump_dynamic_thing(thing):
+    """(dict) Returns the JSON-serialisable physical state of 'thing' (see restore_dynamic_thing)"""
+    velocity = thing.get_velocity()
+
+    return {
+        "position": list(thing.get_position()),
+        "velocity": [velocity[0], velocity[1]],
+        "health": thing.get_health(),
+    }
+
+
+def restore_dynamic_thing(thing, data):
+    """Restores the state returned by dump_dynamic_thing to 'thing', which must already be in a world"""
+    thing.set_velocity(tuple(data["velocity"]))
+    thing.change_health(data["health"] - thing.get_health())
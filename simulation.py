@@ -0,0 +1,854 @@
+"""
+Game rules for Ninedraft, independent of any user interface.
+
+GameSession owns the world, the player, the hotbar & the inventory, and implements
+everything the player can do to them (moving, mining, attacking, placing & using).
+The tkinter app (see ninedraft.py) and the headless runner (see headless.py) both
+drive a GameSession, so they play by exactly the same rules.
+"""
+
+__author__ = "Joel Foster"
+__date__ = "17/10/2026"
+__version__ = "1.1.0"
+__copyright__ = "The University of Queensland, 2019"
+
+import math
+import random
+import time
+from collections import namedtuple
+
+import pymunk
+
+from constants import ATTACK_STRENGTH
+from core import positions_in_range
+from grid import Stack, Grid, SelectableGrid
+from item import Item
+from player import Player
+from dropped_item import DroppedItem
+from world import World
+from mob import Bird
+from new_mobs import Bee, Sheep
+from item_creation import create_block, create_item, create_simple_world_generator, load_simple_mobs
+from chunks import ChunkManager
+from save import (write_save, SaveFile, SavedChunks, dump_item, load_item, dump_grid, load_grid,
+                  dump_dynamic_thing, restore_dynamic_thing)
+from journal import read_journal
+from profiler import NULL_PROFILER
+from events import (get_log, ItemDropped, MobDamaged, ThingUsed, StatGained, CraftingStarted, ItemsAdded,
+                    ItemsNotPickedUp)
+
+BLOCK_SIZE = 2 ** 5
+GRID_WIDTH = 2 ** 8
+GRID_HEIGHT = 2 ** 4
+
+# Physics is simulated in fixed substeps of this many seconds
+PHYSICS_TIMESTEP = 1 / 60
+
+# Chunks (see chunks.py) within this many chunks of the player are kept loaded
+# (enough to cover half the width of the screen, see ninedraft.VIEWPORT_COLUMNS)
+CHUNK_VIEW_DISTANCE = 3
+
+# The (x, y) position at which the player starts
+SPAWN_POSITION = 250, 150
+
+GameData = namedtuple('GameData', ['world', 'player'])
+
+log = get_log(__name__)
+
+# Mob classes that can be saved & loaded, by name
+MOB_TYPES = {cls.__name__: cls for cls in (Bird, Sheep, Bee)}
+
+
+class SimulatedClock:
+    """A clock that only advances when told to
+
+    Can be used in place of time.time to step a World deterministically, independent of real time
+    """
+
+    def __init__(self, start=0.):
+        """Constructor
+
+        Parameters:
+            start (float): The initial time, in seconds
+        """
+        self._now = start
+
+    def advance(self, seconds):
+        """Moves the clock forward by 'seconds'"""
+        self._now += seconds
+
+    def set(self, now):
+        """Moves the clock to the time 'now', in seconds"""
+        self._now = now
+
+    def __call__(self):
+        """(float) Returns the current time, in seconds"""
+        return self._now
+
+
+class GameSession:
+    """The state & rules of a single game of Ninedraft"""
+
+    def __init__(self, world_loader=load_simple_mobs, clock=time.time, on_crafting=None,
+                 chunk_generator=create_simple_world_generator, view_distance=CHUNK_VIEW_DISTANCE,
+                 merge_collisions=True, profiler=NULL_PROFILER, timestep=PHYSICS_TIMESTEP):
+        """Constructor
+
+        Parameters:
+            world_loader (callable): Called with each new World to fill it with mobs (& blocks, if
+                                     'chunk_generator' is None)
+            clock (callable): Returns the current time in seconds; passed on to each new World
+            on_crafting (callable): Called with the craft type (e.g. 'crafting_table') whenever a
+                                    crafting effect is run, or None to ignore crafting effects
+            chunk_generator (callable): Called to create the ChunkGenerator for each new World, whose
+                                        chunks are then loaded as the player explores (called with
+                                        the saved seed when loading a game, see load_game);
+                                        or None if 'world_loader' loads all of the blocks
+            view_distance (int): The number of chunks around the player to keep loaded
+            merge_collisions (bool): If True, adjacent blocks share collision shapes (see World)
+            profiler (profiler.Profiler): Records the time spent in each part of a step (see set_profiler)
+            timestep (float): The fixed size (in seconds) of each physics substep of each new World
+        """
+        self._world_loader = world_loader
+        self._chunk_generator = chunk_generator
+        self._view_distance = view_distance
+        self._merge_collisions = merge_collisions
+        self._clock = clock
+        self._on_crafting = on_crafting
+        self._profiler = profiler
+        self._timestep = timestep
+
+        # The target is resolved (see check_target) at most once per step, & again only when it
+        # has changed since (see set_target), rather than every time it is set or queried
+        self._target_in_range = False
+        self._target_position = 0, 0
+        self._target_block = None
+        self._target_stale = True
+
+        # The chunks of the loaded game that haven't been loaded into the world yet (see load_game)
+        self._saved_chunks = None
+
+        # Records every change to the world & the player's items, if set (see set_journal)
+        self._journal = None
+
+        self.new_game()
+
+    def _create_world(self, seed=None, edits=None, position=SPAWN_POSITION):
+        """Creates an empty world, with the chunks around 'position' loaded
+
+        Parameters:
+            seed (int | str): The seed to generate chunks from, or None for a random seed
+            edits (MutableMapping): The contents of chunks that differ from what would be generated
+                                    (see ChunkManager)
+            position (tuple<float, float>): The (x, y) position to load the chunks around
+        """
+        self._world = World((GRID_WIDTH, GRID_HEIGHT), BLOCK_SIZE, timestep=self._timestep, clock=self._clock,
+                            merge_collisions=self._merge_collisions, profiler=self._profiler)
+
+        if self._chunk_generator is None:
+            self._chunks = None
+        else:
+            generator = self._chunk_generator() if seed is None else self._chunk_generator(seed)
+            self._chunks = ChunkManager(self._world, generator, create_block, self._view_distance, edits=edits)
+            self._chunks.update(*position)
+
+        self._world.add_collision_handler("player", "item", on_begin=self._handle_player_collide_item,
+                                          on_pre_solve=self._handle_player_touch_item)
+        self._world.set_pickup_handler(self._pick_up_items)
+
+        self._target_stale = True
+
+    def _close_saved_chunks(self):
+        """Closes the save file of the previously loaded game, if any"""
+        if self._saved_chunks is not None:
+            self._saved_chunks.close()
+            self._saved_chunks = None
+
+    def prepare_to_overwrite(self, path):
+        """Prepares for the file at 'path' to be overwritten (e.g. by save_game)
+
+        Chunks of the loaded game are read from its save file lazily, as they are needed; if that
+        file is about to be overwritten, the chunks that haven't been read yet are read into memory
+        first. Otherwise, nothing is read.
+        """
+        if self._saved_chunks is not None and self._saved_chunks.is_reading_from(path):
+            self._saved_chunks.read_all()
+            self._saved_chunks = None
+
+    def new_game(self):
+        """Starts a new game, with a freshly loaded world, player, hotbar & inventory"""
+        self._close_saved_chunks()
+        self._create_world()
+
+        self._world_loader(self._world)
+
+        self._player = Player()
+        self._world.add_player(self._player, *SPAWN_POSITION)
+
+        self._hot_bar = SelectableGrid(rows=1, columns=10)
+        self._hot_bar.select((0, 0))
+
+        starting_hotbar = [
+            Stack(create_item("dirt"), 20),
+            Stack(create_item("apple"), 4),
+        ]
+
+        for i, item in enumerate(starting_hotbar):
+            self._hot_bar[0, i] = item
+
+        self._hands = create_item('hands')
+
+        starting_inventory = [
+            ((1, 5), Stack(Item('dirt'), 10)),
+            ((0, 2), Stack(Item('wood'), 10)),
+        ]
+        self._inventory = Grid(rows=3, columns=10)
+        for position, stack in starting_inventory:
+            self._inventory[position] = stack
+
+    def save_game(self, path):
+        """Saves the whole game (see save.py) to the file at 'path'
+
+        Blocks are saved for every loaded chunk, & every unloaded chunk that has been edited;
+        all other chunks are regenerated from the saved seed when the game is loaded.
+        """
+        self.prepare_to_overwrite(path)
+        write_save(path, *self.dump_game())
+
+    def dump_game(self):
+        """Returns the whole state of the game, as it is saved by save_game
+
+        The returned state is independent of the game, so it can be written after the game has
+        moved on (e.g. on another thread, see journal.Journal.snapshot).
+
+        Return:
+            tuple<list, dict>: The (chunk, cells) pairs & the document, as for save.write_save
+        """
+        world = self._world
+
+        hitpoints = []
+        chunks = []
+        for chunk in world.get_loaded_chunks():
+            blocks = world.get_chunk_blocks(chunk)
+            chunks.append((chunk, {cell: block.get_spec() for cell, block in blocks.items()}))
+
+            for (column, row), block in blocks.items():
+                if block.get_hitpoints() != block.get_max_hitpoints():
+                    hitpoints.append([column, row, block.get_hitpoints()])
+
+        things = list(world.get_dynamic_things())
+        if self._chunks is not None:
+            # (chunks that haven't been read from the loaded game's save file yet are read, but
+            # not kept in memory)
+            chunks.extend((chunk, dict(cells)) for chunk, cells in self._chunks.get_edits().items())
+            things.extend(self._chunks.get_parked())
+
+        mobs = [dict(dump_dynamic_thing(thing), type=type(thing).__name__, id=thing.get_id(),
+                     size=list(thing.get_size()))
+                for thing in things if type(thing).__name__ in MOB_TYPES]
+        items = [dict(dump_dynamic_thing(thing), item=dump_item(thing.get_item()))
+                 for thing in things if isinstance(thing, DroppedItem)]
+
+        document = {
+            "seed": None if self._chunks is None else self._chunks.get_generator().get_seed(),
+            "hitpoints": hitpoints,
+            "player": dict(dump_dynamic_thing(self._player), name=self._player.get_name(),
+                           food=self._player.get_food()),
+            "mobs": mobs,
+            "items": items,
+            "hot_bar": {"size": list(self._hot_bar.get_size()), "selected": self._hot_bar.get_selected(),
+                        "stacks": dump_grid(self._hot_bar)},
+            "inventory": {"size": list(self._inventory.get_size()), "stacks": dump_grid(self._inventory)},
+        }
+
+        return chunks, document
+
+    def load_game(self, path):
+        """Replaces the current game with the game saved in the file at 'path' (see save_game)
+
+        Only the chunks around the player are read from the file immediately; the rest are read
+        as they are loaded into the world.
+
+        Return:
+            dict: The document that was saved alongside the chunks (see save.SaveFile.get_document)
+
+        Raises:
+            save.SaveError: if the file is not a save file that can be loaded
+        """
+        save_file = SaveFile(path)
+        document = save_file.get_document()
+
+        self._close_saved_chunks()
+        saved_chunks = SavedChunks(save_file)
+
+        position = tuple(document["player"]["position"])
+
+        if self._chunk_generator is None:
+            self._create_world(position=position)
+
+            for chunk in save_file.get_chunks():
+                for (column, row), block_id in save_file.read_chunk(chunk).items():
+                    self._world.add_block_to_grid(create_block(*block_id), column, row)
+
+            save_file.close()
+        else:
+            self._create_world(document["seed"], saved_chunks, position)
+            self._saved_chunks = saved_chunks
+
+        for column, row, hitpoints in document["hitpoints"]:
+            block = self._world.get_block_at(column, row)
+            if block is not None:
+                block.set_hitpoints(hitpoints)
+
+        self._player = Player(document["player"]["name"])
+        self._world.add_player(self._player, *position)
+        restore_dynamic_thing(self._player, document["player"])
+        self._player.change_food(document["player"]["food"] - self._player.get_food())
+
+        things = []
+        for data in document["mobs"]:
+            mob = MOB_TYPES[data["type"]](data["id"], tuple(data["size"]))
+            self._world.add_mob(mob, *data["position"])
+            things.append((mob, data))
+
+        for data in document["items"]:
+            item = DroppedItem(load_item(data["item"]))
+            self._world.add_item(item, *data["position"])
+            things.append((item, data))
+
+        for thing, data in things:
+            restore_dynamic_thing(thing, data)
+
+        if self._chunks is not None:
+            self._chunks.park(thing for thing, _ in things)
+
+        self._hot_bar = SelectableGrid(*document["hot_bar"]["size"])
+        load_grid(self._hot_bar, document["hot_bar"]["stacks"])
+        if document["hot_bar"]["selected"] is not None:
+            self._hot_bar.select(tuple(document["hot_bar"]["selected"]))
+
+        self._inventory = Grid(*document["inventory"]["size"])
+        load_grid(self._inventory, document["inventory"]["stacks"])
+
+        self._hands = create_item('hands')
+
+        return document
+
+    def recover(self, snapshot_path, journal_path):
+        """Replaces the current game with the game recorded by a journal (e.g. after a crash), by
+        loading its last snapshot & replaying the journal entries recorded after it
+
+        Raises:
+            save.SaveError: if the snapshot is not a save file that can be loaded
+        """
+        document = self.load_game(snapshot_path)
+        self.replay(read_journal(journal_path, document.get("journal_sequence", 0)))
+
+    def set_profiler(self, profiler):
+        """Records the time spent in each part of a step in 'profiler' (profiler.Profiler), for this
+        & every later world"""
+        self._profiler = profiler
+        self._world.set_profiler(profiler)
+
+    def get_profiler(self):
+        """(profiler.Profiler) Returns the profiler that steps are recorded in"""
+        return self._profiler
+
+    def set_journal(self, journal):
+        """Records every change to the world & the player's items in 'journal' (journal.Journal),
+        or stops recording changes if 'journal' is None"""
+        self._journal = journal
+
+    def _record(self, kind, **data):
+        """Records a change of 'kind' in the journal, if there is one"""
+        if self._journal is not None:
+            self._journal.record(kind, data)
+
+    def record_grids(self):
+        """Records the contents of the hotbar & inventory in the journal, if there is one
+
+        Should be called whenever their contents are changed from outside the session (e.g. when
+        items are moved around in a crafting window).
+        """
+        if self._journal is not None:
+            self._record("grids", hot_bar=dump_grid(self._hot_bar), selected=self._hot_bar.get_selected(),
+                         inventory=dump_grid(self._inventory))
+
+    def _record_block_at(self, x, y):
+        """Records the block in the grid cell at the position ('x', 'y') in the journal, if there is one"""
+        if self._journal is not None:
+            column, row = self._world.xy_to_grid(x, y)
+            block = self._world.get_block_at(column, row)
+            self._record("block", cell=[column, row], block=None if block is None else list(block.get_spec()))
+
+    def _record_item(self, kind, dropped_item):
+        """Records a (dropped) item being added to or removed from the world, in the journal if
+        there is one"""
+        if self._journal is not None:
+            self._record(kind, position=list(dropped_item.get_position()), item=dump_item(dropped_item.get_item()))
+
+    def replay(self, entries):
+        """Reapplies changes that were recorded in a journal (see read_journal)
+
+        Parameters:
+            entries (iterable<tuple<str, dict>>): The (kind, data) pairs of the changes, in order
+        """
+        self._target_stale = True
+
+        for kind, data in entries:
+            if kind == "block":
+                column, row = data["cell"]
+                block_id = None if data["block"] is None else tuple(data["block"])
+
+                if self._chunks is not None:
+                    self._chunks.set_cell(column, row, block_id)
+                else:
+                    block = self._world.get_block_at(column, row)
+                    if block is not None:
+                        self._world.remove_block(block)
+                    if block_id is not None:
+                        self._world.add_block_to_grid(create_block(*block_id), column, row)
+
+            elif kind == "item_added":
+                dropped_item = DroppedItem(load_item(data["item"]))
+                self._world.add_item(dropped_item, *data["position"])
+                if self._chunks is not None:
+                    self._chunks.park([dropped_item])
+
+            elif kind == "item_removed":
+                # Dropped items aren't identified, so remove the nearest one like it
+                x, y = data["position"]
+                spec = tuple(data["item"]["spec"])
+                candidates = [item for item in self._world.get_items(x, y, BLOCK_SIZE)
+                              if item.get_item().get_spec() == spec]
+
+                if candidates:
+                    nearest = min(candidates, key=lambda item: math.hypot(item.get_position()[0] - x,
+                                                                          item.get_position()[1] - y))
+                    self._world.remove_item(nearest)
+
+            elif kind == "grids":
+                load_grid(self._hot_bar, data["hot_bar"])
+                if data["selected"] is None:
+                    self._hot_bar.deselect()
+                else:
+                    self._hot_bar.select(tuple(data["selected"]))
+
+                load_grid(self._inventory, data["inventory"])
+
+            else:
+                raise KeyError(f"Unknown journal entry kind {kind}")
+
+    def get_world(self) -> World:
+        """(World) Returns the game world"""
+        return self._world
+
+    def get_player(self) -> Player:
+        """(Player) Returns the player"""
+        return self._player
+
+    def get_hot_bar(self) -> SelectableGrid:
+        """(SelectableGrid) Returns the player's hotbar"""
+        return self._hot_bar
+
+    def get_inventory(self) -> Grid:
+        """(Grid) Returns the player's inventory"""
+        return self._inventory
+
+    def get_chunk_manager(self) -> ChunkManager:
+        """(ChunkManager) Returns the manager of the world's chunks, or None if all blocks are loaded
+        up front"""
+        return self._chunks
+
+    def step(self):
+        """Advances the game by one step"""
+        if self._chunks is not None:
+            with self._profiler.span("chunks"):
+                self._chunks.update(*self._player.get_position())
+
+        self._world.update_lod(*self._player.get_position())
+
+        data = GameData(self._world, self._player)
+        self._world.step(data)
+        self.check_target()
+
+    def is_player_dead(self):
+        """(bool) Returns True iff the player has died"""
+        return self._player.get_health() <= 0
+
+    def move(self, dx, dy):
+        """ Change the player's velocity
+
+            Parameters:
+                dx(float): Change in x velocity
+                dy(float): Change in y velocity
+        """
+        velocity = self._player.get_velocity()
+        self._player.set_velocity((velocity.x + dx * 80, velocity.y + dy * 80))
+
+    def jump(self):
+        """ Player Action: Jump """
+        velocity = self._player.get_velocity()
+        self._player.set_velocity((velocity.x * 0.5, velocity.y - 250))
+
+    def get_target_position(self):
+        """(tuple<float, float>) Returns the (x, y) position the player is targeting"""
+        return self._target_position
+
+    def is_target_in_range(self):
+        """(bool) Returns True iff the target position is within range of the active item"""
+        self._resolve_target()
+        return self._target_in_range
+
+    def get_target_block(self):
+        """(Block) Returns the block at the target position, or None if there is no block there or
+        the target is out of range"""
+        self._resolve_target()
+        return self._target_block
+
+    def set_target(self, x, y):
+        """Targets the position ('x', 'y')
+
+        This is cheap enough to call for every mouse movement; the target is only resolved when
+        it's next needed (e.g. by step or attack_target), & only if it has changed.
+        """
+        if (x, y) != self._target_position:
+            self._target_position = x, y
+            self._target_stale = True
+
+    def _resolve_target(self):
+        """Resolves the target (see check_target), if it has changed since it was last resolved"""
+        if self._target_stale:
+            self.check_target()
+
+    def check_target(self):
+        """ Determine if cursor target in range, & select the target block. """
+        active_item, effective_item = self.get_holding()
+
+        pixel_range = active_item.get_attack_range() * self._world.get_cell_expanse()
+
+        self._target_in_range = positions_in_range(self._player.get_position(),
+                                                   self._target_position,
+                                                   pixel_range)
+
+        # select target block, if possible
+        self._target_block = self._world.get_block(*self._target_position) if self._target_in_range else None
+        self._target_stale = False
+
+    def get_holding(self):
+        """(Tuple<str, str>) Return the current active item and effective item in hotbar. """
+        active_stack = self._hot_bar.get_selected_value()
+        active_item = active_stack.get_item() if active_stack else self._hands
+
+        effective_item = active_item if active_item.can_attack() else self._hands
+
+        return active_item, effective_item
+
+    def attack_target(self):
+        """Attacks the target, mining the block & damaging the mobs at the target position
+        (i.e. the primary action, normally triggered by a left click)"""
+        self._resolve_target()
+        x, y = self._target_position
+
+        if self._target_in_range:
+            block = self._target_block
+            mobs = self._world.get_mobs(x, y, 1)
+            if block:
+                self.mine_block(block, x, y)
+            if mobs:
+                for mob in mobs:
+                    self.damage_mob(mob)
+
+    def mine_block(self, block, x, y):
+        """ Event: Player mining block.
+
+            Parameters:
+                block(BLOCK()): Block
+                x(float): x coordinate of block
+                y(float): y coordinate of block
+        """
+        luck = random.random()
+
+        active_item, effective_item = self.get_holding()
+
+        if self._target_in_range:
+
+            was_item_suitable, was_attack_successful = block.mine(effective_item, active_item, luck)
+
+            effective_item.attack(was_attack_successful)
+            if effective_item is not self._hands:
+                # i.e. a tool, which may have lost durability
+                self.record_grids()
+
+            if block.is_mined():
+                if self._player.get_food() > 0:
+                    self._player.change_food(change=-0.5)
+                    # Handle if the food becomes negative
+                    if self._player.get_food() < 0:
+                        self._player.change_food(change=-(self._player.get_food()))
+                else:
+                    self._player.change_health(change=-1)
+
+                drops = block.get_drops(luck, was_item_suitable)
+                self._world.remove_block(block)
+                self._record_block_at(x, y)
+                self._target_stale = True
+
+                if block.get_id() == 'hive':
+                    for i in range(5):
+                        self._world.add_mob(Bee("Bee", (9, 9)), x, y)
+
+                if not drops:
+                    return None
+
+                x0, y0 = block.get_position()
+
+                for i, (drop_category, drop_types) in enumerate(drops):
+                    log.emit(ItemDropped, drop_category, drop_types)
+
+                    if drop_category == "item":
+                        physical = DroppedItem(create_item(*drop_types))
+
+                        # this is so bleh
+                        x = x0 - BLOCK_SIZE // 2 + 5 + (i % 3) * 11 + random.randint(0, 2)
+                        y = y0 - BLOCK_SIZE // 2 + 5 + ((i // 3) % 3) * 11 + random.randint(0, 2)
+
+                        self._world.add_item(physical, x, y)
+                        self._record_item("item_added", physical)
+                    elif drop_category == "block":
+                        self._world.add_block(create_block(*drop_types), x, y)
+                        self._record_block_at(x, y)
+                    else:
+                        raise KeyError(f"Unknown drop category {drop_category}")
+        else:
+            return None
+
+    def damage_mob(self, mob):
+        """ Event: Attacking mob.
+
+            Parameter:
+                mob(Mob): Mob
+        """
+
+        luck = random.random()
+        active_item, effective_item = self.get_holding()
+
+        if self._target_in_range:
+
+            # Handle if Mob is Sheep
+            if mob.get_id() == 'Sheep':
+                x, y = mob.get_position()
+                physical = DroppedItem(create_item('wool'))
+                self._world.add_item(physical, x, y)
+                self._record_item("item_added", physical)
+                return None
+
+            if active_item in ATTACK_STRENGTH:
+                damage = -(ATTACK_STRENGTH[active_item])
+            else:
+                damage = -1
+            mob.change_health(damage)
+            log.emit(MobDamaged, -damage, mob)
+
+            if mob.is_dead():
+                drops = mob.get_drops(luck)
+
+                x0, y0 = mob.get_position()
+                if drops:
+                    for i, (drop_category, drop_types) in enumerate(drops):
+                        log.emit(ItemDropped, drop_category, drop_types)
+
+                        if drop_category == "item":
+                            physical = DroppedItem(create_item(*drop_types))
+
+                            x = x0 - BLOCK_SIZE // 2 + 5 + (i % 3) * 11 + random.randint(0, 2)
+                            y = y0 - BLOCK_SIZE // 2 + 5 + ((i // 3) % 3) * 11 + random.randint(0, 2)
+
+                            self._world.add_item(physical, x, y)
+                            self._record_item("item_added", physical)
+                        else:
+                            raise KeyError(f"Unknown drop category {drop_category}")
+                self._world.remove_thing(mob)
+
+    def use_target(self):
+        """Uses the thing at the target position, or places the active item there if there is
+        nothing to use (i.e. the secondary action, normally triggered by a right click)"""
+        x, y = self._target_position
+        target = self._world.get_thing(x, y)
+
+        if target:
+            # use this thing
+            effect = target.use()
+            log.emit(ThingUsed, target, effect)
+
+            if effect:
+                self.run_effect(effect)
+
+        else:
+            # place active item
+            selected = self._hot_bar.get_selected()
+
+            # (the selected slot may have been emptied, e.g. by placing its last item)
+            if not selected or self._hot_bar[selected] is None:
+                return
+
+            stack = self._hot_bar[selected]
+            drops = stack.get_item().place()
+
+            stack.subtract(1)
+
+            if stack.get_quantity() == 0:
+                # remove from hotbar
+                self._hot_bar[selected] = None
+
+            self.record_grids()
+
+            if not drops:
+                return
+
+            # handling multiple drops would be somewhat finicky, so prevent it
+            if len(drops) > 1:
+                raise NotImplementedError("Cannot handle dropping more than 1 thing")
+
+            drop_category, drop_types = drops[0]
+
+            if drop_category == "block":
+                if self._world.is_cell_free(*self._world.xy_to_grid(x, y)):
+                    self._world.add_block(create_block(drop_types[0]), x, y)
+                    self._record_block_at(x, y)
+                    self._target_stale = True
+                else:
+                    raise NotImplementedError(
+                        "Automatically placing a block nearby if the target cell is full is not yet implemented")
+
+            elif drop_category == "food":
+                strength = stack.get_item().get_strength()
+                # Update Player's Health
+                if self._player.get_food() < self._player._max_food:
+                    self._player.change_food(strength)
+                elif self._player.get_health() < self._player._max_health:
+                    self._player.change_health(strength)
+
+            elif drop_category == "effect":
+                self.run_effect(drop_types)
+
+            else:
+                raise KeyError(f"Unknown drop category {drop_category}")
+
+    def run_effect(self, effect):
+        """ Run an effect
+
+            Parameters:
+                effect(str): effect to be applied
+        """
+        if len(effect) == 2:
+            if effect[0] == "crafting":
+                craft_type = effect[1]
+
+                if craft_type == "basic":
+                    log.emit(CraftingStarted, craft_type, "Can't craft much on a 2x2 grid :/")
+
+                elif craft_type == "crafting_table":
+                    log.emit(CraftingStarted, craft_type, "Let's get our kraft® on! King of the brands")
+
+                elif craft_type == "furnace":
+                    log.emit(CraftingStarted, craft_type, "Time for some cooking.")
+
+                if self._on_crafting:
+                    self._on_crafting(craft_type)
+                return
+            elif effect[0] in ("food", "health"):
+                stat, strength = effect
+                log.emit(StatGained, stat, strength)
+                getattr(self._player, f"change_{stat}")(strength)
+                return
+
+        raise KeyError(f"No effect defined for {effect}")
+
+    def _handle_player_collide_item(self, player: Player, dropped_item: DroppedItem, data,
+                                    arbiter: pymunk.Arbiter):
+        """Callback to handle collision between the player and a (dropped) item. If the player has sufficient space in
+        their to pick up the item, the item is queued to be picked up at the end of the step (see _pick_up_items).
+
+        Parameters:
+            player (Player): The player that was involved in the collision
+            dropped_item (DroppedItem): The (dropped) item that the player collided with
+            data (dict): data that was added with this collision handler (see data parameter in
+                         World.add_collision_handler)
+            arbiter (pymunk.Arbiter): Data about a collision
+                                      (see http://www.pymunk.org/en/latest/pymunk.html#pymunk.Arbiter)
+                                      NOTE: you probably won't need this
+        Return:
+             bool: True, so that the collision stands until the item is picked up
+                   (more generally, collision callbacks return True iff the collision should be considered valid; i.e.
+                   returning False makes the world ignore the collision)
+        """
+
+        item = dropped_item.get_item()
+
+        if not (self._hot_bar.has_room_for(item) or self._inventory.has_room_for(item)):
+            log.emit(ItemsNotPickedUp, 1, item)
+            return True
+
+        self._world.queue_pickup(dropped_item)
+        return True
+
+    def _handle_player_touch_item(self, player: Player, dropped_item: DroppedItem, data,
+                                  arbiter: pymunk.Arbiter):
+        """Callback to handle each physics step in which the player & a (dropped) item touch. Items waiting to be
+        picked up are passed through, whereas those that weren't picked up (e.g. because the inventory filled up)
+        stay solid, until the player leaves them & touches them again (see _handle_player_collide_item).
+
+        Parameters:
+            See _handle_player_collide_item
+
+        Return:
+            bool: False iff the item is waiting to be picked up at the end of the step (i.e. ignore the collision)
+        """
+        return not self._world.is_queued_for_pickup(dropped_item)
+
+    def _pick_up_items(self, items_by_id):
+        """Pickup handler for the world; adds all the items picked up during a step to the hotbar, then
+        inventory, combining items of the same kind into stacks first
+
+        Parameters:
+            items_by_id (dict<str: list<DroppedItem>>): The queued (dropped) items, grouped by item id
+
+        Return:
+            list<DroppedItem>: The (dropped) items that were picked up
+        """
+        picked_up = []
+
+        for dropped_items in items_by_id.values():
+            max_stack_size = dropped_items[0].get_item().get_max_stack_size()
+
+            for start in range(0, len(dropped_items), max_stack_size):
+                batch = dropped_items[start:start + max_stack_size]
+                item = batch[0].get_item()
+
+                stack = Stack(item, len(batch))
+                added = {}
+
+                for name, grid in (("hotbar", self._hot_bar), ("inventory", self._inventory)):
+                    quantity = stack.get_quantity()
+                    stack = grid.add_items(stack)
+                    added[name] = quantity - (stack.get_quantity() if stack else 0)
+                    if not stack:
+                        break
+
+                for name, quantity in added.items():
+                    if quantity:
+                        log.emit(ItemsAdded, quantity, item, name)
+
+                count = len(batch) - (stack.get_quantity() if stack else 0)
+                if count < len(batch):
+                    log.emit(ItemsNotPickedUp, len(batch) - count, item)
+
+                picked_up.extend(batch[:count])
+
+        if picked_up:
+            for dropped_item in picked_up:
+                self._record_item("item_removed", dropped_item)
+            self.record_grids()
+
+        return picked_up
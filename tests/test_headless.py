@@ -0,0 +1,48 @@
+"""
+Tests for running the game without a user interface (see headless.py)
+"""
+
+__author__ = "Joel Foster"
+__date__ = "17/10/2026"
+__version__ = "1.1.0"
+__copyright__ = "The University of Queensland, 2019"
+
+import unittest
+
+from headless import HeadlessRunner, DEFAULT_SCRIPT
+from simulation import PHYSICS_TIMESTEP
+
+
+class HeadlessRunnerTest(unittest.TestCase):
+    def test_each_tick_simulates_one_timestep(self):
+        runner = HeadlessRunner(DEFAULT_SCRIPT, seed=1)
+        report = runner.run(6000)
+
+        self.assertEqual(runner.get_session().get_world()._substeps, 6000)
+        self.assertAlmostEqual(report["simulated_seconds"], 6000 * PHYSICS_TIMESTEP, places=6)
+
+    def test_timestep_is_passed_to_the_world(self):
+        runner = HeadlessRunner(DEFAULT_SCRIPT, seed=1, timestep=.5)
+        report = runner.run(100)
+
+        self.assertEqual(runner.get_session().get_world().get_timestep(), .5)
+        self.assertAlmostEqual(report["simulated_seconds"], 50)
+
+    def test_runs_are_reproducible(self):
+        first = HeadlessRunner(DEFAULT_SCRIPT, seed=1).run(600)
+        second = HeadlessRunner(DEFAULT_SCRIPT, seed=1).run(600)
+
+        self.assertEqual(first["player"], second["player"])
+        self.assertEqual(first["things"], second["things"])
+
+    def test_looped_script_runs_for_several_periods(self):
+        # Placing repeatedly empties the selected hotbar slot, which must not stop the run
+        runner = HeadlessRunner(DEFAULT_SCRIPT, seed=1, loop=True)
+        period = DEFAULT_SCRIPT[-1][0] + 1
+        report = runner.run(10 * period)
+
+        self.assertEqual(report["ticks"], 10 * period)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+Tests for dropping & picking up items (see GameSession._pick_up_items)
+"""
+
+__author__ = "Joel Foster"
+__date__ = "17/10/2026"
+__version__ = "1.1.0"
+__copyright__ = "The University of Queensland, 2019"
+
+import random
+import unittest
+
+from simulation import GameSession, SimulatedClock, PHYSICS_TIMESTEP
+from dropped_item import DroppedItem
+from item_creation import create_item
+
+
+class ItemTestCase(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        self._clock = SimulatedClock()
+        self._session = GameSession(clock=self._clock)
+        self._world = self._session.get_world()
+
+        # Let the player land
+        self.step(60)
+
+    def step(self, steps=1):
+        """Steps the game 'steps' times, each simulating one timestep"""
+        for _ in range(steps):
+            self._clock.advance(PHYSICS_TIMESTEP)
+            self._session.step()
+
+    def drop(self, item_id, quantity, x, y):
+        """Drops 'quantity' items of 'item_id' at ('x', 'y')"""
+        for _ in range(quantity):
+            self._world.add_item(DroppedItem(create_item(item_id)), x, y)
+
+    def count_dropped(self, item_id):
+        """(int) Returns the number of items of 'item_id' dropped in the world, including those in
+        unloaded chunks"""
+        _, document = self._session.dump_game()
+        return sum(1 for data in document["items"] if data["item"]["spec"] == [item_id])
+
+    def count_held(self, item_id):
+        """(int) Returns the number of items of 'item_id' in the hotbar & inventory"""
+        return sum(stack.get_quantity()
+                   for grid in (self._session.get_hot_bar(), self._session.get_inventory())
+                   for _, stack in grid.items()
+                   if stack and stack.get_item().get_id() == item_id)
+
+
+class PickUpTest(ItemTestCase):
+    def test_touching_items_are_picked_up(self):
+        held = self.count_held("dirt")
+
+        x, y = self._session.get_player().get_position()
+        self.drop("dirt", 3, x, y - 20)
+        self.step(30)
+
+        self.assertEqual(self.count_dropped("dirt"), 0)
+        self.assertEqual(self.count_held("dirt"), held + 3)
+
+    def test_items_that_dont_fit_stay_in_world(self):
+        # Fill every empty cell, so only the existing stacks of dirt have room for more
+        for grid in (self._session.get_hot_bar(), self._session.get_inventory()):
+            while grid.has_room_for(create_item("pickaxe", "wood")):
+                grid.add_item(create_item("pickaxe", "wood"))
+
+        held = self.count_held("dirt")
+        room = sum(stack.get_item().get_max_stack_size() - stack.get_quantity()
+                   for grid in (self._session.get_hot_bar(), self._session.get_inventory())
+                   for _, stack in grid.items()
+                   if stack and stack.get_item().get_id() == "dirt")
+
+        x, y = self._session.get_player().get_position()
+        self.drop("dirt", room + 3, x, y - 20)
+        self.step(30)
+
+        self.assertEqual(self.count_held("dirt"), held + room)
+        self.assertEqual(self.count_dropped("dirt"), 3)
+
+        # The items left over are solid, so land on the player, rather than falling through
+        self.step(30)
+        _, player_y = self._session.get_player().get_position()
+        for thing in self._world.get_dynamic_things():
+            if isinstance(thing, DroppedItem):
+                self.assertLess(thing.get_position()[1], player_y)
+
+
+class ChunkUnloadTest(ItemTestCase):
+    def move_player(self, x, y):
+        """Moves the player to ('x', 'y'), then steps the game so that chunks are loaded around it"""
+        body = self._session.get_player().get_shape().body
+        body.position = x, y
+        body.velocity = 0, 0
+        self.step(30)
+
+    def get_dropped_positions(self):
+        """(list<tuple<float, float>>) Returns the positions of the items dropped in loaded chunks"""
+        return sorted(thing.get_position() for thing in self._world.get_dynamic_things()
+                      if isinstance(thing, DroppedItem))
+
+    def test_items_are_kept_while_chunk_is_unloaded(self):
+        x, y = self._session.get_player().get_position()
+        self.drop("dirt", 5, x + 150, y - 40)
+        self.step(120)
+
+        held = self.count_held("dirt")
+        positions = self.get_dropped_positions()
+        self.assertEqual(len(positions), 5)
+
+        self.move_player(self._world.get_pixel_size()[0] - 200, y - 100)
+        self.assertEqual(self.get_dropped_positions(), [])
+        self.assertEqual(self.count_dropped("dirt"), 5)
+
+        # The items are put back where they were, on the ground they were left on
+        self.move_player(x, y - 100)
+        for position, expected in zip(self.get_dropped_positions(), positions):
+            self.assertAlmostEqual(position[0], expected[0], delta=1)
+            self.assertAlmostEqual(position[1], expected[1], delta=1)
+        self.assertEqual(self.count_held("dirt"), held)
+
+
+if __name__ == '__main__':
+    unittest.main()
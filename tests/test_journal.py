@@ -0,0 +1,135 @@
+"""
+Tests for journalling & recovering games (see journal.py)
+"""
+
+__author__ = "Joel Foster"
+__date__ = "17/10/2026"
+__version__ = "1.1.0"
+__copyright__ = "The University of Queensland, 2019"
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from simulation import GameSession, SimulatedClock
+from journal import Journal, read_journal
+
+
+def make_session(seed=0):
+    """(GameSession) Returns a new game session, with a deterministic world"""
+    random.seed(seed)
+    return GameSession(clock=SimulatedClock())
+
+
+def mine(session, x, y, max_hits=50):
+    """Attacks the block at (x, y) until it is mined"""
+    session.set_target(x, y)
+    block = session.get_target_block()
+
+    for _ in range(max_hits):
+        session.attack_target()
+        if session.get_target_block() is not block:
+            return
+
+    raise AssertionError(f"{block} at ({x}, {y}) wasn't mined")
+
+
+class JournalTestCase(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        self._journal_path = os.path.join(self._directory, "autosave.journal")
+        self._snapshot_path = os.path.join(self._directory, "autosave.ndsave")
+
+        # (cleanups run last first, so journals are closed before this)
+        self.addCleanup(shutil.rmtree, self._directory)
+
+    def make_journal(self):
+        """(Journal) Returns a journal writing to the test's temporary directory"""
+        journal = Journal(self._journal_path, self._snapshot_path)
+        self.addCleanup(journal.close)
+        return journal
+
+    def assertRecovers(self, session):
+        """Asserts that recovering from the journal reproduces the world & items of 'session'"""
+        recovered = make_session(seed=1)
+        recovered.recover(self._snapshot_path, self._journal_path)
+
+        chunks, document = session.dump_game()
+        recovered_chunks, recovered_document = recovered.dump_game()
+
+        self.assertEqual(dict(recovered_chunks), dict(chunks))
+        for key in ("hot_bar", "inventory"):
+            self.assertEqual(recovered_document[key], document[key])
+
+
+class JournalTest(JournalTestCase):
+    def test_recover_from_snapshot(self):
+        session = make_session()
+        journal = self.make_journal()
+        session.set_journal(journal)
+
+        journal.snapshot(*session.dump_game())
+        mine(session, 250, 300)
+
+        self.assertTrue(journal.flush(5))
+        self.assertTrue(read_journal(self._journal_path))
+        self.assertRecovers(session)
+
+    def test_recover_from_rebased_save(self):
+        path = os.path.join(self._directory, "game.ndsave")
+        saved = make_session()
+        mine(saved, 250, 300)
+        saved.save_game(path)
+
+        session = make_session(seed=1)
+        session.load_game(path)
+        journal = self.make_journal()
+        session.set_journal(journal)
+
+        # Loaded games start the journal from a copy of their save file, not a new snapshot
+        journal.rebase(path)
+        mine(session, 250, 325)
+
+        self.assertTrue(journal.flush(5))
+        self.assertRecovers(session)
+
+    def test_recover_after_write_failure(self):
+        # The autosave directory doesn't exist yet, so writing fails
+        directory = os.path.join(self._directory, "autosave")
+        self._journal_path = os.path.join(directory, "autosave.journal")
+        self._snapshot_path = os.path.join(directory, "autosave.ndsave")
+
+        session = make_session()
+        journal = self.make_journal()
+        session.set_journal(journal)
+
+        journal.snapshot(*session.dump_game())
+        mine(session, 250, 300)
+
+        self.assertFalse(journal.flush(5))
+        self.assertIsInstance(journal.get_error(), OSError)
+
+        # Nothing was lost, so everything is written once writing succeeds
+        os.mkdir(directory)
+        self.assertTrue(journal.flush(5))
+        self.assertIsNone(journal.get_error())
+        self.assertRecovers(session)
+
+    def test_writer_error_is_raised(self):
+        journal = Journal(self._journal_path, self._snapshot_path)
+
+        # Entries must be serialisable as JSON
+        journal.record("block", {"block": object()})
+
+        with self.assertRaises(TypeError):
+            journal.flush(5)
+        with self.assertRaises(TypeError):
+            journal.record("block", {})
+
+        journal.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+"""
+Tests for mobs (see mob.py & new_mobs.py)
+"""
+
+__author__ = "Joel Foster"
+__date__ = "17/10/2026"
+__version__ = "1.1.0"
+__copyright__ = "The University of Queensland, 2019"
+
+import random
+import unittest
+
+from simulation import BLOCK_SIZE
+from world import World
+from mob import Bird
+from new_mobs import Sheep
+
+
+def make_herd(mob_class, count):
+    """(list<Mob>) Returns 'count' mobs of 'mob_class', added to an empty world"""
+    random.seed(0)
+    world = World((32, 16), BLOCK_SIZE)
+    width, height = world.get_pixel_size()
+
+    mobs = []
+    for _ in range(count):
+        mob = mob_class(mob_class.__name__, (20, 20))
+        world.add_mob(mob, random.uniform(0, width), random.uniform(0, height))
+        mobs.append(mob)
+
+    return mobs
+
+
+class WanderTest(unittest.TestCase):
+    def test_wander_batch_matches_wander(self):
+        for mob_class in (Bird, Sheep):
+            with self.subTest(mob_class=mob_class.__name__):
+                mobs = make_herd(mob_class, 50)
+                random.seed(1)
+                for mob in mobs:
+                    mob.wander()
+                expected = [tuple(mob.get_velocity()) for mob in mobs]
+
+                mobs = make_herd(mob_class, 50)
+                random.seed(1)
+                mob_class.wander_batch(mobs)
+
+                self.assertEqual([tuple(mob.get_velocity()) for mob in mobs], expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
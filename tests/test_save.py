@@ -0,0 +1,159 @@
+"""
+Tests for saving & loading games (see save.py)
+"""
+
+__author__ = "Joel Foster"
+__date__ = "17/10/2026"
+__version__ = "1.1.0"
+__copyright__ = "The University of Queensland, 2019"
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+# (simulation is imported first, like the game's entry points, since save's imports are circular
+# when imported first)
+from simulation import GameSession, SimulatedClock
+from save import SaveFile, SaveError, write_save, HEADER
+from chunks import CHUNK_SIZE
+
+
+def make_session(seed=0):
+    """(GameSession) Returns a new game session, with a deterministic world"""
+    random.seed(seed)
+    return GameSession(clock=SimulatedClock())
+
+
+class SaveTestCase(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._directory)
+
+    def path(self, name):
+        """(str) Returns the path of a file named 'name' in the test's temporary directory"""
+        return os.path.join(self._directory, name)
+
+
+class SaveFileTest(SaveTestCase):
+    def test_round_trip(self):
+        chunks = [((0, 0), {(0, 0): ("dirt",), (3, 5): ("mayhem", 2)}),
+                  ((-1, 2), {(-CHUNK_SIZE, 2 * CHUNK_SIZE + 1): ("stone",)})]
+        path = self.path("round_trip.ndsave")
+
+        write_save(path, chunks, {"seed": 7})
+
+        with SaveFile(path) as save_file:
+            self.assertEqual(save_file.get_document(), {"seed": 7})
+            self.assertCountEqual(save_file.get_chunks(), [chunk for chunk, _ in chunks])
+            for chunk, cells in chunks:
+                self.assertEqual(save_file.read_chunk(chunk), cells)
+
+    def test_empty_file(self):
+        path = self.path("empty.ndsave")
+        open(path, "wb").close()
+
+        with self.assertRaises(SaveError):
+            SaveFile(path)
+
+    def test_not_a_save_file(self):
+        path = self.path("text.ndsave")
+        with open(path, "w") as file:
+            file.write("not a save file" * 10)
+
+        with self.assertRaises(SaveError):
+            SaveFile(path)
+
+    def test_truncated_files(self):
+        path = self.path("full.ndsave")
+        write_save(path, [((0, 0), {(1, 1): ("dirt",)})], {"seed": 7})
+
+        with open(path, "rb") as file:
+            data = file.read()
+
+        truncated_path = self.path("truncated.ndsave")
+        for length in (1, HEADER.size - 1, HEADER.size, HEADER.size + 10, len(data) - 1):
+            with self.subTest(length=length):
+                with open(truncated_path, "wb") as file:
+                    file.write(data[:length])
+
+                with self.assertRaises(SaveError):
+                    SaveFile(truncated_path)
+
+    def test_corrupt_document(self):
+        path = self.path("corrupt.ndsave")
+        write_save(path, [], {"seed": 7})
+
+        with open(path, "r+b") as file:
+            file.seek(-3, os.SEEK_END)
+            file.write(b"\xff\xfe{")
+
+        with self.assertRaises(SaveError):
+            SaveFile(path)
+
+
+class GameSaveTest(SaveTestCase):
+    def test_game_round_trip(self):
+        session = make_session()
+        for _ in range(30):
+            session.step()
+
+        # Mine into the ground, so the saved chunks differ from the generated ones
+        session.set_target(250, 300)
+        for _ in range(3):
+            session.attack_target()
+
+        path = self.path("game.ndsave")
+        session.save_game(path)
+        chunks, document = session.dump_game()
+
+        loaded = make_session(seed=1)
+        loaded.load_game(path)
+        loaded_chunks, loaded_document = loaded.dump_game()
+
+        self.assertEqual(dict(loaded_chunks), dict(chunks))
+        self.assertEqual(loaded_document, document)
+
+    def test_overwriting_loaded_game(self):
+        session = make_session()
+        session.set_target(250, 300)
+        for _ in range(3):
+            session.attack_target()
+
+        path = self.path("game.ndsave")
+        session.save_game(path)
+        chunks, document = session.dump_game()
+
+        # Chunks are read from the loaded file lazily, so must be read before it is overwritten,
+        # but not when saving elsewhere
+        loaded = make_session(seed=1)
+        loaded.load_game(path)
+        loaded.save_game(self.path("copy.ndsave"))
+        loaded.save_game(path)
+
+        for name in ("game.ndsave", "copy.ndsave"):
+            reloaded = make_session(seed=2)
+            reloaded.load_game(self.path(name))
+            reloaded_chunks, reloaded_document = reloaded.dump_game()
+
+            self.assertEqual(dict(reloaded_chunks), dict(chunks))
+            self.assertEqual(reloaded_document, document)
+
+    def test_loading_corrupt_game_leaves_game_unchanged(self):
+        path = self.path("empty.ndsave")
+        open(path, "wb").close()
+
+        session = make_session()
+        world = session.get_world()
+
+        with self.assertRaises(SaveError):
+            session.load_game(path)
+
+        self.assertIs(session.get_world(), world)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Tests for the game world's block grid (see world.py)
+"""
+
+__author__ = "Joel Foster"
+__date__ = "17/10/2026"
+__version__ = "1.1.0"
+__copyright__ = "The University of Queensland, 2019"
+
+import unittest
+
+# (simulation is imported first, like the game's entry points, since world's imports are
+# circular when imported first)
+import simulation
+from simulation import SimulatedClock
+from world import World, LOD_FREEZE_DISTANCE
+from dropped_item import DroppedItem
+from item_creation import create_block, create_item
+
+GRID_SIZE = (32, 16)
+CELL_EXPANSE = 20
+TIMESTEP = 1 / 60
+
+
+def make_world(merge_collisions, grid_size=GRID_SIZE, clock=None):
+    """(World) Returns a world with a few rows of terrain, & a gap in the top row"""
+    world = World(grid_size, CELL_EXPANSE, merge_collisions=merge_collisions, timestep=TIMESTEP,
+                  clock=clock if clock is not None else SimulatedClock())
+
+    columns, rows = grid_size
+    for column in range(columns):
+        for row in range(rows - 4, rows):
+            if (column, row) != (5, rows - 4):
+                world.add_block_to_grid(create_block("dirt"), column, row)
+
+    return world
+
+
+class WorldBlockTest(unittest.TestCase):
+    def test_things_in_rect_include_blocks(self):
+        for merge_collisions in (False, True):
+            with self.subTest(merge_collisions=merge_collisions):
+                world = make_world(merge_collisions)
+
+                # Cells (2, 12) to (7, 13), except the gap at (5, 12)
+                things = world.get_things_in_rect(2 * CELL_EXPANSE + 1, 12 * CELL_EXPANSE + 1,
+                                                  8 * CELL_EXPANSE - 1, 14 * CELL_EXPANSE - 1, ("block",))
+
+                cells = sorted(world.xy_to_grid(*block.get_position()) for block in things)
+                expected = sorted((column, row) for column in range(2, 8) for row in (12, 13)
+                                  if (column, row) != (5, 12))
+                self.assertEqual(cells, expected)
+
+    def test_remove_block_only_removes_block_in_its_cell(self):
+        for merge_collisions in (False, True):
+            with self.subTest(merge_collisions=merge_collisions):
+                world = make_world(merge_collisions)
+
+                old = world.get_block_at(3, 12)
+                world.add_block_to_grid(create_block("stone"), 3, 12)
+                new = world.get_block_at(3, 12)
+
+                # Removing the replaced block leaves the block that replaced it
+                world.remove_block(old)
+                world.step(None)
+                self.assertIs(world.get_block_at(3, 12), new)
+                self.assertIn(new, world.get_things_in_rect(*world.grid_to_xy(3, 12),
+                                                            *world.grid_to_xy(4, 13), ("block",)))
+                self.assertEqual(world.nearest_block("stone", *world.grid_to_xy_centre(3, 12), 100), new)
+
+
+class LevelOfDetailTest(unittest.TestCase):
+    def setUp(self):
+        self._clock = SimulatedClock()
+        self._world = make_world(True, grid_size=(128, 16), clock=self._clock)
+
+    def step(self, seconds):
+        """Steps the world for 'seconds' simulated seconds"""
+        for _ in range(round(seconds / TIMESTEP)):
+            self._clock.advance(TIMESTEP)
+            self._world.step(None)
+
+    def test_far_things_are_only_frozen_at_rest(self):
+        item = DroppedItem(create_item("dirt"))
+        self._world.add_item(item, LOD_FREEZE_DISTANCE + 200, 20)
+
+        # Still falling, so isn't frozen mid-air
+        self._world.update_lod(0, 20, force=True)
+        self.step(5)
+        _, y = item.get_position()
+        self.assertGreater(y, 200)
+
+        # At rest on the ground, so is frozen
+        self._world.update_lod(0, 20, force=True)
+        self.assertNotIn(item, self._world.get_entities("item"))
+
+        # Woken when the ground beneath it is removed
+        column, row = self._world.xy_to_grid(*item.get_position())
+        self._world.remove_block(self._world.get_block_at(column, row + 1))
+        self.assertIn(item, self._world.get_entities("item"))
+
+
+if __name__ == '__main__':
+    unittest.main()
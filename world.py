@@ -16,6 +16,9 @@ from player import Player
 from dropped_item import DroppedItem
 from block import Block
 from mob import Mob
+from chunks import CHUNK_SIZE, chunk_of
+from ai_scheduler import AIScheduler, AI_STEP_BUDGET
+from profiler import NULL_PROFILER
 
 # The intention with the following constants is to express a finite range of values that
 # can effectively be treated as their own type in this code. We have used collections of
@@ -47,6 +50,33 @@ PHYSICAL_THING_CATEGORIES = {
 # Names for each collision event recognised by pymunk (can have a callback attached)
 COLLISION_HANDLER_CALLBACKS = {'begin', 'separate', 'pre_solve', 'post_solve'}
 
+# The width/height (in grid cells) of the square buckets used to index blocks by their id
+BLOCK_BUCKET_SPAN = 8
+
+# Bodies moving slower than this (in pixels per second) for this long (in seconds) fall asleep,
+# i.e. are no longer simulated until something wakes them (e.g. a collision)
+IDLE_SPEED_THRESHOLD = 5
+SLEEP_TIME_THRESHOLD = .5
+
+# Level of detail (see World.update_lod):
+# Entities beyond this distance (in pixels) from the focus are stepped & think at a reduced rate
+# (their bodies are still simulated by pymunk at the full rate)
+LOD_NEAR_DISTANCE = 400
+# Entities beyond this distance are frozen (i.e. not stepped at all), once asleep
+LOD_FREEZE_DISTANCE = 1000
+# Entities at a reduced rate have their step method called (& think) this many times less often
+LOD_REDUCED_RATE = 4
+# The number of calls to World.update_lod between each reassignment of levels of detail
+LOD_UPDATE_INTERVAL = 15
+
+# Accumulated time within this fraction of a timestep of a whole substep counts as a whole substep,
+# so that floating point error in the clock can't delay (or drop) a substep
+TIMESTEP_TOLERANCE = 1e-6
+
+# (column, row) offsets to the grid cells that share an edge/corner with a cell
+NEIGHBOUR_OFFSETS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+DIAGONAL_NEIGHBOUR_OFFSETS = ((1, -1), (1, 1), (-1, 1), (-1, -1))
+
 
 class World:
     """Game world that contains things in physical space.
@@ -66,7 +96,8 @@ class World:
     """
 
     def __init__(self, grid_size, cell_expanse, gravity=(0, 300), boundary_thickness=50,
-                 collision_types=None, thing_categories=None):
+                 collision_types=None, thing_categories=None, timestep=None, max_substeps=8, clock=time.time,
+                 merge_collisions=False, ai_budget=AI_STEP_BUDGET, sleeping=True, profiler=None):
         """Creates a new world with four boundary walls
 
         Parameters:
@@ -80,7 +111,20 @@ class World:
             thing_categories (dict<str: int>):
                     Mapping of thing categories to unique powers of 2
                     Defaults to PHYSZICAL_THING_CATEGORIES constant
-
+            timestep (float): The fixed size (in seconds) of each simulation substep,
+                              or None to simulate each step with the real time elapsed
+            max_substeps (int): The maximum number of fixed substeps simulated per step
+            clock (callable): Returns the current time in seconds; defaults to time.time
+                              (a simulated clock can be supplied to step deterministically)
+            merge_collisions (bool): If True, blocks are not given their own collision shapes; instead,
+                                     each run of adjacent blocks in a row of a chunk shares one
+                                     (see _rebuild_collision_runs)
+            ai_budget (float): The maximum time (in seconds) mobs may spend thinking per substep,
+                               or None for no limit (see ai_scheduler.AIScheduler)
+            sleeping (bool): If True, idle bodies fall asleep (see IDLE_SPEED_THRESHOLD); must be
+                             True for entities to be frozen by update_lod
+            profiler (profiler.Profiler): Records the time spent in each part of a step,
+                                          or None not to profile (see set_profiler)
         """
         if collision_types is None:
             collision_types = COLLISION_TYPES
@@ -94,16 +138,70 @@ class World:
 
         self._space.gravity = gravity
 
+        self._sleeping = sleeping
+        if sleeping:
+            self._space.idle_speed_threshold = IDLE_SPEED_THRESHOLD
+            self._space.sleep_time_threshold = SLEEP_TIME_THRESHOLD
+
         self._grid_size = grid_size
         self._cell_expanse = cell_expanse
 
         self._pixel_size = tuple(grid * cell_expanse for grid in grid_size)
 
+        # Index of the block in each grid cell of each chunk that has blocks, or None if the cell is empty
+        # Maps (chunk column, chunk row) -> list of CHUNK_SIZE * CHUNK_SIZE blocks, in row-major order
+        # Storage is only allocated for chunks as blocks are added to them, so memory depends on the
+        # chunks that are loaded, not on the size of the world (see chunks.ChunkManager)
+        self._chunks = {}
+
+        # Uniform-grid bucket index of the cells occupied by each kind of block
+        # Maps block id -> (bucket column, bucket row) -> set of (column, row) cells
+        self._block_buckets = {}
+
         self._create_boundaries(boundary_thickness)
 
-        self._last_time = time.time()
+        self._clock = clock
+        self._last_time = clock()
+
+        # Real time that has elapsed but is yet to be simulated (only used with a fixed timestep)
+        self._accumulator = 0.
+        self.set_timestep(timestep, max_substeps)
+
+        # Total time (in seconds) simulated so far (see get_simulated_time)
+        self._simulated_time = 0.
 
-        self._player = None
+        # Registries of the things that are stepped each simulation step, by collision type name
+        # (e.g. "mob"); each registry is a dict used as an insertion-ordered set
+        # Blocks & boundary walls never need stepping, so are never registered
+        self._collision_type_names = {number: name for name, number in self._collision_types.items()}
+        self._entities = {"player": {}, "mob": {}, "item": {}}
+
+        # Decides which mobs think (see Mob.think) on each substep
+        self._ai_scheduler = AIScheduler(ai_budget)
+
+        self.set_profiler(profiler)
+
+        # Level of detail (see update_lod)
+        # Maps entities stepped at a reduced rate -> the substep (modulo LOD_REDUCED_RATE) they are stepped on
+        self._reduced_entities = {}
+        # Entities that are frozen, & so have been removed from their registry (used as an ordered set)
+        self._frozen_entities = {}
+        self._substeps = 0
+        self._lod_countdown = 0
+
+        # (column, row) positions of grid cells whose block has changed since last checked
+        self._dirty_cells = set()
+
+        # Dropped items waiting to be picked up at the end of the current step (see queue_pickup)
+        # Used as an insertion-ordered set, so an item queued twice is only picked up once
+        self._pickup_queue = {}
+        self._pickup_handler = None
+
+        # Merged collision shapes for each row of each chunk (only used when merging collisions)
+        # Maps ((chunk column, chunk row), row) -> list of pymunk.Poly, one per run of adjacent blocks
+        self._merge_collisions = merge_collisions
+        self._collision_runs = {}
+        self._stale_collision_runs = set()
 
     def _create_boundaries(self, thickness):
         """Create boundary walls of given 'thickness'"""
@@ -149,34 +247,215 @@ class World:
         """Returns the expanse (width/height) of each grid cell"""
         return self._cell_expanse
 
+    def set_timestep(self, timestep, max_substeps=8):
+        """Sets the fixed simulation timestep
+
+        With a fixed timestep, the real time elapsed between steps is accumulated & simulated in
+        substeps of exactly 'timestep' seconds, so the simulation is independent of the frame rate.
+        If more than 'max_substeps' substeps are due in a single step, the excess time is dropped,
+        rather than allowing slow steps to compound into ever slower steps.
+
+        Parameters:
+            timestep (float): The size (in seconds) of each substep, or None to simulate each step
+                              with the real time elapsed
+            max_substeps (int): The maximum number of substeps simulated per step
+        """
+        if timestep is not None and timestep <= 0:
+            raise ValueError(f"Timestep must be positive, not {timestep}")
+
+        if max_substeps < 1:
+            raise ValueError(f"Must allow at least 1 substep per step, not {max_substeps}")
+
+        self._timestep = timestep
+        self._max_substeps = max_substeps
+        self._accumulator = 0.
+
+    def set_profiler(self, profiler):
+        """Records the time spent stepping the world, its entities & physics in 'profiler'
+        (profiler.Profiler), or stops recording if 'profiler' is None"""
+        self._profiler = NULL_PROFILER if profiler is None else profiler
+
+    def get_profiler(self):
+        """(profiler.Profiler) Returns the profiler that steps are recorded in"""
+        return self._profiler
+
+    def get_timestep(self):
+        """(float) Returns the fixed simulation timestep, or None if the timestep is not fixed"""
+        return self._timestep
+
+    def get_simulated_time(self) -> float:
+        """(float) Returns the total time (in seconds) that has been simulated, which is less than the
+        real time elapsed if substeps have been dropped (see set_timestep)"""
+        return self._simulated_time
+
+    def get_interpolation_alpha(self) -> float:
+        """(float) Returns how far between the last simulated substep & the next substep real time
+        is, as a fraction in [0, 1)
+
+        Renderers can use this to interpolate positions between substeps. Always 0 when the timestep
+        is not fixed.
+        """
+        if self._timestep is None:
+            return 0.
+        return self._accumulator / self._timestep
+
     def step(self, game_data):
         """Steps the game world forward by one time step
 
-        1. Advances all things in the game world forward by one time step
-            step method is called on each thing, with:
-                - time_delta: the time (in seconds) since the last step
+        With a fixed timestep (see set_timestep), the real time since the last step is simulated in
+        zero or more fixed substeps, each of which performs the following. Otherwise, the following
+        is performed once, with the real time since the last step.
+
+        1. Lets the mobs that are due think (see ai_scheduler.AIScheduler)
+        2. Advances all entities (i.e. players, mobs & items) forward by one time step
+            step method is called on each entity, with:
+                - time_delta: the time (in seconds) being simulated
                 - game_data: the game_data parameter supplied to this method
-        2. Applies/resolves physics
+        3. Applies/resolves physics
+
+        Finally, all items queued for pickup during the step are picked up in a single batch
+        (see queue_pickup).
 
         Parameters:
             game_data (app.GameData): Arbitrary data to be passed on to all things
         """
-        now = time.time()
-        time_delta = now - self._last_time
-        for shape in self._space.shapes:
-            thing = shape.object
+        with self._profiler.span("world.step"):
+            self._step(game_data)
 
-            if thing:
-                if thing.get_id() == 'Player':
-                    self._player = thing
-                if thing.get_id() == 'Bee':
-                    thing.step(time_delta, game_data, self, self._player)
-                else:
-                    thing.step(time_delta, game_data)
-
-        self._space.step(time_delta)
+    def _step(self, game_data):
+        """Steps the game world forward by one time step (see step)"""
+        self._rebuild_collision_runs()
+
+        now = self._clock()
+        time_delta = now - self._last_time
         self._last_time = now
 
+        if self._timestep is None:
+            self._simulate(time_delta, game_data)
+        else:
+            self._accumulator += time_delta
+
+            substeps = 0
+            while self._accumulator >= self._timestep * (1 - TIMESTEP_TOLERANCE):
+                if substeps == self._max_substeps:
+                    # Too far behind to catch up; drop the whole steps that couldn't be simulated
+                    self._accumulator %= self._timestep
+                    break
+
+                self._simulate(self._timestep, game_data)
+                self._accumulator -= self._timestep
+                substeps += 1
+
+        self._pick_up_items()
+
+    def _simulate(self, time_delta, game_data):
+        """Advances all things & physics in the game world by 'time_delta' seconds
+
+        Parameters:
+            time_delta (float): The time (in seconds) to simulate
+            game_data (app.GameData): Arbitrary data to be passed on to all things
+        """
+        profiler = self._profiler
+        self._simulated_time += time_delta
+
+        with profiler.span("ai"):
+            self._ai_scheduler.run(game_data)
+
+        phase = self._substeps % LOD_REDUCED_RATE
+        self._substeps += 1
+
+        reduced = self._reduced_entities
+
+        with profiler.span("entities"):
+            for registry in self._entities.values():
+                # Copied, since stepping a thing may add or remove others
+                for thing in tuple(registry):
+                    # (only the thing's own step is reduced; its body is still simulated below)
+                    if thing not in reduced:
+                        thing.step(time_delta, game_data)
+                    elif reduced[thing] == phase:
+                        thing.step(time_delta * LOD_REDUCED_RATE, game_data)
+
+        with profiler.span("physics"):
+            self._space.step(time_delta)
+
+    def update_lod(self, x: float, y: float, force: bool = False):
+        """Assigns each mob & item a level of detail, by its distance from the point ('x', 'y')
+        (usually the player's position):
+            - within LOD_NEAR_DISTANCE: stepped & think at the full rate
+            - within LOD_FREEZE_DISTANCE: stepped & think LOD_REDUCED_RATE times less often; only
+              this Python-side work is reduced, as their bodies are still simulated by pymunk at
+              the full rate (until they fall asleep)
+            - further: frozen once pymunk has put them to sleep (i.e. they are at rest); neither
+              stepped nor think until thawed. Until then, they are kept at the reduced rate, so
+              that things that are falling or flying aren't left hanging mid-air
+        Frozen things are thawed (i.e. woken) as soon as the point comes within range again, or
+        when something wakes them (see wake_things_near).
+
+        Levels are only reassigned every LOD_UPDATE_INTERVAL calls, so this can be called every step.
+
+        Parameters:
+            x (float): The x-coordinate of the focus
+            y (float): The y-coordinate of the focus
+            force (bool): If True, levels are reassigned immediately
+        """
+        if not force and self._lod_countdown > 0:
+            self._lod_countdown -= 1
+            return
+        self._lod_countdown = LOD_UPDATE_INTERVAL
+
+        near = LOD_NEAR_DISTANCE ** 2
+        freeze = LOD_FREEZE_DISTANCE ** 2
+
+        # Only frozen things near the focus need checking, so the cost of this is proportional to the
+        # number of active entities, rather than the total population
+        distance = LOD_FREEZE_DISTANCE
+        for thing in self.get_things_in_rect(x - distance, y - distance, x + distance, y + distance, ("mob", "item")):
+            if thing in self._frozen_entities:
+                self._thaw(thing)
+
+        for name in ("mob", "item"):
+            for thing in tuple(self._entities[name]):
+                thing_x, thing_y = thing.get_position()
+                distance = (thing_x - x) ** 2 + (thing_y - y) ** 2
+
+                if distance >= freeze and thing.get_shape().body.is_sleeping:
+                    self._freeze(thing)
+                elif distance >= near:
+                    if thing not in self._reduced_entities:
+                        self._reduced_entities[thing] = len(self._reduced_entities) % LOD_REDUCED_RATE
+                        self._ai_scheduler.set_interval_scale(thing, LOD_REDUCED_RATE)
+                elif thing in self._reduced_entities:
+                    del self._reduced_entities[thing]
+                    self._ai_scheduler.set_interval_scale(thing, 1)
+
+    def _freeze(self, thing: PhysicalThing):
+        """Stops stepping 'thing', which must be asleep, until thawed"""
+        if not self._sleeping:
+            return
+
+        self._unregister_entity(thing)
+        self._frozen_entities[thing] = None
+
+    def _thaw(self, thing: PhysicalThing):
+        """Wakes 'thing' after it was frozen, & resumes stepping it"""
+        del self._frozen_entities[thing]
+        self._register_entity(thing)
+        thing.get_shape().body.activate()
+
+    def wake_things_near(self, x: float, y: float, distance: float):
+        """Wakes all sleeping things within 'distance' of the point ('x', 'y') (in each axis)
+
+        Frozen things (see update_lod) are thawed, so that they are stepped while they move, &
+        frozen again once they are back at rest.
+        """
+        for thing in self.get_things_in_rect(x - distance, y - distance, x + distance, y + distance,
+                                             ("player", "mob", "item")):
+            if thing in self._frozen_entities:
+                self._thaw(thing)
+            else:
+                thing.get_shape().body.activate()
+
     def xy_to_grid(self, x: float, y: float) -> Tuple[int, int]:
         """Converts pixel position (xy) to grid position"""
         return int(x // self._cell_expanse), int(y // self._cell_expanse)
@@ -189,6 +468,67 @@ class World:
         """Converts grid position to pixel position of its centre"""
         return int((x + .5) * self._cell_expanse), int((y + .5) * self._cell_expanse)
 
+    def is_in_grid(self, column: int, row: int) -> bool:
+        """(bool) Returns True iff ('column', 'row') is a cell on this world's grid"""
+        columns, rows = self._grid_size
+        return 0 <= column < columns and 0 <= row < rows
+
+    def mark_cell_dirty(self, column: int, row: int):
+        """Marks the grid cell at ('column', 'row') as changed
+
+        Blocks added to or removed from the grid are marked automatically; this only needs to
+        be called when a block's appearance changes in place (e.g. a TrickCandleFlameBlock
+        changing stage without being replaced)
+        """
+        self._dirty_cells.add((column, row))
+
+    def pop_dirty_cells(self):
+        """(set<tuple<int, int>>) Returns the (column, row) positions of all grid cells that have
+        changed since this method was last called, and clears them"""
+        dirty_cells = self._dirty_cells
+        self._dirty_cells = set()
+        return dirty_cells
+
+    def set_pickup_handler(self, handler):
+        """Sets the handler that picks up the items queued by queue_pickup
+
+        Parameters:
+            handler (callable): Called once per step (if any items were queued) with a
+                                dict<str: list<DroppedItem>> of the queued items, grouped by their
+                                item id. Returns the DroppedItems that were picked up, which are
+                                then removed from the world.
+        """
+        self._pickup_handler = handler
+
+    def queue_pickup(self, dropped_item: DroppedItem):
+        """Queues 'dropped_item' to be picked up at the end of the current step
+
+        Intended for use in collision callbacks, so that the items collected during a step are
+        added to the inventory & removed from the space together, rather than one at a time.
+        """
+        self._pickup_queue[dropped_item] = None
+
+    def is_queued_for_pickup(self, dropped_item: DroppedItem):
+        """(bool) Returns True iff 'dropped_item' is waiting to be picked up at the end of the step"""
+        return dropped_item in self._pickup_queue
+
+    def _pick_up_items(self):
+        """Passes all queued items to the pickup handler, then removes those that were picked up"""
+        if not self._pickup_queue:
+            return
+
+        queue = self._pickup_queue
+        self._pickup_queue = {}
+
+        if self._pickup_handler is None:
+            return
+
+        items_by_id = {}
+        for dropped_item in queue:
+            items_by_id.setdefault(dropped_item.get_item().get_id(), []).append(dropped_item)
+
+        self.remove_things(self._pickup_handler(items_by_id))
+
     def _wrap_callback(self, callback):
         """Wraps a pymunk collision callback into a more OOP form"""
 
@@ -229,6 +569,26 @@ class World:
             if thing:
                 yield thing
 
+        if self._merge_collisions:
+            for cells in self._chunks.values():
+                for block in cells:
+                    if block is not None:
+                        yield block
+
+    def get_dynamic_things(self) -> Iterable[PhysicalThing]:
+        """Yields all physical things in this world that are attached to their own (non-static) body,
+        i.e. everything except blocks & boundary walls
+
+        Yield:
+            PhysicalThing
+        """
+        for body in self._space.bodies:
+            for shape in body.shapes:
+                thing = shape.object
+
+                if thing:
+                    yield thing
+
     def add_thing(self, thing: PhysicalThing, x: float, y: float, size: Tuple[float, float], collision_type=None,
                   categories=None, mass: float = 1, friction: float = 1):
         """Adds a thing to the game world centred at the position ('x', 'y')
@@ -266,10 +626,68 @@ class World:
 
         thing.set_shape(shape)
         self._space.add(body, shape)
+        self._register_entity(thing)
+
+    def _register_entity(self, thing: PhysicalThing):
+        """Adds 'thing' to the registry for its collision type, so that it is stepped"""
+        name = self._collision_type_names.get(thing.get_shape().collision_type, "other")
+        self._entities.setdefault(name, {})[thing] = None
+
+        if name == "mob":
+            self._ai_scheduler.add(thing)
+
+    def _unregister_entity(self, thing: PhysicalThing):
+        """Removes 'thing' from the registry it was added to by _register_entity, if any"""
+        for registry in self._entities.values():
+            registry.pop(thing, None)
+
+        self._reduced_entities.pop(thing, None)
+        self._frozen_entities.pop(thing, None)
+        self._ai_scheduler.remove(thing)
+
+    def get_ai_scheduler(self) -> AIScheduler:
+        """(AIScheduler) Returns the scheduler that decides which mobs think on each substep"""
+        return self._ai_scheduler
+
+    def get_entities(self, collision_type: str):
+        """(list<PhysicalThing>) Returns all active (i.e. not frozen; see update_lod) entities of
+        'collision_type' (e.g. "mob") in the world"""
+        return list(self._entities.get(collision_type, ()))
 
     def remove_thing(self, thing: PhysicalThing):
         """Removes a thing from the world"""
-        self._space.remove(thing.get_shape())
+        self.remove_things((thing,))
+
+    def restore_things(self, things: Iterable[PhysicalThing]):
+        """Adds things that were removed by remove_things back into the world, in the same state
+        (e.g. position & velocity) they were removed in"""
+        added = []
+
+        for thing in things:
+            shape = thing.get_shape()
+            added.append(shape)
+
+            if shape.body.body_type != pymunk.Body.STATIC:
+                added.append(shape.body)
+                self._register_entity(thing)
+
+        if added:
+            self._space.add(*added)
+
+    def remove_things(self, things: Iterable[PhysicalThing]):
+        """Removes many things from the world at once"""
+        removed = []
+
+        for thing in things:
+            shape = thing.get_shape()
+            removed.append(shape)
+
+            if shape.body.body_type != pymunk.Body.STATIC:
+                removed.append(shape.body)
+                self._unregister_entity(thing)
+
+        if removed:
+            self._space.remove(*removed)
 
     def add_player(self, player: Player, x: float, y: float, mass: float = 50, friction: float = .5):
         """Adds a player to game world at the position ('x', 'y')"""
@@ -287,10 +705,12 @@ class World:
         player.set_shape(shape)
 
         self._space.add(body, shape)
+        self._register_entity(player)
 
     def remove_player(self, player: Player):
         """Removes the player from the game world"""
         self._space.remove(player.get_shape())
+        self._unregister_entity(player)
 
     def add_block_to_grid(self, block: Block, column: int, row: int, friction: float = 1.):
         """Adds a block to the game world at the grid cell centred at ('column', 'row')
@@ -300,7 +720,17 @@ class World:
             column (int): The column of the grid cell at which to place the block
             row (int): The row of the grid cell at which to place the block
             friction (float): The friction on the surface of the block
+
+        Raises:
+            ValueError: if ('column', 'row') is not a cell on this world's grid
         """
+        if not self.is_in_grid(column, row):
+            raise ValueError(f"Cannot add {block} at ({column}, {row}); not on {self._grid_size} grid")
+
+        chunk = chunk_of(column, row)
+        cells = self._chunks.get(chunk)
+        if cells is None:
+            cells = self._chunks[chunk] = [None] * (CHUNK_SIZE * CHUNK_SIZE)
 
         left = column * self._cell_expanse
         right = (column + 1) * self._cell_expanse
@@ -316,7 +746,24 @@ class World:
         shape.filter = pymunk.ShapeFilter(categories=self._thing_categories["block"])
 
         block.set_shape(shape)
-        self._space.add(shape)
+
+        index = (row % CHUNK_SIZE) * CHUNK_SIZE + column % CHUNK_SIZE
+
+        existing = cells[index]
+        if existing is not None:
+            self._unindex_block(existing, column, row)
+            self._remove_block_shapes({(column, row): existing})
+
+        if self._merge_collisions:
+            # The shape isn't simulated, but still gives the block its position & bounding box
+            shape.cache_bb()
+            self._stale_collision_runs.add((chunk, row))
+        else:
+            self._space.add(shape)
+
+        cells[index] = block
+        self._index_block(block, column, row)
+        self._dirty_cells.add((column, row))
 
     def add_block(self, block: Block, x: float, y: float, *args, **kwargs):
         """Adds a block to the game world at the grid cell that contains ('x', 'y')
@@ -334,16 +781,222 @@ class World:
         """(Block) Returns a block on the point ('x', 'y'), or None if there is no block there
 
         Note: It is technically possible for multiple blocks to overlap, in which case
-              this method will return one of those. This should never happen, though.
+              this method will return the one most recently added. This should never happen, though.
+        """
+        return self.get_block_at(*self.xy_to_grid(x, y))
+
+    def get_block_at(self, column: int, row: int):
+        """(Block) Returns the block in the grid cell at ('column', 'row'), or None if the cell is
+        empty, not loaded or not on the grid"""
+        cells = self._chunks.get((column // CHUNK_SIZE, row // CHUNK_SIZE))
+        if cells is None:
+            return None
+
+        return cells[(row % CHUNK_SIZE) * CHUNK_SIZE + column % CHUNK_SIZE]
+
+    def is_cell_free(self, column: int, row: int) -> bool:
+        """(bool) Returns True iff ('column', 'row') is a cell on the grid that has no block in it"""
+        return self.is_in_grid(column, row) and self.get_block_at(column, row) is None
+
+    def get_loaded_chunks(self):
+        """(list<tuple<int, int>>) Returns the (chunk column, chunk row) of each chunk with blocks
+        in it (see chunks.CHUNK_SIZE)"""
+        return list(self._chunks)
+
+    def get_chunk_blocks(self, chunk):
+        """(dict<tuple<int, int>: Block>) Returns the blocks in 'chunk', keyed by their (column, row)
+        grid cell"""
+        cells = self._chunks.get(chunk, ())
+        chunk_column, chunk_row = chunk
+
+        blocks = {}
+        for index, block in enumerate(cells):
+            if block is not None:
+                row, column = divmod(index, CHUNK_SIZE)
+                blocks[chunk_column * CHUNK_SIZE + column, chunk_row * CHUNK_SIZE + row] = block
+
+        return blocks
+
+    def unload_chunk(self, chunk):
+        """Removes all blocks in 'chunk' from the world at once
+
+        Return:
+            dict<tuple<int, int>: Block>: The removed blocks, keyed by their (column, row) grid cell
+        """
+        blocks = self.get_chunk_blocks(chunk)
+
+        for (column, row), block in blocks.items():
+            self._unindex_block(block, column, row)
+
+        self._dirty_cells.update(blocks)
+
+        self._chunks.pop(chunk, None)
+        self._remove_block_shapes(blocks)
+
+        return blocks
+
+    def _remove_block_shapes(self, blocks):
+        """Removes the collision shapes of blocks from the space
+
+        Parameters:
+            blocks (dict<tuple<int, int>: Block>): The blocks, keyed by their (column, row) grid cell
+        """
+        if not self._merge_collisions:
+            self.remove_things(blocks.values())
+            return
+
+        for column, row in blocks:
+            self._stale_collision_runs.add((chunk_of(column, row), row))
+
+    def _rebuild_collision_runs(self):
+        """Replaces the merged collision shapes of each row of a chunk whose blocks have changed
+
+        Each run of horizontally adjacent blocks in the row gets a single shape, which has no
+        thing attached (i.e. its object is None); blocks themselves are found via the grid index.
+        """
+        if not self._stale_collision_runs:
+            return
+
+        removed = []
+        added = []
+
+        for chunk, row in self._stale_collision_runs:
+            removed.extend(self._collision_runs.pop((chunk, row), ()))
+
+            cells = self._chunks.get(chunk)
+            if cells is None:
+                continue
+
+            offset = (row % CHUNK_SIZE) * CHUNK_SIZE
+            first_column = chunk[0] * CHUNK_SIZE
+
+            shapes = []
+            start = None
+
+            for i in range(CHUNK_SIZE + 1):
+                block = cells[offset + i] if i < CHUNK_SIZE else None
+
+                if block is not None and start is None:
+                    start = i
+                    friction = block.get_shape().friction
+                elif block is None and start is not None:
+                    shapes.append(self._create_collision_run(first_column + start, first_column + i, row, friction))
+                    start = None
+
+            if shapes:
+                self._collision_runs[chunk, row] = shapes
+                added.extend(shapes)
+
+        self._stale_collision_runs = set()
+
+        if removed:
+            self._space.remove(*removed)
+        if added:
+            self._space.add(*added)
+
+    def _create_collision_run(self, start_column, end_column, row, friction):
+        """(pymunk.Poly) Creates a static shape covering the cells in 'row' from 'start_column' up to
+        (but excluding) 'end_column'"""
+        left, top = self.grid_to_xy(start_column, row)
+        right, bottom = self.grid_to_xy(end_column, row + 1)
+
+        shape = pymunk.Poly(self._space.static_body, [(left, top), (left, bottom), (right, bottom), (right, top)])
+        shape.object = None
+        shape.friction = friction
+        shape.collision_type = self._collision_types['block']
+        shape.filter = pymunk.ShapeFilter(categories=self._thing_categories["block"])
+
+        return shape
+
+    def get_neighbours(self, column: int, row: int, diagonal: bool = False):
+        """Yields the grid cells adjacent to ('column', 'row'), along with their block
+
+        Parameters:
+            column (int): The column of the grid cell
+            row (int): The row of the grid cell
+            diagonal (bool): If True, diagonally adjacent cells are included
+
+        Yield:
+            tuple<tuple<int, int>, Block>: (column, row) position & block (or None if empty) of each
+                                           adjacent cell that is on the grid
+        """
+        offsets = NEIGHBOUR_OFFSETS + DIAGONAL_NEIGHBOUR_OFFSETS if diagonal else NEIGHBOUR_OFFSETS
+
+        for dx, dy in offsets:
+            neighbour = column + dx, row + dy
+
+            if self.is_in_grid(*neighbour):
+                yield neighbour, self.get_block_at(*neighbour)
+
+    def _index_block(self, block: Block, column: int, row: int):
+        """Adds the block in the cell at ('column', 'row') to the bucket index"""
+        buckets = self._block_buckets.setdefault(block.get_id(), {})
+        bucket = column // BLOCK_BUCKET_SPAN, row // BLOCK_BUCKET_SPAN
+        buckets.setdefault(bucket, set()).add((column, row))
+
+    def _unindex_block(self, block: Block, column: int, row: int):
+        """Removes the block in the cell at ('column', 'row') from the bucket index"""
+        buckets = self._block_buckets.get(block.get_id(), {})
+        bucket = column // BLOCK_BUCKET_SPAN, row // BLOCK_BUCKET_SPAN
+
+        cells = buckets.get(bucket)
+        if cells is None:
+            return
+
+        cells.discard((column, row))
+        if not cells:
+            del buckets[bucket]
+
+    def nearest_block(self, block_id: str, x: float, y: float, max_distance: float):
+        """(Block) Returns the block with 'block_id' whose centre is closest to the point ('x', 'y'),
+        or None if there is no such block strictly within 'max_distance' of the point
+
+        Only the index buckets overlapping the search radius are examined, so the cost of this
+        query is bounded by 'max_distance', rather than the size of the world.
         """
-        blocks = self._space.point_query((x, y), 0, pymunk.ShapeFilter(mask=self._thing_categories["block"]))
+        buckets = self._block_buckets.get(block_id)
+        if not buckets:
+            return None
+
+        bucket_expanse = BLOCK_BUCKET_SPAN * self._cell_expanse
+        left, top = int((x - max_distance) // bucket_expanse), int((y - max_distance) // bucket_expanse)
+        right, bottom = int((x + max_distance) // bucket_expanse), int((y + max_distance) // bucket_expanse)
 
-        if blocks:
-            return blocks[0].shape.object
+        nearest = None
+        nearest_distance = max_distance ** 2
+
+        for bucket_column in range(left, right + 1):
+            for bucket_row in range(top, bottom + 1):
+                for column, row in buckets.get((bucket_column, bucket_row), ()):
+                    centre_x = (column + .5) * self._cell_expanse
+                    centre_y = (row + .5) * self._cell_expanse
+                    distance = (centre_x - x) ** 2 + (centre_y - y) ** 2
+
+                    if distance < nearest_distance:
+                        nearest = self.get_block_at(column, row)
+                        nearest_distance = distance
+
+        return nearest
 
     def remove_block(self, block: Block):
         """Removes a block from the game world"""
-        self.remove_thing(block)
+        column, row = self.xy_to_grid(*block.get_position())
+
+        cells = self._chunks.get(chunk_of(column, row))
+        index = (row % CHUNK_SIZE) * CHUNK_SIZE + column % CHUNK_SIZE
+
+        if cells is None or cells[index] is not block:
+            # Already removed, or replaced (along with its shapes) by another block
+            return
+
+        cells[index] = None
+        self._unindex_block(block, column, row)
+
+        self._dirty_cells.add((column, row))
+        self._remove_block_shapes({(column, row): block})
+
+        # Things resting on the block must fall
+        self.wake_things_near(*self.grid_to_xy_centre(column, row), self._cell_expanse)
 
     def add_item(self, item: DroppedItem, x: float, y: float, size: Tuple[float, float] = (8, 8),
                  mass: float = 2, friction: float = 1.):
@@ -384,7 +1037,15 @@ class World:
         queries = self._space.point_query((x, y), 0, pymunk.ShapeFilter(
             mask=pymunk.ShapeFilter.ALL_MASKS ^ self._thing_categories["wall"]))
 
-        return [q.shape.object for q in queries]
+        things = [q.shape.object for q in queries if q.shape.object is not None]
+
+        if self._merge_collisions:
+            # Blocks aren't in the space, so must be looked up on the grid
+            block = self.get_block(x, y)
+            if block is not None:
+                things.append(block)
+
+        return things
 
     def get_thing(self, x: float, y: float) -> PhysicalThing:
         """(PhysicalThing) Returns a thing on the point ('x', 'y'), or None if there is no thing there
@@ -395,6 +1056,41 @@ class World:
         things = self.get_things(x, y)
         return things[0] if things else None
 
+    def get_things_in_rect(self, left: float, top: float, right: float, bottom: float,
+                           categories=None) -> [PhysicalThing]:
+        """(list<PhysicalThing>) Returns all things overlapping the rectangle
+
+        Parameters:
+            left, top, right, bottom (float): The edges of the rectangle
+            categories (iterable<str>): The categories of things to return (e.g. "mob"), or None to
+                                        return everything but boundary walls
+        """
+        if categories is None:
+            mask = pymunk.ShapeFilter.ALL_MASKS ^ self._thing_categories["wall"]
+        else:
+            mask = 0
+            for category in categories:
+                mask |= self._thing_categories[category]
+
+        shapes = self._space.bb_query(pymunk.BB(left, top, right, bottom), pymunk.ShapeFilter(mask=mask))
+
+        # Merged block collision shapes have no thing (see _rebuild_collision_runs)
+        things = [shape.object for shape in shapes if shape.object is not None]
+
+        if self._merge_collisions and mask & self._thing_categories["block"]:
+            # Blocks' own shapes aren't in the space, so are found from the grid instead
+            columns, rows = self._grid_size
+            first_column, first_row = self.xy_to_grid(max(left, 0), max(top, 0))
+            last_column, last_row = self.xy_to_grid(right, bottom)
+
+            for column in range(first_column, min(last_column, columns - 1) + 1):
+                for row in range(first_row, min(last_row, rows - 1) + 1):
+                    block = self.get_block_at(column, row)
+                    if block is not None:
+                        things.append(block)
+
+        return things
+
     def get_items(self, x: float, y: float, max_distance: float) -> [DroppedItem]:
         """(list<DroppedItem>) Returns all items within 'max_distance' from the point ('x', 'y')"""
         queries = self._space.point_query((x, y), max_distance,